@@ -1,10 +1,13 @@
 """
 수임/해임 상태와 원천세 조회 성공/실패 연관성 분석
 """
+import sys
 import json
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR / "backend" / "modules"))
+from hometax.reports.result_store import ReportResultStore
 
 # 1. 거래처 목록 로드
 test_input_path = BASE_DIR / "R&D" / "temp" / "test_input.json"
@@ -13,58 +16,21 @@ with open(test_input_path, 'r', encoding='utf-8') as f:
 
 clients = test_data.get("clients", [])
 
-# 2. 성공/실패 사업자번호 로드
-analysis_result_path = BASE_DIR / "R&D" / "withholding_analysis_result.json"
-with open(analysis_result_path, 'r', encoding='utf-8') as f:
-    analysis_result = json.load(f)
-
-success_biz_nos = set(analysis_result["success_biz_nos"])
-failed_biz_nos = set(analysis_result["failed_biz_nos"])
-
-# 3. 거래처별로 수임/해임 상태와 성공/실패 매칭
-engagement_stats = {
-    "수임중": {
-        "total": 0,
-        "success": 0,
-        "failed": 0,
-        "no_biz_no": 0,
-        "not_queried": 0
-    },
-    "해지중": {
-        "total": 0,
-        "success": 0,
-        "failed": 0,
-        "no_biz_no": 0,
-        "not_queried": 0
-    },
-    "알수없음": {
-        "total": 0,
-        "success": 0,
-        "failed": 0,
-        "no_biz_no": 0,
-        "not_queried": 0
-    }
-}
-
-# 4. 통계 수집
-for client in clients:
-    engagement_status = client.get("_engagementStatus", "알수없음")
-    biz_no = client.get("bsno") or client.get("resno", "").replace("*", "")
-    
-    if not biz_no:
-        engagement_stats[engagement_status]["no_biz_no"] += 1
-        continue
-    
-    engagement_stats[engagement_status]["total"] += 1
-    
-    if biz_no in success_biz_nos:
-        engagement_stats[engagement_status]["success"] += 1
-    elif biz_no in failed_biz_nos:
-        engagement_stats[engagement_status]["failed"] += 1
-    else:
-        engagement_stats[engagement_status]["not_queried"] += 1
-
-# 5. 결과 출력
+# 2. 결과 저장소에 거래처 목록(수임 상태) 반영 후 상태별 집계
+#    (조회 결과 요약은 수집 시점에 저장소 인덱스에 기록되어 있으므로 파일을 다시 읽지 않음)
+result_db = BASE_DIR / "R&D" / "collected_data" / "results.sqlite3"
+store = ReportResultStore(result_db)
+store.register_clients(clients)
+by_status = store.failures_by_engagement_status("원천세")
+store.close()
+
+# 3. 조회 결과가 없는 상태도 0으로 채움
+empty_stats = {"total": 0, "success": 0, "failed": 0, "no_biz_no": 0, "not_queried": 0}
+engagement_stats = {status: dict(empty_stats) for status in ["수임중", "해지중", "알수없음"]}
+for status, stats in by_status.items():
+    engagement_stats[status] = stats
+
+# 4. 결과 출력
 print("=" * 60)
 print("수임/해임 상태별 원천세 조회 성공률 분석")
 print("=" * 60)
@@ -94,7 +60,7 @@ for status in ["수임중", "해지중", "알수없음"]:
     print(f"  - 실패: {failed}개 ({failed_rate:.1f}%)")
     print()
 
-# 6. 상세 분석
+# 5. 상세 분석
 print("=" * 60)
 print("상세 분석")
 print("=" * 60)
@@ -123,7 +89,7 @@ print(f"  - 성공: {success_terminated}개 ({success_terminated/total_terminate
 print(f"  - 실패: {failed_terminated}개 ({failed_terminated/total_terminated*100 if total_terminated > 0 else 0:.1f}%)")
 print()
 
-# 7. 결론
+# 6. 결론
 print("=" * 60)
 print("결론")
 print("=" * 60)
@@ -145,7 +111,7 @@ if total_active > 0 and total_terminated > 0:
     else:
         print("→ 수임/해임 상태와 성공률 간에 유의미한 차이가 없습니다.")
 
-# 8. 결과 저장
+# 7. 결과 저장
 result_file = BASE_DIR / "R&D" / "engagement_status_analysis.json"
 with open(result_file, 'w', encoding='utf-8') as f:
     json.dump({
@@ -1,52 +1,67 @@
 """
 원천세 최근 3개월 조회 결과 분석
 성공한 사업자번호와 실패한 사업자번호 리스팅
+
+결과 저장소(collected_data/results.sqlite3)의 인덱스에서 바로 조회합니다.
+저장소에 원천세 기록이 없으면 예전 방식으로 저장된 DATA_/RAW_ 파일을 한 번 가져옵니다.
 """
 import json
 import re
+import sys
 from pathlib import Path
 
 BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR / "backend" / "modules"))
+from hometax.reports.result_store import ReportResultStore
+
+TAX_NAME = "원천세"
 output_dir = BASE_DIR / "R&D" / "collected_data" / "withholding_3months"
 raw_dir = BASE_DIR / "R&D" / "collected_data"
+result_db = raw_dir / "results.sqlite3"
 
-# 성공한 사업자번호 추출 (파일명에서)
-success_biz_nos = set()
-if output_dir.exists():
-    for file in output_dir.glob('DATA_*_원천세_*.json'):
-        # 파일명 형식: DATA_{biz_no}_원천세_{date}.json
-        match = re.search(r'DATA_(\d+)_원천세_', file.name)
-        if match:
-            success_biz_nos.add(match.group(1))
 
-# 실패한 사업자번호 추출 (RAW 파일에서 resultCnt=0 확인)
-failed_biz_nos = set()
-all_raw_biz_nos = set()
-
-if raw_dir.exists():
-    for file in raw_dir.glob('RAW_원천세_*_*.json'):
-        try:
-            with open(file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                biz_no = data.get('txprRgtNo', '')
-                result_cnt = data.get('resultCnt', -1)
-                
-                if biz_no:
-                    all_raw_biz_nos.add(biz_no)
-                    if result_cnt == 0:
-                        failed_biz_nos.add(biz_no)
-        except Exception as e:
-            # 파일명에서 사업자번호 추출 시도
-            match = re.search(r'RAW_원천세_(\d+)_', file.name)
+def import_legacy_files(store):
+    """예전 파일 결과(DATA_ 전체 기간 파일, RAW_ 응답 덤프)를 저장소로 가져옵니다."""
+    imported = 0
+    if output_dir.exists():
+        for file in output_dir.glob(f'DATA_*_{TAX_NAME}_*_*.json'):
+            match = re.match(rf'DATA_(\d+)_{TAX_NAME}_(\d{{8}})_(\d{{8}})\.json$', file.name)
             if match:
-                all_raw_biz_nos.add(match.group(1))
+                with open(file, 'r', encoding='utf-8') as f:
+                    store.save_result(json.load(f), match.group(1), TAX_NAME, match.group(2), match.group(3))
+                imported += 1
+
+    if raw_dir.exists():
+        for file in raw_dir.glob(f'RAW_{TAX_NAME}_*_*.json'):
+            match = re.match(rf'RAW_{TAX_NAME}_(\d+)_(\d{{8}})\.json$', file.name)
+            if not match:
+                continue
+            try:
+                with open(file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception:
+                continue
+            biz_no = data.get('txprRgtNo') or match.group(1)
+            # 이미 DATA 파일로 성공이 기록된 사업자는 덮어쓰지 않음
+            if biz_no in store.successes(TAX_NAME):
+                continue
+            rows = next((v for k, v in data.items() if isinstance(v, list) and k.startswith('dlt')), [])
+            store.save_result({"status": "success", "count": len(rows), "data": rows, "raw": data},
+                              biz_no, TAX_NAME, match.group(2), match.group(2))
+            imported += 1
+    return imported
 
-# 성공한 사업자번호 중 RAW 파일에 없는 경우도 포함
-# (RAW 파일이 삭제되었을 수 있음)
-all_queried_biz_nos = all_raw_biz_nos | success_biz_nos
 
-# 실패한 사업자번호 = 전체 조회한 사업자번호 - 성공한 사업자번호
-final_failed_biz_nos = all_queried_biz_nos - success_biz_nos
+store = ReportResultStore(result_db)
+if not store.queried(TAX_NAME):
+    imported = import_legacy_files(store)
+    if imported:
+        print(f"[INFO] 예전 결과 파일 {imported}개를 {result_db}로 가져왔습니다.")
+
+success_biz_nos = store.successes(TAX_NAME)
+final_failed_biz_nos = store.failures(TAX_NAME)
+all_queried_biz_nos = store.queried(TAX_NAME)
+store.close()
 
 print("=" * 60)
 print("원천세 최근 3개월 조회 결과 분석")
@@ -82,5 +97,3 @@ with open(result_file, 'w', encoding='utf-8') as f:
     }, f, ensure_ascii=False, indent=2)
 
 print(f"결과가 {result_file}에 저장되었습니다.")
-
-
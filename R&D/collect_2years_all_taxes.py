@@ -13,14 +13,41 @@ from dateutil.relativedelta import relativedelta
 # 원본 스크립트 import
 BASE_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(BASE_DIR / "R&D"))
-from tax_data_collector import get_hometax_session, collect_tax_data, OUTPUT_DIR
+from tax_data_collector import get_hometax_session, OUTPUT_DIR, RESULT_DB
+from hometax.reports.report_collector import HometaxTaxReportCollector
+from hometax.reports.scheduler import CertificateJob, MultiCertificateScheduler, ProgressTracker
+from hometax.reports.jobs import CollectionJobStore
+from hometax.reports.result_store import ReportResultStore
+from hometax.reports.incremental import (
+    DEFAULT_MUTABLE_MONTHS, WatermarkStore, merge_monthly_results, plan_ranges, ym_range_to_dates
+)
+from hometax.rate_control import rate_controller_metrics
+from hometax.metrics import request_metrics
+from hometax.clients.registry import DEFAULT_REGISTRY_DB, ClientRegistry, client_key
 
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="전체 거래처 × 8개 세목 2년치 수집")
+    parser.add_argument('--workers', type=int, default=4, help='동시에 수집할 인증서 수')
+    parser.add_argument('--min_interval', type=float, default=0.1, help='인증서별 시작 호출 간격(초), 이후 속도 제어기가 조절')
+    parser.add_argument('--job_id', default=None, help='작업 ID (기본: 조회 기간으로 생성, 같은 ID면 이어받기)')
+    parser.add_argument('--job_db', default=str(OUTPUT_DIR / "collection_jobs.sqlite3"), help='작업 상태 저장 파일')
+    parser.add_argument('--retry_failed', action='store_true', help='실패한 단위도 다시 조회')
+    parser.add_argument('--fresh', action='store_true', help='기존 작업 기록을 지우고 처음부터 수집')
+    parser.add_argument('--incremental', action='store_true', help='이미 조회한 기간은 건너뛰고 누락/최근 월만 조회')
+    parser.add_argument('--mutable_months', type=int, default=DEFAULT_MUTABLE_MONTHS, help='증분 모드에서 매번 다시 조회할 최근 개월 수')
+    parser.add_argument('--store', choices=['sqlite', 'json', 'both'], default='sqlite', help='결과 저장 방식 (sqlite: results.sqlite3, json: full_scale_2years/DATA_*.json)')
+    parser.add_argument('--refresh_clients', action='store_true', help='저장된 test_input.json을 무시하고 거래처 목록을 다시 조회')
+    parser.add_argument('--changed_since', default=None,
+                        help="이 시각 이후 신규/변경된 거래처만 수집 (YYYY-MM-DD 또는 'last': 직전 거래처 조회 이후)")
+    parser.add_argument('--metrics_out', default=None, help='엔드포인트별 요청 지표 저장 파일 (.prom이면 Prometheus 텍스트, 그 외 JSON)')
+    args = parser.parse_args()
+    
     # 전체 거래처 목록 가져오기 (fetch-all-clients.py 결과 사용)
     test_input_path = BASE_DIR / "R&D" / "temp" / "test_input.json"
     
-    if not test_input_path.exists():
-        print(f"[INFO] test_input.json이 없습니다. fetch-all-clients.py를 실행하여 전체 거래처 목록을 가져옵니다...")
+    if args.refresh_clients or not test_input_path.exists():
+        print(f"[INFO] test_input.json이 없거나 새로 고침을 요청했습니다. fetch-all-clients.py를 실행하여 전체 거래처 목록을 가져옵니다...")
         
         import subprocess
         node_script = f"""
@@ -140,6 +167,22 @@ const fs = require('fs');
         print(f"[FAIL] 거래처 목록이 비어있습니다.")
         return
     
+    # 변경분 모드: 거래처 레지스트리(fetch-all-clients.py가 기록)에서 신규/변경된 거래처만 남김
+    if args.changed_since:
+        registry = ClientRegistry(DEFAULT_REGISTRY_DB)
+        if args.changed_since == 'last':
+            since = registry.last_synced_at()
+        else:
+            since = datetime.fromisoformat(args.changed_since).timestamp()
+        changed = registry.changed_since(since) if since is not None else []
+        registry.close()
+        changed_keys = {(c.get('_sourcePath', ''), client_key(c)) for c in changed}
+        all_clients = [c for c in all_clients if (c.get('_sourcePath', ''), client_key(c)) in changed_keys]
+        print(f"[INFO] {args.changed_since} 이후 신규/변경된 거래처: {len(all_clients)}개")
+        if not all_clients:
+            print(f"[OK] 새로 수집할 거래처가 없습니다.")
+            return
+    
     # 최근 2년 연월 리스트 생성 (전체 기간 계산용)
     now = datetime.now()
     month_list = []
@@ -185,20 +228,50 @@ const fs = require('fs');
     print(f"  - 세목 수: {len(TAX_MAP)}개")
     print(f"  - 조회 기간: {start_dt} ~ {end_dt} (최근 2년)")
     print(f"  - 예상 API 호출: {len(all_clients)} × {len(TAX_MAP)} = {len(all_clients) * len(TAX_MAP)}회")
-    print(f"  - 예상 시간: 약 40-50분 (딜레이 0.1초 기준, 2년치)")
+    print(f"  - 동시 수집 인증서 수: {args.workers}개 (인증서별 시작 간격 {args.min_interval}초)")
     print(f"{'='*60}\n")
     
-    total_collected = 0
-    total_api_calls = 0
-    total_errors = 0
-    start_time = time.time()
+    tax_dir = OUTPUT_DIR / "full_scale_2years"
+    tax_dir.mkdir(parents=True, exist_ok=True)
+    
+    result_store = ReportResultStore(RESULT_DB) if args.store in ('sqlite', 'both') else None
+    save_json = args.store in ('json', 'both')
+    if result_store is not None:
+        result_store.register_clients(all_clients)
+    
+    # 증분 모드: (사업자, 세목)별 조회 완료 구간을 보고 누락/최근 월만 조회
+    watermarks = None
+    if args.incremental:
+        watermarks = WatermarkStore(tax_dir / "watermarks.sqlite3")
+        watermarks.seed_from_files(tax_dir)
+    
+    # 작업 저장소: (거래처 × 세목 × 기간) 단위로 상태를 기록하여 중단 후 이어받기
+    if args.job_id:
+        job_id = args.job_id
+    elif args.changed_since:
+        # 같은 기준 시각으로 다시 실행하면 이어받기
+        job_id = f"2years_changed_{int(since or 0)}_{start_dt}_{end_dt}"
+    elif args.incremental:
+        # 날짜가 아니라 조회 창으로 묶어야 다음 날 다시 실행해도 같은 작업을 이어받음
+        job_id = f"2years_incremental_{start_dt}_{end_dt}"
+    else:
+        job_id = f"2years_{start_dt}_{end_dt}"
+    store = CollectionJobStore(args.job_db)
+    if args.fresh:
+        store.delete_job(job_id)
+    resumed = not store.create_job(job_id, {"start_dt": start_dt, "end_dt": end_dt, "taxes": list(TAX_MAP),
+                                            "incremental": watermarks is not None})
+    # 증분 구간은 워터마크가 갱신될 때마다 달라지므로, 이어받을 때는 처음 계획해 저장한 단위를 그대로 사용
+    plan_units = not (resumed and watermarks is not None)
+    if not plan_units:
+        print(f"[작업] 증분 작업을 이어받습니다. 처음 계획한 조회 구간을 사용합니다 (다시 계획하려면 --fresh).")
     
+    # 인증서별 작업 구성 (해당 인증서에 소속된 거래처 필터링)
+    jobs = []
     for cert_info in certs_list:
         cert_name = norm(cert_info["name"])
         cert_path = norm(cert_info["path"])
-        password = cert_info["password"]
         
-        # 해당 인증서에 소속된 거래처 필터링
         my_clients = []
         for c in all_clients:
             s_cert = norm(c.get('_sourceCert', ''))
@@ -210,99 +283,137 @@ const fs = require('fs');
             print(f">>> [{cert_name}] 관리하는 거래처가 없습니다. 패스.")
             continue
         
+        if plan_units:
+            units = []
+            for client in my_clients:
+                biz_no = client.get('bsno') or client.get('resno', '').replace('*', '')
+                if not biz_no:
+                    continue
+                for tax_name in TAX_MAP:
+                    if watermarks is not None:
+                        ranges = plan_ranges(watermarks.get(biz_no, tax_name), start_dt[:6], end_dt[:6], args.mutable_months)
+                    else:
+                        ranges = [(start_dt[:6], end_dt[:6])]
+                    for start_ym, end_ym in ranges:
+                        range_start, range_end = ym_range_to_dates(start_ym, end_ym)
+                        units.append({
+                            "cert_path": cert_path, "biz_no": biz_no, "biz_name": client.get('txprNm', '불명'),
+                            "tax_name": tax_name, "start_date": range_start, "end_date": range_end
+                        })
+            store.enqueue(job_id, units)
+        
+        # 남은 단위가 있는 인증서만 로그인
+        remaining = store.pending(job_id, cert_path=cert_path, include_failed=args.retry_failed)
+        if not remaining:
+            print(f">>> [{cert_name}] 모든 단위 수집 완료 상태입니다. 패스.")
+            continue
+        
+        jobs.append(CertificateJob(cert_name, cert_path, cert_info["password"], remaining))
+    
+    before = store.summary(job_id)
+    print(f"[작업] {job_id} ({'이어받기' if resumed else '신규'}): "
+          f"완료 {before['done']} / 실패 {before['failed']} / 대기 {before['pending']} (전체 {before['total']})")
+    
+    def collect_certificate(job, throttle, progress):
+        """인증서 하나의 세션 획득 및 남은 (거래처 × 세목) 단위 순회 (스케줄러 스레드에서 실행)"""
+        cert_name = job.cert_name
+        
         print(f"\n{'='*60}")
         print(f">>> [{cert_name}] 데이터 수집 시작")
-        print(f">>> 거래처 수: {len(my_clients)}개 (전체 {len(all_clients)}건 중)")
+        print(f">>> 남은 조회 단위: {len(job.clients)}개")
         print(f"{'='*60}")
         
         print(f">>> [{cert_name}] 세션 활성화 시도 중...", flush=True)
         
-        session_data = get_hometax_session(cert_path, password)
+        session_data = get_hometax_session(job.cert_path, job.password)
         if not session_data.get("success"):
-            print(f"  [FAIL] 세션 획득 실패: {session_data.get('error')}", flush=True)
-            continue
+            # 단위는 pending으로 남아 다음 실행에서 이어받음
+            print(f"  [FAIL] [{cert_name}] 세션 획득 실패: {session_data.get('error')}", flush=True)
+            return {"session": False}
         
         cookies = session_data.get("cookies", {})
         pubc_user_no = session_data.get("pubcUserNo", "")
+        collector = HometaxTaxReportCollector(cookies=cookies, pubc_user_no=pubc_user_no,
+                                              rate_controller=throttle or scheduler.rate_controller(pubc_user_no))
+        
+        print(f"  [OK] [{cert_name}] 세션 획득 성공", flush=True)
+        
+        # 같은 거래처/기간의 세목들은 한 번에 조회 (세목별 요청 템플릿 재사용, 같은 연결로 연달아 전송)
+        groups = {}
+        for unit in job.clients:
+            groups.setdefault((unit["biz_no"], unit["start_date"], unit["end_date"]), []).append(unit)
+        
+        for (biz_no, unit_start, unit_end), units in groups.items():
+            if scheduler.stop_event.is_set():
+                # 중단 요청: 남은 단위는 pending으로 두고 다음 실행에서 이어받음
+                print(f"  [중단] [{cert_name}] 남은 단위를 건너뜁니다.", flush=True)
+                break
+            progress.add("api_calls", len(units))
+            combined = collector.collect_client_all_taxes(biz_no, unit_start, unit_end, taxes=[u["tax_name"] for u in units])
+            for unit in units:
+                record_unit(job, unit, combined["results"][unit["tax_name"]])
+        
+        return {"session": True}
+    
+    def record_unit(job, unit, res):
+        """조회 단위 하나의 결과 저장 및 작업 상태 기록"""
+        biz_no = unit["biz_no"]
+        tax_name = unit["tax_name"]
+        unit_start, unit_end = unit["start_date"], unit["end_date"]
         
-        print(f"  [OK] 세션 획득 성공", flush=True)
+        if result_store is not None:
+            result_store.save_result(res, biz_no, tax_name, unit_start, unit_end, cert_path=job.cert_path)
         
-        # 거래처별 순회
-        for idx, client in enumerate(my_clients):
-            biz_no = client.get('bsno')
-            biz_name = client.get('txprNm', '불명')
-            
-            if not biz_no:
-                biz_no = client.get('resno', '').replace('*', '')
-            
-            if not biz_no:
-                if (idx + 1) % 50 == 0:  # 50개마다 진행 상황 출력
-                    print(f"  [{idx+1}/{len(my_clients)}] 진행 중... (사업자번호 없음 건너뜀)", flush=True)
-                continue
-            
-            if (idx + 1) % 50 == 0 or (idx + 1) == len(my_clients):
-                elapsed = time.time() - start_time
-                print(f"  [{idx+1}/{len(my_clients)}] 진행 중... (소요 시간: {elapsed/60:.1f}분)", flush=True)
-            
-            # 8개 세목 모두 조회 (전체 기간 한번에)
-            for tax_name, tax_code in TAX_MAP.items():
-                total_api_calls += 1
-                res = collect_tax_data(cookies, tax_name, tax_code, start_dt, end_dt, 
-                                       biz_no=biz_no, pubc_user_no=pubc_user_no)
-                
-                if res.get("status") == "success" and res.get("count", 0) > 0:
-                    # 세목별 폴더 생성
-                    tax_dir = OUTPUT_DIR / "full_scale_2years"
-                    if not tax_dir.exists():
-                        tax_dir.mkdir(parents=True)
-                    
-                    # 전체 기간 결과 저장
-                    filename = f"DATA_{biz_no}_{tax_name}_{start_dt}_{end_dt}.json"
-                    filepath = tax_dir / filename
-                    with open(filepath, "w", encoding="utf-8") as f:
-                        json.dump(res, f, ensure_ascii=False, indent=2)
-                    
-                    # 월별로 분리하여 저장 (응답 데이터에 과세연월 정보가 있는 경우)
-                    data_rows = res.get("data", [])
-                    if data_rows:
-                        monthly_data = {}
-                        for row in data_rows:
-                            tax_month = None
-                            for field in ['txnrmYm', 'pymnYm', 'rtnYm', 'sbmsYm']:
-                                if field in row and row[field]:
-                                    tax_month = row[field]
-                                    break
-                            
-                            if tax_month:
-                                if len(str(tax_month)) == 6:
-                                    year = int(str(tax_month)[:4])
-                                    month = int(str(tax_month)[4:6])
-                                    month_key = f"{year}{month:02d}"
-                                    
-                                    if month_key not in monthly_data:
-                                        monthly_data[month_key] = []
-                                    monthly_data[month_key].append(row)
-                        
-                        # 월별 파일 저장
-                        for month_key, month_rows in monthly_data.items():
-                            year = int(month_key[:4])
-                            month = int(month_key[4:6])
-                            monthly_filename = f"DATA_{biz_no}_{tax_name}_{year}{month:02d}.json"
-                            monthly_res = {
-                                "status": "success",
-                                "count": len(month_rows),
-                                "data": month_rows,
-                                "raw": res.get("raw", {})
-                            }
-                            with open(tax_dir / monthly_filename, "w", encoding="utf-8") as f:
-                                json.dump(monthly_res, f, ensure_ascii=False, indent=2)
-                            total_collected += len(month_rows)
-                elif res.get("status") == "error":
-                    error_msg = res.get("error", "알 수 없는 오류")
-                    if "과부하" in error_msg or "60초" in error_msg:
-                        total_errors += 1
-                        if total_errors <= 5:  # 처음 5개만 출력
-                            print(f"    ⚠ {tax_name} ({biz_name}): 과부하 제어 발생", flush=True)
+        if res.get("status") == "success":
+            if res.get("count", 0) > 0:
+                progress.add("collected", res["count"])
+                if save_json:
+                    save_full_period_result(res, biz_no, tax_name, unit_start, unit_end)
+            if watermarks is not None:
+                watermarks.record(biz_no, tax_name, unit_start[:6], unit_end[:6])
+            store.mark_done(job_id, unit["unit_key"], res.get("count", 0))
+        else:
+            error_msg = res.get("error") or res.get("message") or "알 수 없는 오류"
+            store.mark_failed(job_id, unit["unit_key"], error_msg)
+            progress.add("failed_units")
+            if "과부하" in error_msg or "60초" in error_msg:
+                progress.add("overload_errors")
+                if progress.counters.get("overload_errors", 0) <= 5:  # 처음 5개만 출력
+                    print(f"    ⚠ {tax_name} ({unit['biz_name']}): 과부하 제어 발생", flush=True)
+        
+        progress.unit_done(job.cert_name)
+    
+    def save_full_period_result(res, biz_no, tax_name, range_start, range_end):
+        """조회 기간 결과 저장 및 월별 파일 병합"""
+        filename = f"DATA_{biz_no}_{tax_name}_{range_start}_{range_end}.json"
+        filepath = tax_dir / filename
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(res, f, ensure_ascii=False, indent=2)
+        
+        # 월별로 분리하여 저장 (응답 데이터에 과세연월 정보가 있는 경우)
+        merge_monthly_results(tax_dir, biz_no, tax_name, res)
+    
+    # 인증서마다 독립된 세션/스로틀로 병렬 수집
+    scheduler = MultiCertificateScheduler(max_workers=args.workers, min_interval=args.min_interval)
+    progress = ProgressTracker(total_units=sum(len(job.clients) for job in jobs))
+    start_time = progress.started_at
+    try:
+        scheduler.run(jobs, collect_certificate, progress)
+    except KeyboardInterrupt:
+        print(f"\n[중단] 완료된 단위는 저장되었습니다. 같은 명령으로 다시 실행하면 이어서 수집합니다.", flush=True)
+    
+    after = store.summary(job_id)
+    store.close()
+    if watermarks is not None:
+        watermarks.close()
+    if result_store is not None:
+        result_stats = result_store.stats()
+        result_store.close()
+    
+    stats = progress.snapshot()
+    total_api_calls = stats.get("api_calls", 0)
+    total_collected = stats.get("collected", 0)
+    total_errors = stats.get("overload_errors", 0)
     
     elapsed_time = time.time() - start_time
     
@@ -311,11 +422,32 @@ const fs = require('fs');
     print(f"  - 총 API 호출: {total_api_calls}회")
     print(f"  - 총 수집된 데이터: {total_collected}건")
     print(f"  - 과부하 제어 발생: {total_errors}회")
+    print(f"  - 작업 상태 [{job_id}]: 완료 {after['done']} / 실패 {after['failed']} / 대기 {after['pending']} (전체 {after['total']})")
+    if after['failed']:
+        print(f"    (실패 단위만 다시 조회: --retry_failed)")
     print(f"  - 소요 시간: {elapsed_time:.1f}초 ({elapsed_time/60:.1f}분, {elapsed_time/3600:.2f}시간)")
     if total_api_calls > 0:
         print(f"  - 평균 호출당 시간: {elapsed_time/total_api_calls:.2f}초")
-    print(f"  - 저장 위치: {OUTPUT_DIR / 'full_scale_2years'}")
+    if result_store is not None:
+        print(f"  - 결과 저장소: {RESULT_DB} (조회 {result_stats['queries']}건, 행 {result_stats['report_rows']}건, "
+              f"원본 {result_stats['raw_bytes'] / 1024:.0f}KB → 압축 {result_stats['raw_compressed_bytes'] / 1024:.0f}KB)")
+    if save_json:
+        print(f"  - 저장 위치: {OUTPUT_DIR / 'full_scale_2years'}")
     print(f"  - 조회 세목: {', '.join(TAX_MAP.keys())}")
+    for key, metrics in rate_controller_metrics().items():
+        print(f"  - 호출 속도 [{key}]: 현재 {metrics['current_rate']}/s, 최고 유지 {metrics['best_sustained_rate']}/s, 과부하 {metrics['total_overload']}회")
+    request_summary = request_metrics().summary()
+    for endpoint, entry in request_summary.items():
+        print(f"  - 요청 [{endpoint}]: {entry['count']}회, 합계 {entry['total_s']:.1f}초, "
+              f"p50 {entry['p50_ms']:.0f}ms / p95 {entry['p95_ms']:.0f}ms / p99 {entry['p99_ms']:.0f}ms, 과부하 {entry['overloads']}회")
+    if args.metrics_out:
+        metrics_path = Path(args.metrics_out)
+        metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        if metrics_path.suffix == '.prom':
+            metrics_path.write_text(request_metrics().prometheus_text(), encoding='utf-8')
+        else:
+            metrics_path.write_text(json.dumps(request_summary, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"  - 요청 지표 저장: {metrics_path}")
     print(f"{'='*60}")
 
 if __name__ == "__main__":
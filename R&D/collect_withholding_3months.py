@@ -14,7 +14,8 @@ from dateutil.relativedelta import relativedelta
 # 원본 스크립트 import
 BASE_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(BASE_DIR / "R&D"))
-from tax_data_collector import get_hometax_session, collect_tax_data, OUTPUT_DIR
+from tax_data_collector import get_hometax_session, collect_tax_data, OUTPUT_DIR, RESULT_DB
+from hometax.reports.result_store import ReportResultStore
 
 def main():
     # 저장된 인증서 정보 자동 로드
@@ -174,6 +175,8 @@ const fs = require('fs');
     total_errors = 0
     success_count = 0
     start_time = time.time()
+    result_store = ReportResultStore(RESULT_DB)
+    result_store.register_clients(all_clients)
     
     for cert_info in certs_list:
         cert_name = norm(cert_info["name"])
@@ -229,6 +232,8 @@ const fs = require('fs');
                 total_api_calls += 1
                 res = collect_tax_data(cookies, tax_name, tax_code, start_dt, end_dt, 
                                        biz_no=biz_no, pubc_user_no=pubc_user_no)
+                # 성공/0건/오류 모두 결과 저장소에 기록 (분석 스크립트가 조회)
+                result_store.save_result(res, biz_no, tax_name, start_dt, end_dt, cert_path=cert_path)
                 
                 if res.get("status") == "success" and res.get("count", 0) > 0:
                     success_count += 1
@@ -297,7 +302,9 @@ const fs = require('fs');
     if total_api_calls > 0:
         print(f"  - 평균 호출당 시간: {elapsed_time/total_api_calls:.2f}초")
     print(f"  - 저장 위치: {OUTPUT_DIR / 'withholding_3months'}")
+    print(f"  - 결과 저장소: {RESULT_DB}")
     print(f"{'='*60}")
+    result_store.close()
 
 if __name__ == "__main__":
     main()
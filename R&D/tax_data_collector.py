@@ -1,8 +1,8 @@
 import os
 import json
 import sys
-import subprocess
 import time
+import threading
 from datetime import datetime
 from pathlib import Path
 
@@ -10,6 +10,23 @@ from pathlib import Path
 BASE_DIR = Path(__file__).parent.parent
 SCRIPTS_DIR = BASE_DIR / "backend" / "integration" / "scripts"
 OUTPUT_DIR = Path(__file__).parent / "collected_data"
+RESULT_DB = OUTPUT_DIR / "results.sqlite3"
+
+# 요청마다 RAW_*.json 응답 덤프 (디버깅용, 기본 끔 - 원본 응답은 결과 저장소에 압축 저장)
+RAW_DUMP = os.environ.get("TAX_RAW_DUMP", "0") == "1"
+
+# 백엔드 모듈 (hometax.*) import 경로
+sys.path.insert(0, str(BASE_DIR / "backend" / "modules"))
+from hometax.reports.scheduler import CertificateJob, MultiCertificateScheduler, ProgressTracker
+from hometax.rate_control import get_rate_controller, is_overload_response, rate_controller_metrics
+from hometax.metrics import request_metrics
+from hometax import transport
+from hometax.json_codec import loads
+from hometax.reports.result_store import ReportResultStore
+from hometax.reports.row_schema import extract_rows_by_month, schema_key
+from hometax.reports.incremental import (
+    DEFAULT_MUTABLE_MONTHS, WatermarkStore, merge_monthly_results, month_count, plan_ranges, ym_range_to_dates
+)
 
 # 세목별 메뉴 인덱스 (tm3lIdx)
 TAX_TYPES = {
@@ -23,56 +40,53 @@ TAX_TYPES = {
     "종합부동산세": "0405070000",
 }
 
-# 스마트 딜레이 전역 변수
-_delay_state = {
-    "current_delay": 0.1,  # 초기 딜레이 0.1초 (테스트용)
-    "consecutive_success": 0,
-    "consecutive_overload": 0,
-    "max_retries": 3  # 최대 재시도 횟수
-}
+# 상주 워커 클라이언트 (프로세스당 하나, 최초 사용 시 생성; 스케줄러 스레드들이 동시에 부름)
+_worker_client = None
+_worker_client_lock = threading.Lock()
+
+def get_worker_client():
+    """
+    hometax-worker.py 상주 프로세스 클라이언트를 반환합니다.
+    인증서마다 python3 프로세스를 새로 띄우지 않고, 한 워커가 세션을 메모리에 유지합니다.
+    """
+    global _worker_client
+    with _worker_client_lock:
+        if _worker_client is None:
+            import atexit
+            import importlib.util
+            spec = importlib.util.spec_from_file_location("hometax_worker", SCRIPTS_DIR / "hometax-worker.py")
+            worker_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(worker_module)
+            _worker_client = worker_module.HometaxWorkerClient()
+            atexit.register(_worker_client.close)
+        return _worker_client
 
 def get_hometax_session(cert_path, password):
     """
-    기존 백엔드 스크립트(get-session-with-permission.py)를 실행하여 
+    상주 워커(hometax-worker.py)를 통해 
     완벽한 세무대리인 권한 세션을 획득합니다.
     """
-    script_path = SCRIPTS_DIR / "get-session-with-permission.py"
     try:
-        # 백엔드 스크립트 실행
-        result = subprocess.run(
-            ["python3", str(script_path), cert_path, password],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        
-        if result.returncode == 0:
-            stdout = result.stdout.strip()
-            # JSON 결과 추출 (출력물 중 JSON 객체만 찾음)
-            json_start = stdout.find('{')
-            json_end = stdout.rfind('}') + 1
-            if json_start >= 0:
-                data = json.loads(stdout[json_start:json_end])
-                if data.get("success"):
-                    return data
-        
-        error_msg = result.stderr or result.stdout or "알 수 없는 오류"
-        return {"success": False, "error": error_msg}
+        data = get_worker_client().call("login", cert_path=cert_path, password=password)
+        data["success"] = True
+        return data
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-def collect_tax_data(cookies, tax_name, tax_code, start_date, end_date, biz_no="", pubc_user_no="", retry_count=0):
+def collect_tax_data(cookies, tax_name, tax_code, start_date, end_date, biz_no="", pubc_user_no="", retry_count=0, rate_controller=None):
     """
     R&D 결과 및 브라우저 실사 결과를 바탕으로 JSON 기반 수집을 수행합니다.
-    스마트 딜레이 방식 적용: 정상 응답 시 0.5초, 과부하 제어 감지 시 60초 대기 후 재시도
+    호출 속도는 인증서별 AIMD 속도 제어기(rate_controller)가 조절합니다:
+    연속 성공 시 속도를 올리고, 과부하 제어 감지 시 속도를 낮추고 비례하여 쉰 뒤 재시도합니다.
+    rate_controller를 생략하면 pubcUserNo별 공유 제어기를 사용합니다.
     """
-    import requests
     import random
     
-    global _delay_state
+    if rate_controller is None:
+        rate_controller = get_rate_controller(pubc_user_no or None)
     
-    # API 호출 전 딜레이 (스마트 딜레이)
-    time.sleep(_delay_state["current_delay"])
+    # API 호출 전 대기 (현재 속도에 맞춰)
+    rate_controller.acquire()
     
     # nts 토큰 생성 (홈택스 보안 패턴)
     sec = random.randrange(30, 60)
@@ -126,7 +140,8 @@ def collect_tax_data(cookies, tax_name, tax_code, start_date, end_date, biz_no="
     }
     
     try:
-        response = requests.post(
+        # 공용 연결 풀 사용 (호출마다 TLS 핸드셰이크를 하지 않음)
+        response = transport.post(
             endpoint,
             params=params,
             data=payload.encode('utf-8'),
@@ -138,68 +153,78 @@ def collect_tax_data(cookies, tax_name, tax_code, start_date, end_date, biz_no="
         if response.status_code != 200:
             return {"status": "error", "error": f"HTTP {response.status_code}", "count": 0}
         
-        response_text = response.text
+        # 본문은 bytes 그대로 한 번만 디코딩 (response.text 변환 생략)
+        content = response.content
         
-        # 분석을 위해 모든 응답 저장
-        debug_filename = f"RAW_{tax_name}_{biz_no}_{start_date}.json"
-        with open(OUTPUT_DIR / debug_filename, "w", encoding="utf-8") as df:
-            df.write(response_text)
+        # 디버깅용 응답 덤프 (TAX_RAW_DUMP=1)
+        if RAW_DUMP:
+            debug_filename = f"RAW_{tax_name}_{biz_no}_{start_date}.json"
+            with open(OUTPUT_DIR / debug_filename, "wb") as df:
+                df.write(content)
         
-        # ⭐ 스마트 딜레이: 과부하 제어 감지
-        if "과부하제어" in response_text or "60초" in response_text:
-            _delay_state["consecutive_overload"] += 1
-            _delay_state["consecutive_success"] = 0
+        # ⭐ 과부하 제어 감지: 속도를 낮추고 제어기가 정한 시간만큼 쉰 뒤 재시도
+        if is_overload_response(content):
+            pause = rate_controller.on_overload()
             
             # 재시도 횟수 확인
-            if retry_count >= _delay_state["max_retries"]:
-                print(f"    [ERROR] 과부하 제어: 최대 재시도 횟수({_delay_state['max_retries']}) 초과, 건너뜀", flush=True)
+            if retry_count >= rate_controller.max_retries:
+                print(f"    [ERROR] 과부하 제어: 최대 재시도 횟수({rate_controller.max_retries}) 초과, 건너뜀", flush=True)
                 return {"status": "error", "error": "과부하 제어: 최대 재시도 횟수 초과", "count": 0}
             
-            # 60초 대기 후 재시도
-            print(f"    [WARN] 과부하 제어 감지 (재시도 {retry_count + 1}/{_delay_state['max_retries']}), 60초 대기 후 재시도...", flush=True)
-            time.sleep(60)
+            print(f"    [WARN] 과부하 제어 감지 (재시도 {retry_count + 1}/{rate_controller.max_retries}), {pause:.0f}초 후 재시도 (속도: {rate_controller.current_rate:.2f}/s)", flush=True)
             
-            # 재시도
+            # 재시도 (대기는 다음 acquire()에서 처리)
             return collect_tax_data(
                 cookies, tax_name, tax_code, start_date, end_date, 
-                biz_no, pubc_user_no, retry_count + 1
+                biz_no, pubc_user_no, retry_count + 1, rate_controller
             )
         
         # 정상 응답 처리
-        _delay_state["consecutive_success"] += 1
-        _delay_state["consecutive_overload"] = 0
-        
-        # 연속 성공 시 딜레이 유지 (0.5초 고정)
-        # 필요시 점진적 감소 로직 추가 가능
+        rate_controller.on_success()
 
         try:
-            result_data = response.json()
-            rows = []
-            for key, value in result_data.items():
-                if isinstance(value, list) and key.startswith("dlt"):
-                    rows = value
-                    break
-            
-            if not rows:
-                for key, value in result_data.items():
-                    if isinstance(value, list) and len(value) > 0 and isinstance(value[0], dict):
-                        rows = value
-                        break
+            result_data = loads(content)
+            # (actionId, 세목)별로 기억한 행 목록 키/과세연월 필드로 바로 추출하고, 같은 호출에서 월별로 묶음
+            rows, month_field, monthly_index = extract_rows_by_month(
+                result_data, schema_key(params["actionId"], itrf_cd)
+            )
 
             return {
                 "status": "success",
                 "count": len(rows),
                 "data": rows,
+                "month_field": month_field,
+                "monthly_index": monthly_index,
                 "raw": result_data # 항상 포함
             }
         except Exception as e:
-            return {"status": "error", "error": f"JSON 파싱 실패: {str(e)}", "raw_text": response.text[:1000]}
+            return {"status": "error", "error": f"JSON 파싱 실패: {str(e)}", "raw_text": content[:1000].decode("utf-8", errors="replace")}
 
                 
     except Exception as e:
         return {"status": "error", "error": str(e), "count": 0}
 
 
+def save_tax_result(res, biz_no, tax_name, start_dt, end_dt):
+    """수집 결과를 전체 기간 파일로 저장하고, 행의 과세연월별 파일에 병합합니다."""
+    # 세목별 폴더 생성
+    tax_dir = OUTPUT_DIR / tax_name
+    tax_dir.mkdir(parents=True, exist_ok=True)
+    
+    # 전체 기간 결과를 하나의 파일로 저장
+    filename = f"DATA_{biz_no}_{tax_name}_{start_dt}_{end_dt}.json"
+    with open(tax_dir / filename, "w", encoding="utf-8") as f:
+        json.dump(res, f, ensure_ascii=False, indent=2)
+    
+    # 결과를 월별로 분리하여 저장 (응답 데이터에 과세연월 정보가 있는 경우)
+    written = merge_monthly_results(tax_dir, biz_no, tax_name, res)
+    for month_key, count in written.items():
+        print(f"    [BINGO!] {tax_name} {month_key[:4]}-{month_key[4:6]}: {count}건 발견 및 저장", flush=True)
+    if not written:
+        # 월별 분리가 안되면 전체 결과만 저장
+        print(f"    [BINGO!] {tax_name} {start_dt}~{end_dt}: {res['count']}건 발견 및 저장", flush=True)
+
+
 def main():
     import argparse
     from datetime import datetime
@@ -208,10 +233,26 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--certs_json', type=str)
     parser.add_argument('--clients_json', type=str) # 추가: 거래처 리스트
+    parser.add_argument('--workers', type=int, default=4, help='동시에 수집할 인증서 수')
+    parser.add_argument('--min_interval', type=float, default=0.1, help='인증서별 시작 호출 간격(초), 이후 속도 제어기가 조절')
+    parser.add_argument('--incremental', action='store_true', help='이미 조회한 기간은 건너뛰고 누락/최근 월만 조회')
+    parser.add_argument('--mutable_months', type=int, default=DEFAULT_MUTABLE_MONTHS, help='증분 모드에서 매번 다시 조회할 최근 개월 수')
+    parser.add_argument('--store', choices=['sqlite', 'json', 'both'], default='sqlite', help='결과 저장 방식 (sqlite: results.sqlite3, json: 세목별 DATA_*.json)')
     args = parser.parse_args()
 
     if not OUTPUT_DIR.exists():
         OUTPUT_DIR.mkdir(parents=True)
+    
+    result_store = ReportResultStore(RESULT_DB) if args.store in ('sqlite', 'both') else None
+    save_json = args.store in ('json', 'both')
+    
+    # 증분 모드: (사업자, 세목)별 조회 완료 구간
+    watermarks = None
+    if args.incremental:
+        watermarks = WatermarkStore(OUTPUT_DIR / "watermarks.sqlite3")
+        for tax_name in TAX_TYPES:
+            if (OUTPUT_DIR / tax_name).exists():
+                watermarks.seed_from_files(OUTPUT_DIR / tax_name)
 
     if not args.certs_json or not args.clients_json:
         print("[FAIL] certs_json 및 clients_json 주입 필요")
@@ -232,6 +273,10 @@ def main():
         all_clients = json.loads(args.clients_json)
 
 
+    # 거래처 목록(수임 상태)을 결과 저장소에 반영 (분석 스크립트가 상태별로 집계)
+    if result_store is not None:
+        result_store.register_clients(all_clients)
+
     # 최근 6개월 연월 리스트 생성 (정합성 검증용)
     now = datetime.now()
     month_list = []
@@ -256,12 +301,12 @@ def main():
         if not s: return ""
         return unicodedata.normalize('NFC', s)
 
+    # 인증서별 작업 구성 (해당 인증서에 소속된 거래처 필터링, 정규화 비교)
+    jobs = []
     for cert_info in certs_list:
         cert_name = norm(cert_info["name"])
         cert_path = norm(cert_info["path"])
-        password = cert_info["password"]
 
-        # 해당 인증서에 소속된 거래처 필터링 (정규화 비교)
         my_clients = []
         for c in all_clients:
             s_cert = norm(c.get('_sourceCert', ''))
@@ -275,22 +320,44 @@ def main():
             print(f">>> [{cert_name}] 관리하는 거래처가 없습니다. 패스.")
             continue
 
+        jobs.append(CertificateJob(cert_name, cert_path, cert_info["password"], my_clients))
+
+    # 전체 기간 계산 (가장 오래된 월부터 가장 최근 월까지)
+    import calendar
+    if month_list:
+        oldest_year, oldest_month = month_list[-1]  # 가장 오래된 월
+        newest_year, newest_month = month_list[0]    # 가장 최근 월
+        
+        start_dt = f"{oldest_year}{oldest_month:02d}01"
+        last_day = calendar.monthrange(newest_year, newest_month)[1]
+        end_dt = f"{newest_year}{newest_month:02d}{last_day:02d}"
+    else:
+        # month_list가 비어있으면 현재 월 기준으로 처리
+        start_dt = f"{now.year}{now.month:02d}01"
+        last_day = calendar.monthrange(now.year, now.month)[1]
+        end_dt = f"{now.year}{now.month:02d}{last_day:02d}"
+
+    def collect_certificate(job, throttle, progress):
+        """인증서 하나의 세션 획득 및 거래처 순회 (스케줄러 스레드에서 실행)"""
+        cert_name = job.cert_name
+        my_clients = job.clients
+
         print(f">>> [{cert_name}] 세션 활성화 시도 중...", flush=True)
         
-        session_data = get_hometax_session(cert_path, password)
+        session_data = get_hometax_session(job.cert_path, job.password)
         if not session_data.get("success"):
-            print(f"  [FAIL] 세션 획득 실패: {session_data.get('error')}", flush=True)
-            continue
+            print(f"  [FAIL] [{cert_name}] 세션 획득 실패: {session_data.get('error')}", flush=True)
+            return {"session": False}
 
         cookies = session_data.get("cookies", {})
         pubc_user_no = session_data.get("pubcUserNo", "")
-        
-        print(f"  [DEBUG] my_clients type: {type(my_clients)}, length: {len(my_clients)}", flush=True)
-        if len(my_clients) > 0:
-            print(f"  [DEBUG] First client sample: {my_clients[0].get('txprNm', 'NoName')} / {my_clients[0].get('txprRgtNo', 'NoBizNo')}", flush=True)
+        # 거래처 목록/신고현황 조회와 같은 pubcUserNo 제어기 공유
+        throttle = throttle or scheduler.rate_controller(pubc_user_no)
 
         # 실제 데이터가 하나라도 집계되는지 확인하기 위해 사업자별/월별 순회
         for idx, client in enumerate(my_clients):
+            if scheduler.stop_event.is_set():
+                break
             biz_no = client.get('bsno') # 수정: txprRgtNo -> bsno
             biz_name = client.get('txprNm', '불명')
             
@@ -298,83 +365,51 @@ def main():
                 # 개인사업자 등 bsno가 없는 경우 resno 등을 시도하거나 패스
                 biz_no = client.get('resno', '').replace('*', '')
             
-            if not biz_no: continue
+            if not biz_no:
+                progress.unit_done(cert_name)
+                continue
             
             print(f"  [{cert_name}] ({idx+1}/{len(my_clients)}) [거래처] {biz_name} ({biz_no}) 조회 중...", flush=True)
             
-            # 전체 기간 계산 (가장 오래된 월부터 가장 최근 월까지)
-            import calendar
-            if month_list:
-                oldest_year, oldest_month = month_list[-1]  # 가장 오래된 월
-                newest_year, newest_month = month_list[0]    # 가장 최근 월
-                
-                start_dt = f"{oldest_year}{oldest_month:02d}01"
-                last_day = calendar.monthrange(newest_year, newest_month)[1]
-                end_dt = f"{newest_year}{newest_month:02d}{last_day:02d}"
-            else:
-                # month_list가 비어있으면 현재 월 기준으로 처리
-                now = datetime.now()
-                start_dt = f"{now.year}{now.month:02d}01"
-                last_day = calendar.monthrange(now.year, now.month)[1]
-                end_dt = f"{now.year}{now.month:02d}{last_day:02d}"
-            
             for tax_name, tax_code in TAX_MAP.items():
-                # 💡 핵심: 전체 기간을 한번에 조회 (월별 순회 제거)
-                res = collect_tax_data(cookies, tax_name, tax_code, start_dt, end_dt, 
-                                       biz_no=biz_no, pubc_user_no=pubc_user_no)
+                # 💡 핵심: 전체 기간을 한번에 조회 (증분 모드면 누락/최근 구간만)
+                if watermarks is not None:
+                    ranges = plan_ranges(watermarks.get(biz_no, tax_name), start_dt[:6], end_dt[:6], args.mutable_months)
+                else:
+                    ranges = [(start_dt[:6], end_dt[:6])]
                 
-                if res.get("count", 0) > 0:
-                    # 세목별 폴더 생성
-                    tax_dir = OUTPUT_DIR / tax_name
-                    if not tax_dir.exists(): tax_dir.mkdir(parents=True)
+                for start_ym, end_ym in ranges:
+                    range_start, range_end = ym_range_to_dates(start_ym, end_ym)
+                    res = collect_tax_data(cookies, tax_name, tax_code, range_start, range_end, 
+                                           biz_no=biz_no, pubc_user_no=pubc_user_no, rate_controller=throttle)
+                    progress.add("api_calls")
+                    progress.add("queried_months", month_count(start_ym, end_ym))
                     
-                    # 전체 기간 결과를 하나의 파일로 저장
-                    filename = f"DATA_{biz_no}_{tax_name}_{start_dt}_{end_dt}.json"
-                    with open(tax_dir / filename, "w", encoding="utf-8") as f:
-                        json.dump(res, f, ensure_ascii=False, indent=2)
+                    if result_store is not None:
+                        result_store.save_result(res, biz_no, tax_name, range_start, range_end, cert_path=job.cert_path)
                     
-                    # 결과를 월별로 분리하여 저장 (응답 데이터에 과세연월 정보가 있는 경우)
-                    data_rows = res.get("data", [])
-                    if data_rows:
-                        # 월별로 그룹화
-                        monthly_data = {}
-                        for row in data_rows:
-                            # 과세연월 추출 (필드명은 응답 구조에 따라 다를 수 있음)
-                            # 일반적인 필드명: txnrmYm, pymnYm, rtnYm 등
-                            tax_month = None
-                            for field in ['txnrmYm', 'pymnYm', 'rtnYm', 'sbmsYm']:
-                                if field in row and row[field]:
-                                    tax_month = row[field]
-                                    break
-                            
-                            if tax_month:
-                                # YYYYMM 형식으로 변환
-                                if len(str(tax_month)) == 6:
-                                    year = int(str(tax_month)[:4])
-                                    month = int(str(tax_month)[4:6])
-                                    month_key = f"{year}{month:02d}"
-                                    
-                                    if month_key not in monthly_data:
-                                        monthly_data[month_key] = []
-                                    monthly_data[month_key].append(row)
-                        
-                        # 월별 파일 저장
-                        for month_key, month_rows in monthly_data.items():
-                            year = int(month_key[:4])
-                            month = int(month_key[4:6])
-                            monthly_filename = f"DATA_{biz_no}_{tax_name}_{year}{month:02d}.json"
-                            monthly_res = {
-                                "status": "success",
-                                "count": len(month_rows),
-                                "data": month_rows,
-                                "raw": res.get("raw", {})
-                            }
-                            with open(tax_dir / monthly_filename, "w", encoding="utf-8") as f:
-                                json.dump(monthly_res, f, ensure_ascii=False, indent=2)
-                            print(f"    [BINGO!] {tax_name} {year}-{month:02d}: {len(month_rows)}건 발견 및 저장", flush=True)
-                    else:
-                        # 월별 분리가 안되면 전체 결과만 저장
-                        print(f"    [BINGO!] {tax_name} {start_dt}~{end_dt}: {res['count']}건 발견 및 저장", flush=True)
+                    if res.get("count", 0) > 0:
+                        progress.add("bingo")
+                        if save_json:
+                            save_tax_result(res, biz_no, tax_name, range_start, range_end)
+                    
+                    if watermarks is not None and res.get("status") == "success":
+                        watermarks.record(biz_no, tax_name, start_ym, end_ym)
+            
+            progress.unit_done(cert_name)
+
+        return {"session": True}
+
+    # 인증서마다 독립된 세션/스로틀로 병렬 수집
+    scheduler = MultiCertificateScheduler(max_workers=args.workers, min_interval=args.min_interval)
+    progress = ProgressTracker(total_units=sum(len(job.clients) for job in jobs))
+    scheduler.run(jobs, collect_certificate, progress)
+    print(f"\n[진행 요약] {json.dumps(progress.snapshot(), ensure_ascii=False)}", flush=True)
+    print(f"[호출 속도] {json.dumps(rate_controller_metrics(), ensure_ascii=False)}", flush=True)
+    print(f"[요청 지표] {json.dumps(request_metrics().summary(), ensure_ascii=False)}", flush=True)
+    if result_store is not None:
+        print(f"[결과 저장소] {RESULT_DB}: {json.dumps(result_store.stats(), ensure_ascii=False)}", flush=True)
+        result_store.close()
         
     print("\n[상세 순회 수집 종료]", flush=True)
 
@@ -10,9 +10,7 @@ sys.path.insert(0, str(BASE_DIR / 'modules'))
 sys.path.insert(0, str(Path(__file__).parent))  # get-session-with-permission.py가 있는 폴더
 
 from hometax.reports import HometaxTaxReportCollector
-# sys.path에 현재 폴더를 추가했으므로 바로 import 가능
-import get_session_with_permission as session_module
-get_hometax_session = session_module.get_hometax_session
+from script_modules import load_script
 
 def main():
     parser = argparse.ArgumentParser(description="홈택스 세목별 신고 데이터 수집기")
@@ -36,16 +34,8 @@ def main():
 
     # 1. 인증서로 로그인 시도 (권장)
     if args.cert_path and args.password:
-        # 파일명 import를 위해 동적 로딩 또는 sys.path 이용
-        # 하이픈(-)이 포함된 파일명은 import가 까다로우므로 importlib 사용 권장하지만, 
-        # 위에서 sys.path 추가했으므로 파일명만 맞추면 됨.
-        # 단, get-session-with-permission.py는 하이픈 때문에 표준 import 불가.
-        import importlib.util
-        script_path = Path(__file__).parent / 'get-session-with-permission.py'
-        spec = importlib.util.spec_from_file_location("get_session_module", script_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        get_hometax_session = module.get_hometax_session
+        # 로그인 모듈(pypinksign 등)은 인증서로 로그인할 때만 불러옴
+        get_hometax_session = load_script('get-session-with-permission').get_hometax_session
         
         login_result = get_hometax_session(args.cert_path, args.password)
         if not login_result['success']:
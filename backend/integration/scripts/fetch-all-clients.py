@@ -1,13 +1,27 @@
 """
 저장된 모든 인증서의 홈택스 수임거래처 조회
-get-session-with-permission.py를 재사용하여 완전한 SSO 패턴 적용
+hometax-worker.py의 HometaxWorker를 프로세스 내에서 재사용하여
+인증서마다 python3 프로세스를 새로 띄우지 않고 완전한 SSO 패턴을 적용합니다.
+
+조회한 목록은 인증서별로 거래처 레지스트리(data/client-registry.sqlite3)에 저장하고
+이전 목록과의 차이(신규/제외/해지/변경)를 결과의 delta에 담습니다.
+HOMETAX_CLIENTS_MAX_AGE(초)를 지정하면 그보다 최근에 받은 인증서는 로그인 없이 저장된 목록을 사용합니다.
 """
+import os
 import sys
 import json
-import subprocess
-import os
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'modules'))
+from hometax.clients.registry import ClientRegistry
+from script_modules import load_script
+
+
+def load_worker_module():
+    """하이픈(-)이 포함된 hometax-worker.py를 로드"""
+    return load_script('hometax-worker')
+
+
 def main():
     # 저장된 인증서 정보와 비밀번호 받기 (JSON 형식)
     saved_certs_json = sys.argv[1] if len(sys.argv) > 1 else '[]'
@@ -15,9 +29,13 @@ def main():
     
     all_clients = []
     errors = []
+    delta = {}
     
-    # get-session-with-permission.py 경로
-    script_path = Path(__file__).parent / 'get-session-with-permission.py'
+    registry = ClientRegistry()
+    max_age = float(os.environ.get('HOMETAX_CLIENTS_MAX_AGE', '0') or 0)
+    
+    # 모듈 로드는 한 번만 (인증서마다 인터프리터를 새로 띄우지 않음)
+    worker = load_worker_module().HometaxWorker()
     
     for cert_info in saved_certs:
         cert_path = cert_info.get('path')
@@ -31,92 +49,56 @@ def main():
             })
             continue
         
-        try:
-            # get-session-with-permission.py를 subprocess로 실행
-            # 이 스크립트는 완전한 SSO 패턴과 거래처 조회를 포함
-            env = os.environ.copy()
-            if 'AXCEL_ENCRYPTION_KEY' not in env:
-                env['AXCEL_ENCRYPTION_KEY'] = ''
-            
-            result = subprocess.run(
-                ['python3', str(script_path), cert_path, password],
-                capture_output=True,
-                text=True,
-                timeout=120,  # 2분 타임아웃
-                env=env
-            )
-            
-            # stdout에서 JSON 파싱 시도 (성공/실패 모두 JSON 형식)
-            # stdout에 JSON 외 데이터가 섞일 수 있으므로 JSON 부분만 추출
-            try:
-                stdout_clean = result.stdout.strip()
-                
-                # JSON 객체 시작과 끝 찾기
-                json_start = stdout_clean.find('{')
-                json_end = stdout_clean.rfind('}') + 1
-                
-                if json_start >= 0 and json_end > json_start:
-                    json_str = stdout_clean[json_start:json_end]
-                    output = json.loads(json_str)
-                else:
-                    # JSON을 찾을 수 없으면 전체를 시도
-                    output = json.loads(stdout_clean)
-                
-                if result.returncode == 0:
-                    # API 호출 성공 여부 확인 (빈 배열도 성공으로 처리)
-                    if output.get('apiSuccess'):
-                        clients = output.get('clients', [])
-                        
-                        # 인증서 정보 추가
-                        for client in clients:
-                            client['_sourceCert'] = cert_name
-                            client['_sourcePath'] = cert_path
-                        
-                        all_clients.extend(clients)
-                        print(f"[SUCCESS] {cert_name}: {len(clients)}개 거래처 조회 성공", file=sys.stderr)
-                    else:
-                        # API 호출 실패
-                        error_msg = output.get('apiError') or output.get('permissionError') or output.get('error') or '거래처 조회 실패'
-                        errors.append({
-                            'cert': cert_name,
-                            'error': error_msg
-                        })
-                        print(f"[WARNING] {cert_name}: {error_msg}", file=sys.stderr)
-                else:
-                    # returncode != 0: 에러 발생
-                    error_msg = output.get('error', '알 수 없는 오류')
-                    errors.append({
-                        'cert': cert_name,
-                        'error': error_msg[:200]  # 처음 200자만
-                    })
-                    print(f"[ERROR] {cert_name}: {error_msg[:200]}", file=sys.stderr)
-                    
-            except json.JSONDecodeError as e:
-                # JSON 파싱 실패
-                error_output = result.stderr or result.stdout or '알 수 없는 오류'
-                errors.append({
-                    'cert': cert_name,
-                    'error': f'응답 파싱 실패: {str(e)}'
-                })
-                print(f"[ERROR] {cert_name}: JSON 파싱 실패", file=sys.stderr)
-                print(f"[ERROR] 출력: {error_output[:500]}", file=sys.stderr)
-                
-        except subprocess.TimeoutExpired:
+        # 최근에 받은 목록이 있으면 로그인 없이 재사용
+        age = registry.snapshot_age(cert_path)
+        if max_age > 0 and age is not None and age < max_age:
+            clients = registry.roster(cert_path)
+            all_clients.extend(clients)
+            print(f"[CACHED] {cert_name}: {len(clients)}개 거래처 (저장된 목록, {age / 60:.0f}분 전)", file=sys.stderr)
+            continue
+        
+        login = worker.handle({'command': 'login', 'params': {'cert_path': cert_path, 'password': password}})
+        if not login['ok']:
+            error_msg = login.get('error') or '알 수 없는 오류'
             errors.append({
                 'cert': cert_name,
-                'error': '타임아웃 (120초 초과)'
+                'error': error_msg[:200]  # 처음 200자만
             })
-            print(f"[ERROR] {cert_name}: 타임아웃", file=sys.stderr)
+            print(f"[ERROR] {cert_name}: {error_msg[:200]}", file=sys.stderr)
+            continue
+        
+        fetched = worker.handle({'command': 'fetch_clients', 'params': {'session_id': login['result']['session_id']}})
+        if fetched['ok']:
+            clients = fetched['result'].get('clients', [])
+            
+            # 인증서 정보 추가
+            for client in clients:
+                client['_sourceCert'] = cert_name
+                client['_sourcePath'] = cert_path
             
-        except Exception as e:
-            import traceback
-            error_msg = str(e)
+            all_clients.extend(clients)
+            print(f"[SUCCESS] {cert_name}: {len(clients)}개 거래처 조회 성공", file=sys.stderr)
+            
+            # 이전 목록과 비교하여 변경 사항 기록
+            # (일부 수임 상태 조회가 실패한 목록으로 동기화하면 그 상태의 거래처가 모두 제외로 기록되므로 건너뜀)
+            missing = fetched['result'].get('missingStatuses') or []
+            if missing:
+                print(f"[WARNING] {cert_name}: {', '.join(missing)} 조회 실패로 목록이 불완전하여 레지스트리 갱신을 건너뜁니다.", file=sys.stderr)
+            else:
+                diff = registry.sync(cert_path, clients)
+                delta[cert_name] = {change: (len(items) if isinstance(items, list) else items) for change, items in diff.items()}
+                print(f"[DELTA] {cert_name}: {delta[cert_name]}", file=sys.stderr)
+        else:
+            # API 호출 실패
+            error_msg = fetched.get('error') or '거래처 조회 실패'
             errors.append({
                 'cert': cert_name,
                 'error': error_msg
             })
-            print(f"[ERROR] {cert_name}: {error_msg}", file=sys.stderr)
-            print(f"[ERROR] {traceback.format_exc()}", file=sys.stderr)
+            print(f"[WARNING] {cert_name}: {error_msg}", file=sys.stderr)
+        
+        # 조회가 끝난 세션은 정리
+        worker.handle({'command': 'logout', 'params': {'session_id': cert_path}})
     
     # 결과 출력
     result = {
@@ -124,8 +106,10 @@ def main():
         'totalCount': len(all_clients),
         'errors': errors,
         'successCount': len(saved_certs) - len(errors),
-        'totalCertCount': len(saved_certs)
+        'totalCertCount': len(saved_certs),
+        'delta': delta
     }
+    registry.close()
     
     print(json.dumps(result, ensure_ascii=False))
 
@@ -12,14 +12,15 @@ from datetime import datetime
 from pathlib import Path
 
 # 상위 디렉토리에서 모듈 import
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'modules' / 'hometax' / 'auth'))
+MODULES_DIR = Path(__file__).resolve().parent.parent.parent / 'modules'
+if str(MODULES_DIR) not in sys.path:
+    sys.path.insert(0, str(MODULES_DIR))
 
-import importlib.util
-login_module_path = Path(__file__).parent.parent.parent / 'modules' / 'hometax' / 'auth' / 'login.py'
-spec = importlib.util.spec_from_file_location("login_with_certificate", login_module_path)
-login_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(login_module)
-login_with_certificate = login_module.login_with_certificate
+from hometax.auth.login import login_with_certificate
+from hometax.auth.session_cache import HometaxSessionCache, get_certificate_serial
+from hometax.logger import get_logger, LazyCookies
+
+log = get_logger('hometax.integration.session')
 
 def nts_generate_random_string(length):
     """hometaxbot 패턴: 랜덤 문자열 생성"""
@@ -61,11 +62,8 @@ def request_permission_teht(session, screen_id='UTEABHAA03'):
         
         response_text = response.text
         
-        # 🔍 디버깅: 응답 형식 확인
-        import sys
-        print(f"[DEBUG Python] permission.do 응답 상태 코드: {response.status_code}", file=sys.stderr)
-        print(f"[DEBUG Python] permission.do 응답 길이: {len(response_text)}", file=sys.stderr)
-        print(f"[DEBUG Python] permission.do 응답 처음 500자: {response_text[:500]}", file=sys.stderr)
+        log.debug('permission.do 응답', screen_id=screen_id, status=response.status_code,
+                  length=len(response_text), body=response_text[:500])
         
         # 2. 로그인 오류 감지
         is_login_error = '<errorMsg>login</errorMsg>' in response_text
@@ -197,16 +195,8 @@ def request_permission_teht(session, screen_id='UTEABHAA03'):
         # 6. 쿠키 추출 (permission.do 호출 후 업데이트된 쿠키 포함)
         cookies_dict = {cookie.name: cookie.value for cookie in session.cookies}
         
-        # 디버깅: 쿠키 정보 출력
-        import sys
-        print(f"[DEBUG Python] permission.do 호출 후 쿠키 개수: {len(cookies_dict)}", file=sys.stderr)
-        print(f"[DEBUG Python] 쿠키 목록: {list(cookies_dict.keys())}", file=sys.stderr)
-        if 'TEHTsessionID' in cookies_dict:
-            print(f"[DEBUG Python] TEHTsessionID: {cookies_dict['TEHTsessionID'][:30]}...", file=sys.stderr)
-        print(f"[DEBUG Python] 세션 정보 추출 결과:", file=sys.stderr)
-        print(f"[DEBUG Python]   tin: {tin[:20] if tin else 'N/A'}...", file=sys.stderr)
-        print(f"[DEBUG Python]   pubcUserNo: {pubc_user_no[:20] if pubc_user_no else 'N/A'}...", file=sys.stderr)
-        print(f"[DEBUG Python]   txaaAdmNo: {txaa_adm_no[:20] if txaa_adm_no else 'N/A'}...", file=sys.stderr)
+        log.debug('permission.do 세션 정보', cookies=LazyCookies(session.cookies),
+                  tin=bool(tin), pubcUserNo=bool(pubc_user_no), txaaAdmNo=txaa_adm_no or 'N/A')
         
         return {
             'success': True,
@@ -225,17 +215,60 @@ def request_permission_teht(session, screen_id='UTEABHAA03'):
             'cookies': {}
         }
 
-if __name__ == '__main__':
-    if len(sys.argv) < 3:
-        print(json.dumps({'error': 'Usage: python get-session-with-permission.py <cert_path> <password>'}))
-        sys.exit(1)
+
+def get_hometax_session(cert_path, password, use_cache=None):
+    """
+    인증서로 로그인하고 홈택스 세션을 활성화하여 반환합니다.
     
-    cert_path = sys.argv[1]
-    password = sys.argv[2]
+    세션 캐시(HometaxSessionCache)에 살아있는 세션이 있으면 로그인 과정을 건너뜁니다.
+    use_cache를 생략하면 환경 변수 HOMETAX_SESSION_CACHE가 "0"이 아닐 때 캐시를 사용합니다.
+    """
+    if use_cache is None:
+        import os
+        use_cache = os.environ.get('HOMETAX_SESSION_CACHE', '1') != '0'
+    
+    if not use_cache:
+        return _login_hometax_session(cert_path, password)
     
-def get_hometax_session(cert_path, password):
+    cache = HometaxSessionCache()
+    if not cache.enabled:
+        return _login_hometax_session(cert_path, password)
+    try:
+        serial = get_certificate_serial(cert_path, password)
+        cached = cache.load(serial, password)
+    except Exception as e:
+        log.debug('세션 캐시 조회 실패 (로그인 진행)', error=e)
+        serial, cached = None, None
+    
+    if cached:
+        log.debug('캐시된 세션 재사용 (로그인 생략)')
+        return {
+            'success': True,
+            'session': cached['session'],
+            'cookies': cached['cookies'],
+            'pubcUserNo': cached.get('pubcUserNo') or '',
+            'tin': cached.get('tin') or '',
+            'txaaAdmNo': cached.get('txaaAdmNo') or '',
+            'charId': cached.get('charId') or '',
+            'userType': cached.get('userType') or '',
+            'permissionSuccess': True,
+            'cached': True,
+            'apiSuccess': False,
+            'apiError': None,
+            'clients': [],
+        }
+    
+    result = _login_hometax_session(cert_path, password)
+    if result.get('success') and serial and result.get('permissionSuccess'):
+        try:
+            cache.save(serial, result['session'], result, password)
+        except Exception as e:
+            log.debug('세션 캐시 저장 실패', error=e)
+    return result
+
+def _login_hometax_session(cert_path, password):
     """
-    인증서로 로그인하고 홈택스 세션을 활성화하여 반환합니다.
+    인증서로 로그인하고 홈택스 세션을 활성화하여 반환합니다. (캐시 미사용)
     """
     try:
         # 1. 로그인
@@ -258,7 +291,7 @@ def get_hometax_session(cert_path, password):
                 timeout=20
             )
             main_perm_text = main_perm_response.text
-            print(f"[DEBUG Python] 메인 도메인 permission.do 응답 길이: {len(main_perm_text)}", file=sys.stderr)
+            log.debug('메인 도메인 permission.do 응답', length=len(main_perm_text))
             
             # 메인 도메인에서 txaaAdmNo 추출 시도
             main_txaa_adm_no = ''
@@ -269,16 +302,16 @@ def get_hometax_session(cert_path, password):
                         if 'resultMsg' in main_perm_json and 'sessionMap' in main_perm_json['resultMsg']:
                             main_session_map = main_perm_json['resultMsg']['sessionMap']
                             main_txaa_adm_no = main_session_map.get('txaaAdmNo', '')
-                            print(f"[DEBUG Python] 메인 도메인에서 txaaAdmNo 추출: {main_txaa_adm_no[:20] if main_txaa_adm_no else 'N/A'}...", file=sys.stderr)
+                            log.debug('메인 도메인에서 txaaAdmNo 추출', found=bool(main_txaa_adm_no))
                 except:
                     pass
         except Exception as e:
-            print(f"[DEBUG Python] 메인 도메인 permission.do 호출 실패: {str(e)}", file=sys.stderr)
+            log.debug('메인 도메인 permission.do 호출 실패', error=e)
             main_txaa_adm_no = ''
         
         # 2-2. 완전한 SSO 로그인 패턴 구현 (ref 프로젝트의 ssoLogin() 패턴)
         # ⭐ 핵심: 서브도메인에 세션 활성화 주입
-        print(f"[DEBUG Python] 완전한 SSO 로그인 패턴 시작...", file=sys.stderr)
+        log.debug('완전한 SSO 로그인 패턴 시작')
         
         # 2-2-1. 서브도메인 permission.do 호출 (1차, 초기화)
         try:
@@ -289,9 +322,9 @@ def get_hometax_session(cert_path, password):
                 headers={'Content-Type': "application/xml; charset=UTF-8"},
                 timeout=20
             )
-            print(f"[DEBUG Python] 서브도메인 permission.do (1차) 완료", file=sys.stderr)
+            log.debug('서브도메인 permission.do (1차) 완료', status=teht_perm_1.status_code)
         except Exception as e:
-            print(f"[DEBUG Python] 서브도메인 permission.do (1차) 실패: {str(e)}", file=sys.stderr)
+            log.debug('서브도메인 permission.do (1차) 실패', error=e)
         
         # 2-2-2. token.do 호출 → ssoToken, userClCd, txaaAdmNo 획득
         random_str = nts_generate_random_string(20)
@@ -320,12 +353,12 @@ def get_hometax_session(cert_path, password):
             if sso_token_match:
                 sso_token = sso_token_match[1]
         
-        print(f"[DEBUG Python] token.do 결과: ssoToken={'있음' if sso_token else '없음'}, userClCd={user_cl_cd}, txaaAdmNo={token_txaa_adm_no}", file=sys.stderr)
+        log.debug('token.do 결과', ssoToken=bool(sso_token), userClCd=user_cl_cd, txaaAdmNo=bool(token_txaa_adm_no))
         
         # 2-2-3. 서브도메인 permission.do 호출 (2차, 세션 활성화 주입) ⭐ 핵심
         if sso_token and (main_txaa_adm_no or token_txaa_adm_no):
             txaa_adm_no_to_use = token_txaa_adm_no or main_txaa_adm_no
-            print(f"[DEBUG Python] 서브도메인 세션 활성화 주입 시작 (txaaAdmNo: {txaa_adm_no_to_use})...", file=sys.stderr)
+            log.debug('서브도메인 세션 활성화 주입 시작')
             
             # JSON 형식으로 전송 (ref 프로젝트 패턴)
             activation_body = {
@@ -342,9 +375,9 @@ def get_hometax_session(cert_path, password):
                     headers={'Content-Type': "application/json; charset=UTF-8"},
                     timeout=20
                 )
-                print(f"[DEBUG Python] 서브도메인 세션 활성화 주입 완료 (상태 코드: {teht_perm_2.status_code})", file=sys.stderr)
+                log.debug('서브도메인 세션 활성화 주입 완료', status=teht_perm_2.status_code)
             except Exception as e:
-                print(f"[DEBUG Python] 서브도메인 세션 활성화 주입 실패: {str(e)}", file=sys.stderr)
+                log.debug('서브도메인 세션 활성화 주입 실패', error=e)
         
         # 2-2-4. teht 서브도메인 permission.do 호출 (최종, 세션 정보 추출용)
         perm_result = request_permission_teht(session, screen_id='UTEABHAA03')
@@ -352,7 +385,7 @@ def get_hometax_session(cert_path, password):
         # 2-2-5. 메인 도메인에서 추출한 txaaAdmNo가 있으면 사용
         if main_txaa_adm_no and not perm_result.get('txaaAdmNo'):
             perm_result['txaaAdmNo'] = main_txaa_adm_no
-            print(f"[DEBUG Python] 메인 도메인에서 추출한 txaaAdmNo를 사용: {main_txaa_adm_no[:20]}...", file=sys.stderr)
+            log.debug('메인 도메인에서 추출한 txaaAdmNo를 사용')
         
         if not perm_result.get('success'):
             # permission.do 실패 시에도 쿠키는 반환
@@ -395,6 +428,21 @@ def get_hometax_session(cert_path, password):
             'error': f"{str(e)}\n{traceback.format_exc()}"
         }
 
+def fetch_clients_for_session(session, txaa_adm_no='', pubc_user_no='', missing_statuses=None):
+    """
+    로그인된 세션으로 수임거래처 전체 목록을 조회합니다.
+    전체 조회(engagement_code="")가 거부되면 수임중/해지/미동의를 동시에 조회하며,
+    어느 방식이 통하는지는 txaaAdmNo별로 기록해 두고 다음 실행에서 재사용합니다.
+    속도 제어기는 pubc_user_no 키로 신고현황 수집기와 공유합니다.
+    missing_statuses(리스트)를 주면 조회에 실패한 수임 상태를 담습니다 (불완전한 목록 판별용).
+    
+    Returns:
+        거래처 목록 (각 거래처에 _engagementStatus 포함)
+    """
+    from hometax.clients.fetch import fetch_all_engagement_statuses
+    return fetch_all_engagement_statuses(session, txaa_adm_no if txaa_adm_no else None, pubc_user_no=pubc_user_no,
+                                         missing_statuses=missing_statuses)
+
 if __name__ == '__main__':
     if len(sys.argv) < 3:
         print(json.dumps({'error': 'Usage: python get-session-with-permission.py <cert_path> <password>'}))
@@ -416,86 +464,15 @@ if __name__ == '__main__':
     clients_data = []
     
     try:
-        # modules/hometax/clients/fetch.py의 fetch_hometax_clients 함수 사용
-        import importlib.util
-        clients_module_path = Path(__file__).parent.parent.parent / 'modules' / 'hometax' / 'clients' / 'fetch.py'
-        spec = importlib.util.spec_from_file_location("fetch_hometax_clients", clients_module_path)
-        clients_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(clients_module)
-        fetch_hometax_clients = clients_module.fetch_hometax_clients
-        
         # 수임거래처 조회 (수임중/해지 구분 없이 전체 조회)
         txaa_adm_no = result.get('txaaAdmNo') or ''
-        
-        # 전체 거래처 조회 (engagement_code를 빈 문자열로 시도)
-        clients_data = []
-        try:
-            # 먼저 빈 문자열로 전체 조회 시도
-            clients_data = fetch_hometax_clients(
-                session=session,
-                hometax_admin_code=txaa_adm_no if txaa_adm_no else None,
-                engagement_code=""  # 빈 문자열로 전체 조회 시도
-            )
-            print(f"[DEBUG Python] 전체 거래처 조회 성공: {len(clients_data)}개", file=sys.stderr)
-        except Exception as e:
-            print(f"[DEBUG Python] 전체 조회 실패, 수임중/해지/미동의 각각 조회 시도: {str(e)}", file=sys.stderr)
-            # 전체 조회 실패 시 수임중/해지/미동의를 각각 조회
-            try:
-                clients_active = fetch_hometax_clients(
-                    session=session,
-                    hometax_admin_code=txaa_adm_no if txaa_adm_no else None,
-                    engagement_code="1"
-                )
-                for client in clients_active: 
-                    client['_engagementStatus'] = '수임중'
-                clients_data.extend(clients_active)
-                print(f"[DEBUG Python] 수임중 거래처 조회: {len(clients_active)}개", file=sys.stderr)
-            except Exception as e2:
-                print(f"[DEBUG Python] 수임중 거래처 조회 실패: {str(e2)}", file=sys.stderr)
-            
-            try:
-                clients_terminated = fetch_hometax_clients(
-                    session=session,
-                    hometax_admin_code=txaa_adm_no if txaa_adm_no else None,
-                    engagement_code="2"
-                )
-                for client in clients_terminated: 
-                    client['_engagementStatus'] = '해지중'
-                clients_data.extend(clients_terminated)
-                print(f"[DEBUG Python] 해지 거래처 조회: {len(clients_terminated)}개", file=sys.stderr)
-            except Exception as e3:
-                print(f"[DEBUG Python] 해지 거래처 조회 실패: {str(e3)}", file=sys.stderr)
-            
-            # 미동의 상태 조회 추가
-            try:
-                clients_pending = fetch_hometax_clients(
-                    session=session,
-                    hometax_admin_code=txaa_adm_no if txaa_adm_no else None,
-                    engagement_code="3"
-                )
-                for client in clients_pending: 
-                    client['_engagementStatus'] = '미동의'
-                clients_data.extend(clients_pending)
-                print(f"[DEBUG Python] 미동의 거래처 조회: {len(clients_pending)}개", file=sys.stderr)
-            except Exception as e4:
-                print(f"[DEBUG Python] 미동의 거래처 조회 실패: {str(e4)}", file=sys.stderr)
-        
-        # _engagementStatus가 없는 경우 기본값 설정
-        for client in clients_data:
-            if '_engagementStatus' not in client:
-                # 원본 데이터에서 상태 확인
-                if client.get('ofbDt'):  # 해지일이 있으면 해지중
-                    client['_engagementStatus'] = '해지중'
-                else:
-                    client['_engagementStatus'] = '수임중'
+        clients_data = fetch_clients_for_session(session, txaa_adm_no, result.get('pubcUserNo') or '')
         api_success = True
-        print(f"[DEBUG Python] API 호출 성공: 총 {len(clients_data)}개", file=sys.stderr)
+        log.debug('거래처 조회 성공', count=len(clients_data))
         
     except Exception as e:
         api_error = str(e)
-        import traceback
-        print(f"[DEBUG Python] API 호출 실패: {str(e)}", file=sys.stderr)
-        print(f"[DEBUG Python] {traceback.format_exc()}", file=sys.stderr)
+        log.debug('거래처 조회 실패', error=e, exc_info=True)
     
     # 결과 통합 (Session 객체는 JSON 직렬화 불가하므로 제거)
     if 'session' in result:
@@ -506,4 +483,3 @@ if __name__ == '__main__':
     result['clients'] = clients_data if api_success else []
     
     print(json.dumps(result, ensure_ascii=False))
-
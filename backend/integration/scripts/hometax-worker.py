@@ -0,0 +1,260 @@
+"""
+홈택스 수집 워커 (상주 프로세스)
+인증서마다 python3 프로세스를 새로 띄우는 대신, 한 번 띄운 워커가 모듈과
+로그인된 requests.Session을 메모리에 유지한 채 JSON-lines 명령을 처리합니다.
+
+프로토콜 (stdin/stdout, 한 줄에 JSON 하나):
+    요청: {"id": 1, "command": "login", "params": {"cert_path": "...", "password": "..."}}
+    응답: {"id": 1, "ok": true, "result": {...}}  또는  {"id": 1, "ok": false, "error": "..."}
+
+명령:
+    ping, login, fetch_clients, collect_report, logout, list_sessions, shutdown
+
+stdout은 프로토콜 전용입니다. 모든 디버그 출력은 stderr로 보냅니다.
+"""
+
+import sys
+import hmac
+import json
+import hashlib
+import secrets
+import subprocess
+import threading
+import traceback
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, Optional
+
+SCRIPTS_DIR = Path(__file__).parent
+MODULES_DIR = Path(__file__).parent.parent.parent / 'modules'
+
+
+class HometaxWorker:
+    """
+    로그인된 세션을 메모리에 보관하고 명령을 처리하는 워커
+
+    세션은 인증서 경로를 session_id로 사용하여 보관하므로, 같은 인증서와 같은 비밀번호로 다시
+    login을 요청하면 재로그인 없이 기존 세션을 돌려줍니다 (force=True로 강제 재로그인).
+    세션에는 워커마다 무작위 솔트로 만든 비밀번호 HMAC만 보관하고, 비밀번호가 다르면
+    기존 세션을 내주지 않고 그 비밀번호로 다시 로그인합니다.
+    """
+
+    def __init__(self):
+        # 무거운 모듈(requests/pypinksign/cryptography)은 워커 생성 시 한 번만 로드
+        if str(MODULES_DIR) not in sys.path:
+            sys.path.insert(0, str(MODULES_DIR))
+        if str(SCRIPTS_DIR) not in sys.path:
+            sys.path.insert(0, str(SCRIPTS_DIR))
+
+        from script_modules import load_script
+        session_module = load_script('get-session-with-permission')
+        self._get_hometax_session = session_module.get_hometax_session
+        self._fetch_clients_for_session = session_module.fetch_clients_for_session
+
+        from hometax.clients.fetch import fetch_hometax_clients
+        from hometax.reports import HometaxTaxReportCollector
+        self._fetch_hometax_clients = fetch_hometax_clients
+        self._collector_cls = HometaxTaxReportCollector
+
+        self.sessions: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._salt = secrets.token_bytes(16)
+
+    def _password_mac(self, password: str) -> bytes:
+        return hmac.new(self._salt, password.encode('utf-8'), hashlib.sha256).digest()
+
+    def handle(self, request: Dict) -> Dict:
+        """요청 하나를 처리하여 응답 딕셔너리를 반환합니다."""
+        request_id = request.get('id')
+        command = request.get('command', '')
+        params = request.get('params') or {}
+
+        handler = getattr(self, f"cmd_{command}", None)
+        if handler is None:
+            return {'id': request_id, 'ok': False, 'error': f"알 수 없는 명령어: {command}"}
+
+        try:
+            # 로그인 모듈 등이 stdout에 출력하는 진행 메시지가 프로토콜을 깨뜨리지 않도록 stderr로 돌림
+            with redirect_stdout(sys.stderr):
+                result = handler(**params)
+            return {'id': request_id, 'ok': True, 'result': result}
+        except Exception as e:
+            print(f"[ERROR] {command} 실패: {traceback.format_exc()}", file=sys.stderr)
+            return {'id': request_id, 'ok': False, 'error': str(e)}
+
+    def _get_session_entry(self, session_id: str) -> Dict:
+        entry = self.sessions.get(session_id)
+        if entry is None:
+            raise Exception(f"로그인된 세션이 없습니다: {session_id}")
+        return entry
+
+    def cmd_ping(self) -> Dict:
+        return {'pong': True, 'sessions': len(self.sessions)}
+
+    def cmd_login(self, cert_path: str, password: str, force: bool = False) -> Dict:
+        """인증서로 로그인하고 세션을 보관합니다. 이미 로그인된 인증서는 재사용합니다."""
+        password_mac = self._password_mac(password)
+        with self._lock:
+            entry = self.sessions.get(cert_path)
+            reused = (entry is not None and not force
+                      and hmac.compare_digest(entry['password_mac'], password_mac))
+
+            if not reused:
+                # force면 디스크 세션 캐시도 건너뛰고 새로 로그인
+                login_result = self._get_hometax_session(cert_path, password, use_cache=False if force else None)
+                if not login_result.get('success'):
+                    raise Exception(login_result.get('error') or '로그인 실패')
+                entry = {
+                    'session': login_result['session'],
+                    'info': {k: v for k, v in login_result.items() if k != 'session'},
+                    'collector': None,
+                    'password_mac': password_mac,
+                }
+                self.sessions[cert_path] = entry
+
+        session = entry['session']
+        info = dict(entry['info'])
+        info['cookies'] = {cookie.name: cookie.value for cookie in session.cookies}
+        info['session_id'] = cert_path
+        info['reused'] = reused
+        return info
+
+    def cmd_fetch_clients(self, session_id: str, engagement_code: Optional[str] = None) -> Dict:
+        """
+        수임거래처 조회
+        engagement_code를 생략하면 전체(수임중/해지/미동의)를 조회합니다.
+        상태별 조회 중 일부가 실패하면 missingStatuses에 그 상태가 담기며, 이때 clients는 불완전한 목록입니다.
+        """
+        entry = self._get_session_entry(session_id)
+        session = entry['session']
+        txaa_adm_no = entry['info'].get('txaaAdmNo') or ''
+        pubc_user_no = entry['info'].get('pubcUserNo') or ''
+
+        missing_statuses = []
+        if engagement_code is None:
+            clients = self._fetch_clients_for_session(session, txaa_adm_no, pubc_user_no, missing_statuses)
+        else:
+            clients = self._fetch_hometax_clients(
+                session=session,
+                hometax_admin_code=txaa_adm_no if txaa_adm_no else None,
+                engagement_code=engagement_code,
+                pubc_user_no=pubc_user_no
+            )
+        return {'clients': clients, 'totalCount': len(clients), 'missingStatuses': missing_statuses}
+
+    def cmd_collect_report(self, session_id: str, tax_name: str, biz_no: str, start_date: str, end_date: str) -> Dict:
+        """세목별 신고현황 조회 (HometaxTaxReportCollector.collect_monthly_report)"""
+        entry = self._get_session_entry(session_id)
+        if entry['collector'] is None:
+            entry['collector'] = self._collector_cls(
+                session=entry['session'],
+                pubc_user_no=entry['info'].get('pubcUserNo') or '',
+                txaa_adm_no=entry['info'].get('txaaAdmNo') or None
+            )
+        return entry['collector'].collect_monthly_report(tax_name, biz_no, start_date, end_date)
+
+    def cmd_logout(self, session_id: str) -> Dict:
+        with self._lock:
+            entry = self.sessions.pop(session_id, None)
+        if entry:
+            entry['session'].close()
+        return {'removed': entry is not None}
+
+    def cmd_list_sessions(self) -> Dict:
+        return {'sessions': list(self.sessions.keys())}
+
+    def cmd_shutdown(self) -> Dict:
+        return {'shutdown': True}
+
+
+def serve(stdin=None, stdout=None) -> None:
+    """stdin에서 JSON-lines 요청을 읽어 stdout으로 응답합니다."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    worker = HometaxWorker()
+
+    print("[INFO] hometax-worker 준비 완료", file=sys.stderr)
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = {'id': None, 'ok': False, 'error': f"요청 파싱 실패: {str(e)}"}
+        else:
+            response = worker.handle(request)
+
+        stdout.write(json.dumps(response, ensure_ascii=False) + '\n')
+        stdout.flush()
+
+        if response.get('ok') and request.get('command') == 'shutdown':
+            break
+
+
+class HometaxWorkerClient:
+    """
+    hometax-worker.py 프로세스를 띄우고 명령을 보내는 클라이언트
+
+    사용 예:
+        client = HometaxWorkerClient()
+        info = client.call('login', cert_path=path, password=pw)
+        clients = client.call('fetch_clients', session_id=info['session_id'])
+        client.close()
+    """
+
+    def __init__(self, python: Optional[str] = None):
+        self._process = subprocess.Popen(
+            [python or sys.executable, str(Path(__file__).resolve())],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            bufsize=1,
+        )
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def call(self, command: str, **params) -> Dict:
+        """명령을 보내고 결과를 반환합니다. 실패 응답이면 예외를 발생시킵니다."""
+        with self._lock:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"워커 프로세스가 종료되었습니다 (코드: {self._process.returncode})")
+
+            self._next_id += 1
+            request = {'id': self._next_id, 'command': command, 'params': params}
+            self._process.stdin.write(json.dumps(request, ensure_ascii=False) + '\n')
+            self._process.stdin.flush()
+
+            line = self._process.stdout.readline()
+
+        if not line:
+            raise RuntimeError("워커 프로세스로부터 응답이 없습니다")
+
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise Exception(response.get('error') or f"{command} 실패")
+        return response.get('result') or {}
+
+    def close(self) -> None:
+        if self._process.poll() is None:
+            try:
+                self.call('shutdown')
+            except Exception:
+                pass
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == '__main__':
+    serve()
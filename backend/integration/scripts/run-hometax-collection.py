@@ -3,10 +3,7 @@ import sys
 import json
 import argparse
 from pathlib import Path
-import argparse
-from pathlib import Path
 import datetime
-import time
 
 # Backend Root 설정
 BASE_DIR = Path(__file__).parent.parent.parent
@@ -14,19 +11,34 @@ sys.path.insert(0, str(BASE_DIR))
 sys.path.insert(0, str(BASE_DIR / 'modules'))
 sys.path.insert(0, str(Path(__file__).parent))
 
-# 모듈 Import
 # 모듈 Import
 from hometax.reports import HometaxTaxReportCollector
+from script_modules import load_script
 
-# 하이픈(-)이 포함된 파일명은 importlib으로 동적 로딩
-import importlib.util
-session_script_path = Path(__file__).parent / 'get-session-with-permission.py'
-spec = importlib.util.spec_from_file_location("get_session_with_permission", session_script_path)
-session_module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(session_module)
-get_hometax_session = session_module.get_hometax_session
+get_hometax_session = load_script('get-session-with-permission').get_hometax_session
 
 from hometax.clients.fetch import fetch_hometax_clients
+from hometax.metrics import request_metrics
+
+
+# 결과 출력용 stdout (로그인/수집 모듈의 print는 main에서 stderr로 돌림)
+_STDOUT = sys.stdout
+
+
+def emit(record):
+    """NDJSON 한 줄 출력 (--stream 모드, 줄 단위로 바로 flush)"""
+    _STDOUT.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+    _STDOUT.flush()
+
+
+def fail(message, stream, exit_code=1):
+    """오류 출력 후 종료 (일반 모드는 기존 JSON, 스트림 모드는 error 레코드)"""
+    if stream:
+        emit({"type": "error", "status": "error", "message": message})
+    else:
+        print(json.dumps({"status": "error", "message": message}), file=_STDOUT)
+    sys.exit(exit_code)
+
 
 def main():
     parser = argparse.ArgumentParser(description="홈택스 세목별 신고 데이터 통합 수집기")
@@ -36,16 +48,20 @@ def main():
     parser.add_argument("--start_date", required=True, help="시작일 (YYYYMMDD)")
     parser.add_argument("--end_date", required=True, help="종료일 (YYYYMMDD)")
     parser.add_argument("--target_biz_no", required=False, help="특정 사업자번호만 수집 (Optional)")
+    parser.add_argument("--stream", action="store_true", help="거래처별 결과를 NDJSON으로 바로 출력 (마지막 줄은 summary)")
+    parser.add_argument("--include_raw", action="store_true", help="--stream 모드에서도 원본 응답(raw)을 포함")
     
     args = parser.parse_args()
+    
+    # stdout에는 결과 JSON/NDJSON만 나가도록 나머지 출력은 stderr로
+    sys.stdout = sys.stderr
 
     # 1. 로그인 및 세션 획득
     print(f"[INFO] 1. 로그인 및 세션 획득 중...", file=sys.stderr)
     session_result = get_hometax_session(args.cert_path, args.password)
     
     if not session_result['success']:
-        print(json.dumps({"status": "error", "message": f"Login failed: {session_result.get('error')}"}))
-        sys.exit(1)
+        fail(f"Login failed: {session_result.get('error')}", args.stream)
         
     session = session_result['session']
     pubc_user_no = session_result['pubcUserNo']
@@ -58,16 +74,17 @@ def main():
     print(f"[INFO] 2. 수임거래처 목록 조회 중...", file=sys.stderr)
     try:
         # 수임중(1) 거래처만 조회
-        clients = fetch_hometax_clients(session, txaa_adm_no, "1")
+        clients = fetch_hometax_clients(session, txaa_adm_no, "1", pubc_user_no=pubc_user_no)
     except Exception as e:
-        print(json.dumps({"status": "error", "message": f"Client fetch failed: {str(e)}"}))
-        sys.exit(1)
+        fail(f"Client fetch failed: {str(e)}", args.stream)
         
     if not clients:
-        print(json.dumps({"status": "error", "message": "No clients found"}))
-        sys.exit(0)
+        fail("No clients found", args.stream, exit_code=0)
         
     print(f"[INFO] 총 {len(clients)}개 거래처 조회됨", file=sys.stderr)
+    
+    if args.target_biz_no:
+        clients = [c for c in clients if c.get('bsno') == args.target_biz_no]
 
     # 3. 데이터 수집 준비
     collector = HometaxTaxReportCollector(
@@ -76,18 +93,19 @@ def main():
         txaa_adm_no=txaa_adm_no
     )
     
+    # 일반 모드만 결과를 모아 마지막에 출력 (스트림 모드는 거래처마다 바로 출력하고 집계만 유지)
     results = []
+    summary = {"total_count": 0, "success_count": 0, "error_count": 0, "row_count": 0}
     
     # 4. 순회 및 수집
     print(f"[INFO] 3. 데이터 수집 시작 ({args.tax_name}, {args.start_date}~{args.end_date})", file=sys.stderr)
+    if args.stream:
+        emit({"type": "start", "tax_name": args.tax_name, "start_date": args.start_date,
+              "end_date": args.end_date, "client_count": len(clients)})
     
-    for client in clients:
+    for index, client in enumerate(clients):
         biz_no = client.get('bsno')
         client_name = client.get('txprNm')
-        
-        # 특정 사업자 필터링
-        if args.target_biz_no and args.target_biz_no != biz_no:
-            continue
             
         print(f"[INFO] 수집 중: {client_name} ({biz_no})", file=sys.stderr)
         
@@ -102,25 +120,39 @@ def main():
             # 결과에 메타데이터 추가
             res['biz_no'] = biz_no
             res['client_name'] = client_name
-            results.append(res)
-            
-            # 과부하 방지 딜레이
-            time.sleep(2)
             
         except Exception as e:
-             results.append({
+            res = {
                 "status": "error",
                 "biz_no": biz_no,
                 "client_name": client_name,
                 "message": str(e)
-            })
+            }
+        
+        summary["total_count"] += 1
+        if res.get("status") == "success":
+            summary["success_count"] += 1
+            summary["row_count"] += res.get("count", 0)
+        else:
+            summary["error_count"] += 1
+        
+        if args.stream:
+            if not args.include_raw:
+                res.pop("raw", None)
+            emit({"type": "result", "index": index + 1, "tax_name": args.tax_name, **res})
+        else:
+            results.append(res)
     
-    # 5. 결과 출력 (JSON)
-    print(json.dumps({
-        "status": "success",
-        "total_count": len(results),
-        "results": results
-    }, ensure_ascii=False))
+    # 5. 결과 출력 (JSON / 스트림 모드는 마지막 summary 레코드)
+    if args.stream:
+        emit({"type": "summary", "status": "success", **summary, "requests": request_metrics().summary()})
+    else:
+        print(json.dumps({
+            "status": "success",
+            "total_count": len(results),
+            "results": results,
+            "requests": request_metrics().summary()
+        }, ensure_ascii=False), file=_STDOUT)
 
 if __name__ == "__main__":
     main()
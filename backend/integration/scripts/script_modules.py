@@ -0,0 +1,36 @@
+"""
+하이픈(-)이 포함된 통합 스크립트를 모듈로 불러오는 헬퍼
+Node.js가 파일 경로로 실행하는 스크립트(get-session-with-permission.py 등)는 파일명을 바꿀 수 없으므로,
+다른 스크립트에서 함수를 재사용할 때 이 헬퍼로 불러옵니다.
+
+불러온 모듈은 sys.modules에 밑줄 이름(get_session_with_permission)으로 등록되어,
+한 프로세스에서 여러 스크립트가 요청해도 파일은 한 번만 실행됩니다.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+MODULES_DIR = SCRIPTS_DIR.parent.parent / 'modules'
+
+if str(MODULES_DIR) not in sys.path:
+    sys.path.insert(0, str(MODULES_DIR))
+
+
+def load_script(name: str) -> ModuleType:
+    """scripts 폴더의 <name>.py를 불러옵니다 (예: load_script('get-session-with-permission'))"""
+    module_name = name.replace('-', '_')
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / f'{name}.py')
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
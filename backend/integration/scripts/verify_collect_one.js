@@ -1,6 +1,7 @@
 const path = require('path');
 const { spawn } = require('child_process');
 const fs = require('fs');
+const readline = require('readline');
 
 const PROJECT_ROOT = path.resolve(__dirname, '../../..');
 const SCRIPTS_DIR = path.join(PROJECT_ROOT, 'backend/integration/scripts');
@@ -43,6 +44,36 @@ function runPython(scriptName, args) {
     });
 }
 
+// Helper to run python script in --stream mode (NDJSON, one record per line)
+function runPythonStream(scriptName, args, onRecord) {
+    return new Promise((resolve, reject) => {
+        const scriptPath = path.join(SCRIPTS_DIR, scriptName);
+        console.log(`[EXEC] python3 -u ${scriptName} ${args.map(a => a.length > 50 ? a.substring(0, 20) + '...' : a).join(' ')}`);
+
+        const proc = spawn('python3', ['-u', scriptPath, ...args, '--stream'], { cwd: PROJECT_ROOT });
+        const lines = readline.createInterface({ input: proc.stdout });
+
+        let stderr = '';
+        let summary = null;
+
+        proc.stderr.on('data', d => stderr += d.toString());
+        lines.on('line', line => {
+            if (!line.trim()) return;
+            const record = JSON.parse(line);
+            if (record.type === 'summary') summary = record;
+            onRecord(record);
+        });
+
+        proc.on('close', code => {
+            if (code !== 0) {
+                console.error(`[ERR] ${stderr}`);
+                return reject(new Error(`Script ${scriptName} failed with code ${code}`));
+            }
+            resolve(summary);
+        });
+    });
+}
+
 // Helper to run dump_certs.js (Node script)
 function runDumpCerts() {
     return new Promise((resolve, reject) => {
@@ -93,10 +124,20 @@ async function run() {
             // '--target_biz_no', '7740403391' // 테스트용 특정 사업자
         ];
 
-        const result = await runPython('run-hometax-collection.py', collectArgs, true); // Use -u option
+        // 거래처별 결과를 도착하는 대로 출력 (마지막 summary 레코드 반환)
+        let total = 0;
+        const summary = await runPythonStream('run-hometax-collection.py', collectArgs, (record) => {
+            if (record.type === 'start') {
+                total = record.client_count;
+            } else if (record.type === 'result') {
+                console.log(`   [${record.index}/${total}] ${record.client_name} (${record.biz_no}): ${record.status} ${record.count ?? ''}`);
+            } else if (record.type === 'error') {
+                console.error(`   [ERROR] ${record.message}`);
+            }
+        });
 
         console.log('\n>>> [RESULT] 수집 결과:');
-        console.log(JSON.stringify(result, null, 2));
+        console.log(JSON.stringify(summary, null, 2));
 
     } catch (e) {
         console.error('\n[TEST FAILED]', e);
@@ -1,45 +1,42 @@
 """
 모든 모듈을 export하는 메인 인덱스 파일
-"""
-
-# 3. 조회된 인증서의 파일에서 유효기간등 유추
-try:
-    from .certificate.metadata.infer import infer_metadata_from_file
-except ImportError:
-    from certificate.metadata.infer import infer_metadata_from_file
-
-# 4. 인증서 파싱 (비밀번호 입력전)
-try:
-    from .certificate.parsing.without_password import parse_certificate_without_password
-except ImportError:
-    from certificate.parsing.without_password import parse_certificate_without_password
-
-# 5. 인증서 파싱 (비밀번호 입력후)
-try:
-    from .certificate.parsing.with_password import parse_certificate_with_password
-except ImportError:
-    from certificate.parsing.with_password import parse_certificate_with_password
-
-# 7. 인증서 로그인
-try:
-    from .hometax.auth.login import login_with_certificate
-except ImportError:
-    from hometax.auth.login import login_with_certificate
-
-# 8. 인증서 로그인 후 추가 쿠키획득
-try:
-    from .hometax.auth.session import fetch_additional_cookies
-except ImportError:
-    from hometax.auth.session import fetch_additional_cookies
-
-__all__ = [
-    'infer_metadata_from_file',
-    'parse_certificate_without_password',
-    'parse_certificate_with_password',
-    'login_with_certificate',
-    'fetch_additional_cookies',
-]
-
-
 
+각 함수는 처음 사용할 때 해당 모듈만 import합니다 (PEP 562).
+인증서 유효기간 조회처럼 pypinksign/requests가 필요 없는 CLI가
+로그인 모듈까지 함께 불러오지 않도록 하기 위함입니다.
+"""
 
+from importlib import import_module
+
+# 이름 -> 정의된 모듈 (이 패키지 기준 상대 경로)
+_EXPORTS = {
+    # 3. 조회된 인증서의 파일에서 유효기간등 유추
+    'infer_metadata_from_file': 'certificate.metadata.infer',
+    # 4. 인증서 파싱 (비밀번호 입력전)
+    'parse_certificate_without_password': 'certificate.parsing.without_password',
+    # 5. 인증서 파싱 (비밀번호 입력후)
+    'parse_certificate_with_password': 'certificate.parsing.with_password',
+    # 7. 인증서 로그인
+    'login_with_certificate': 'hometax.auth.login',
+    # 8. 인증서 로그인 후 추가 쿠키획득
+    'fetch_additional_cookies': 'hometax.auth.session',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        module = import_module(f'.{module_name}', __name__)
+    except ImportError:
+        module = import_module(module_name)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
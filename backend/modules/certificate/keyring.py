@@ -0,0 +1,266 @@
+"""
+인증서 키링 (프로세스 내 복호화 캐시)
+인증서 개인키 복호화(SEED/PBKDF)는 호출마다 수십~수백 ms가 걸립니다.
+로그인, 비밀번호 검증, 서명이 모두 이 키링을 거치도록 하여 인증서마다 한 번만 복호화하고
+PinkSign 객체를 재사용합니다.
+
+- 유휴 만료: 마지막 사용 후 idle_timeout초가 지나면 백그라운드 정리에서 폐기합니다.
+- 폐기(zeroize): 개인키, 비밀번호, 원본 파일 데이터, randomNum 참조를 PinkSign 객체에서 지우고,
+  변경 가능한 버퍼(bytearray)는 0으로 덮어씁니다. 파이썬 bytes는 불변이므로 참조를 끊는 것까지가 한계입니다.
+- 비밀번호 확인: 캐시 항목에는 키링마다 무작위 솔트로 만든 HMAC만 보관하고,
+  다른 비밀번호로 요청하면 캐시를 쓰지 않고 다시 복호화합니다 (틀린 비밀번호는 그대로 예외).
+- 인증서 파일이 바뀌면(mtime/크기) 다시 복호화합니다.
+- 대여(lease): p12()/der_key()는 with 블록 동안만 PinkSign을 빌려 줍니다. 빌려 간 객체는 만료/교체/evict되어도
+  키링에서만 빠지고, 마지막 대여가 끝날 때 폐기하므로 다른 스레드가 서명 도중에 개인키를 잃지 않습니다.
+
+CERT_KEYRING_IDLE_TIMEOUT 환경변수로 기본 유휴 시간을 바꿀 수 있습니다 (0이면 캐시하지 않음).
+
+사용 예:
+    with certificate_keyring().p12(cert_path, password) as sign:
+        signed = sign.pkcs7_signed_msg(message)
+    with certificate_keyring().der_key(der_path, key_path, password) as sign:
+        ...
+    certificate_keyring().clear()   # 모든 키 폐기 (대여 중인 키는 반납 시 폐기)
+"""
+
+import atexit
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from pyasn1.type.univ import BitString
+from pypinksign import PinkSign
+
+from .parsing.random_num import extract_random_num_p12
+
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+# 폐기 시 지울 PinkSign 속성 (개인키/비밀번호/원본 데이터/randomNum)
+_SECRET_ATTRS = ('prikey', 'prikey_password', 'prikey_data', 'p12_data', '_rand_num', 'rand_num')
+
+
+def zeroize(sign: PinkSign) -> None:
+    """PinkSign 객체의 비밀 정보를 지웁니다 (bytearray는 0으로 덮어씀)."""
+    for attr in _SECRET_ATTRS:
+        value = getattr(sign, attr, None)
+        if isinstance(value, (bytearray, memoryview)) and not getattr(value, 'readonly', False):
+            value[:] = b'\x00' * len(value)
+        if value is not None:
+            try:
+                setattr(sign, attr, None)
+            except AttributeError:
+                pass
+
+
+def _file_stamp(*paths: str) -> Tuple:
+    stamp = []
+    for path in paths:
+        st = os.stat(path)
+        stamp.append((st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
+
+class _Entry:
+    __slots__ = ('sign', 'digest', 'stamp', 'last_used', 'leases', 'retired')
+
+    def __init__(self, sign: PinkSign, digest: bytes, stamp: Tuple):
+        self.sign = sign
+        self.digest = digest
+        self.stamp = stamp
+        self.last_used = time.monotonic()
+        # 대여 중인 수와 키링에서 빠졌는지 여부 (잠금 안에서만 변경)
+        self.leases = 0
+        self.retired = False
+
+
+class CertificateKeyring:
+    """
+    인증서별로 복호화된 PinkSign 객체를 보관하는 키링 (스레드 안전)
+
+    Args:
+        idle_timeout: 마지막 사용 후 폐기까지의 시간(초). 0 이하이면 캐시하지 않음
+    """
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._salt = secrets.token_bytes(16)
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._timer: Optional[threading.Timer] = None
+        self.hits = 0
+        self.misses = 0
+
+    @contextmanager
+    def p12(self, cert_path: str, password: str) -> Iterator[PinkSign]:
+        """P12/PFX 인증서를 with 블록 동안 빌려 줍니다 (복호화된 객체를 재사용)"""
+        if not os.path.exists(cert_path):
+            raise FileNotFoundError(f"인증서 파일을 찾을 수 없습니다: {cert_path}")
+        entry = self._acquire((cert_path,), password, lambda: _load_p12(cert_path, password))
+        try:
+            yield entry.sign
+        finally:
+            self._release(entry)
+
+    @contextmanager
+    def der_key(self, der_path: str, key_path: str, password: str) -> Iterator[PinkSign]:
+        """DER+KEY 인증서를 with 블록 동안 빌려 줍니다 (복호화된 객체를 재사용)"""
+        if not os.path.exists(der_path):
+            raise FileNotFoundError(f"DER 파일을 찾을 수 없습니다: {der_path}")
+        if not os.path.exists(key_path):
+            raise FileNotFoundError(f"KEY 파일을 찾을 수 없습니다: {key_path}")
+        entry = self._acquire((der_path, key_path), password, lambda: _load_der_key(der_path, key_path, password))
+        try:
+            yield entry.sign
+        finally:
+            self._release(entry)
+
+    def _acquire(self, paths: Tuple[str, ...], password: str, load: Callable[[], PinkSign]) -> _Entry:
+        """캐시된 항목을 대여하거나 새로 복호화해 등록한 뒤 대여합니다."""
+        if self.idle_timeout <= 0:
+            self.misses += 1
+            # 캐시하지 않음: 반납하면 바로 폐기
+            entry = _Entry(load(), b'', ())
+            entry.leases, entry.retired = 1, True
+            return entry
+
+        key = tuple(os.path.realpath(p) for p in paths) + ('',) * (2 - len(paths))
+        digest = hmac.new(self._salt, password.encode('utf-8'), hashlib.sha256).digest()
+        stamp = _file_stamp(*paths)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if (entry is not None and entry.stamp == stamp and hmac.compare_digest(entry.digest, digest)
+                    and time.monotonic() - entry.last_used < self.idle_timeout):
+                entry.last_used = time.monotonic()
+                entry.leases += 1
+                self.hits += 1
+                return entry
+
+        # 복호화는 잠금 밖에서 (다른 인증서 조회를 막지 않음)
+        entry = _Entry(load(), digest, stamp)
+        entry.leases = 1
+        with self._lock:
+            self.misses += 1
+            # 만료되었거나 파일/비밀번호가 바뀌어 교체된 이전 항목은 대여가 끝나면 폐기
+            previous = self._retire(self._entries.get(key))
+            self._entries[key] = entry
+            self._schedule_sweep()
+        if previous is not None:
+            zeroize(previous.sign)
+        return entry
+
+    def _release(self, entry: _Entry) -> None:
+        """대여 반납. 키링에서 빠진 항목의 마지막 대여였으면 폐기"""
+        with self._lock:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            dispose = entry.retired and entry.leases == 0
+        if dispose:
+            zeroize(entry.sign)
+
+    @staticmethod
+    def _retire(entry: Optional[_Entry]) -> Optional[_Entry]:
+        """
+        잠금을 잡은 상태에서 호출: 키링에서 빠지는 항목을 표시하고,
+        대여 중이 아니라서 지금 폐기해도 되면 그 항목을 반환 (폐기는 잠금 밖에서)
+        """
+        if entry is None:
+            return None
+        entry.retired = True
+        return entry if entry.leases == 0 else None
+
+    def _schedule_sweep(self) -> None:
+        """잠금을 잡은 상태에서 호출: 유휴 항목 정리 타이머 예약"""
+        if self._timer is not None or not self._entries:
+            return
+        self._timer = threading.Timer(min(self.idle_timeout, 60.0), self._sweep)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _sweep(self) -> None:
+        with self._lock:
+            self._timer = None
+        self.purge_expired()
+        with self._lock:
+            self._schedule_sweep()
+
+    def purge_expired(self) -> int:
+        """유휴 시간이 지난 항목을 폐기합니다. 폐기한 수를 반환"""
+        now = time.monotonic()
+        with self._lock:
+            # 대여 중인 항목은 사용 중이므로 만료시키지 않음
+            expired = [k for k, e in self._entries.items()
+                       if e.leases == 0 and now - e.last_used >= self.idle_timeout]
+            entries = [self._retire(self._entries.pop(k)) for k in expired]
+        for entry in entries:
+            zeroize(entry.sign)
+        return len(entries)
+
+    def evict(self, cert_path: str, key_path: Optional[str] = None) -> bool:
+        """인증서 하나를 키링에서 즉시 빼고 폐기합니다 (대여 중이면 반납 시 폐기)."""
+        key = (os.path.realpath(cert_path), os.path.realpath(key_path) if key_path else '')
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            disposable = self._retire(entry)
+        if entry is None:
+            return False
+        if disposable is not None:
+            zeroize(disposable.sign)
+        return True
+
+    def clear(self) -> None:
+        """모든 항목을 폐기하고 정리 타이머를 멈춥니다 (대여 중인 항목은 반납 시 폐기)."""
+        with self._lock:
+            entries = [self._retire(e) for e in self._entries.values()]
+            self._entries.clear()
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        for entry in entries:
+            if entry is not None:
+                zeroize(entry.sign)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _load_p12(cert_path: str, password: str) -> PinkSign:
+    with open(cert_path, 'rb') as f:
+        p12_data = f.read()
+    sign = PinkSign(p12_data=p12_data, prikey_password=password.encode('utf-8'))
+    # PinkSign은 P12의 개인키 속성을 버리므로 randomNum을 직접 읽어 DER+KEY와 같은 형태로 붙여 둠
+    if getattr(sign, '_rand_num', None) is None:
+        try:
+            sign._rand_num = BitString.fromOctetString(extract_random_num_p12(p12_data, password))
+        except ValueError:
+            pass
+    return sign
+
+
+def _load_der_key(der_path: str, key_path: str, password: str) -> PinkSign:
+    with open(der_path, 'rb') as f:
+        der_data = f.read()
+    sign = PinkSign(pubkey_data=der_data)
+    with open(key_path, 'rb') as f:
+        key_data = f.read()
+    sign.load_prikey(prikey_data=key_data, prikey_password=password.encode('utf-8'))
+    return sign
+
+
+_keyring: Optional[CertificateKeyring] = None
+_keyring_lock = threading.Lock()
+
+
+def certificate_keyring() -> CertificateKeyring:
+    """프로세스 공용 키링 (종료 시 자동 폐기)"""
+    global _keyring
+    with _keyring_lock:
+        if _keyring is None:
+            _keyring = CertificateKeyring(float(os.environ.get('CERT_KEYRING_IDLE_TIMEOUT', DEFAULT_IDLE_TIMEOUT)))
+            atexit.register(_keyring.clear)
+        return _keyring
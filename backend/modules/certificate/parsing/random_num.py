@@ -0,0 +1,313 @@
+"""
+P12/PFX 인증서의 KISA randomNum(1.2.410.200004.10.1.1.3) 추출
+PinkSign은 P12를 cryptography로 읽으면서 개인키 속성을 버리므로 P12 인증서에는 _rand_num이 없습니다.
+openssl pkcs12 -info를 서브프로세스로 실행하는 대신, PKCS#12 구조를 직접 읽고 키 백을 복호화하여
+개인키 속성(또는 백 속성)에 있는 randomNum을 꺼냅니다.
+
+지원 암호화:
+- PBES2 (PBKDF2-HMAC-SHA1/SHA224/SHA256/SHA384/SHA512 + AES-CBC / DES-EDE3-CBC / SEED-CBC)
+- PKCS#12 PBE pbeWithSHAAnd3-KeyTripleDES-CBC
+DER과 BER(부정 길이, 분할 OCTET STRING) 인코딩을 모두 읽습니다.
+"""
+
+import hashlib
+import math
+from typing import Iterator, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, modes
+from cryptography.hazmat.primitives.ciphers.algorithms import AES
+
+try:
+    from cryptography.hazmat.decrepit.ciphers.algorithms import TripleDES
+except ImportError:
+    from cryptography.hazmat.primitives.ciphers.algorithms import TripleDES
+
+
+def _oid(dotted: str) -> bytes:
+    """OID 문자열을 DER 내용 바이트로"""
+    parts = [int(p) for p in dotted.split('.')]
+    out = bytearray([parts[0] * 40 + parts[1]])
+    for part in parts[2:]:
+        chunk = [part & 0x7f]
+        part >>= 7
+        while part:
+            chunk.append(0x80 | (part & 0x7f))
+            part >>= 7
+        out.extend(reversed(chunk))
+    return bytes(out)
+
+
+ID_KISA_NPKI_RAND_NUM = _oid('1.2.410.200004.10.1.1.3')
+
+_ID_DATA = _oid('1.2.840.113549.1.7.1')
+_ID_ENCRYPTED_DATA = _oid('1.2.840.113549.1.7.6')
+_ID_KEY_BAG = _oid('1.2.840.113549.1.12.10.1.1')
+_ID_SHROUDED_KEY_BAG = _oid('1.2.840.113549.1.12.10.1.2')
+
+_ID_PBES2 = _oid('1.2.840.113549.1.5.13')
+_ID_PBKDF2 = _oid('1.2.840.113549.1.5.12')
+_ID_PBE_SHA1_3DES = _oid('1.2.840.113549.1.12.1.3')
+
+_PRF_HASHES = {
+    _oid('1.2.840.113549.2.7'): 'sha1',
+    _oid('1.2.840.113549.2.8'): 'sha224',
+    _oid('1.2.840.113549.2.9'): 'sha256',
+    _oid('1.2.840.113549.2.10'): 'sha384',
+    _oid('1.2.840.113549.2.11'): 'sha512',
+}
+
+# PBES2 암호화 방식: (이름, 키 길이)
+_PBES2_CIPHERS = {
+    _oid('2.16.840.1.101.3.4.1.2'): ('aes', 16),
+    _oid('2.16.840.1.101.3.4.1.22'): ('aes', 24),
+    _oid('2.16.840.1.101.3.4.1.42'): ('aes', 32),
+    _oid('1.2.840.113549.3.7'): ('3des', 24),
+    _oid('1.2.410.200004.1.4'): ('seed', 16),
+}
+
+_SEQUENCE = 0x30
+_SET = 0x31
+_BIT_STRING = 0x03
+
+
+class UnsupportedP12Error(ValueError):
+    """지원하지 않는 PKCS#12 구성 (암호화 방식, 무결성 모드 등)"""
+
+
+class _Node:
+    """DER/BER 요소 하나 (태그와 내용 바이트)"""
+
+    __slots__ = ('tag', 'content')
+
+    def __init__(self, tag: int, content: bytes):
+        self.tag = tag
+        self.content = content
+
+    @property
+    def constructed(self) -> bool:
+        return bool(self.tag & 0x20)
+
+    @property
+    def children(self) -> List['_Node']:
+        return _parse_all(self.content)
+
+    def octets(self) -> bytes:
+        """OCTET STRING 값 (BER 분할 인코딩이면 이어 붙임). 문맥 태그가 붙은 경우도 허용"""
+        if not self.constructed:
+            return self.content
+        return b''.join(child.octets() for child in self.children)
+
+    def integer(self) -> int:
+        return int.from_bytes(self.content, 'big', signed=True)
+
+
+def _read(data: bytes, pos: int) -> Tuple[_Node, int]:
+    tag = data[pos]
+    pos += 1
+    if tag & 0x1f == 0x1f:
+        while data[pos] & 0x80:
+            pos += 1
+        pos += 1
+    length = data[pos]
+    pos += 1
+    if length == 0x80:
+        # BER 부정 길이: 끝 표시(00 00)까지 하위 요소를 읽음
+        start = pos
+        while data[pos:pos + 2] != b'\x00\x00':
+            _, pos = _read(data, pos)
+        return _Node(tag, data[start:pos]), pos + 2
+    if length & 0x80:
+        count = length & 0x7f
+        length = int.from_bytes(data[pos:pos + count], 'big')
+        pos += count
+    end = pos + length
+    if end > len(data):
+        raise ValueError("ASN.1 길이가 데이터보다 깁니다")
+    return _Node(tag, data[pos:end]), end
+
+
+def _parse_all(data: bytes) -> List[_Node]:
+    nodes, pos = [], 0
+    while pos < len(data):
+        node, pos = _read(data, pos)
+        nodes.append(node)
+    return nodes
+
+
+def _parse(data: bytes) -> _Node:
+    node, _ = _read(data, 0)
+    return node
+
+
+def _fill(data: bytes, v: int) -> bytes:
+    """data를 반복하여 v의 배수 길이로 채움 (RFC 7292 B.2의 S, P)"""
+    if not data:
+        return b''
+    size = v * math.ceil(len(data) / v)
+    return (data * math.ceil(size / len(data)))[:size]
+
+
+def _pkcs12_kdf(password: bytes, salt: bytes, iterations: int, key_id: int, size: int) -> bytes:
+    """RFC 7292 부록 B.2 키 유도 (SHA-1)"""
+    u, v = 20, 64
+    d = bytes([key_id]) * v
+    block = bytearray(_fill(salt, v) + _fill(password, v))
+    out = b''
+    while len(out) < size:
+        a = hashlib.sha1(d + bytes(block)).digest()
+        for _ in range(iterations - 1):
+            a = hashlib.sha1(a).digest()
+        out += a
+        b = int.from_bytes((a * math.ceil(v / u))[:v], 'big')
+        for j in range(0, len(block), v):
+            chunk = (int.from_bytes(block[j:j + v], 'big') + b + 1) % (1 << (8 * v))
+            block[j:j + v] = chunk.to_bytes(v, 'big')
+    return out[:size]
+
+
+def _cbc_decrypt(cipher_name: str, key: bytes, iv: bytes, ciphertext: bytes) -> bytes:
+    if cipher_name == 'seed':
+        from pypinksign.pypinksign import seed_cbc_128_decrypt
+        return seed_cbc_128_decrypt(key, ciphertext, iv)
+    algorithm = AES(key) if cipher_name == 'aes' else TripleDES(key)
+    decryptor = Cipher(algorithm, modes.CBC(iv)).decryptor()
+    padded = decryptor.update(ciphertext) + decryptor.finalize()
+    unpadder = padding.PKCS7(algorithm.block_size).unpadder()
+    return unpadder.update(padded) + unpadder.finalize()
+
+
+def _decrypt(algorithm: _Node, ciphertext: bytes, password: str) -> bytes:
+    """AlgorithmIdentifier에 따라 복호화. 비밀번호가 틀리면 ValueError, 지원하지 않는 방식이면 UnsupportedP12Error"""
+    fields = algorithm.children
+    oid = fields[0].content
+    params = fields[1] if len(fields) > 1 else None
+
+    if oid == _ID_PBE_SHA1_3DES:
+        salt, iterations = params.children[0].content, params.children[1].integer()
+        bmp = password.encode('utf-16-be') + b'\x00\x00'
+        key = _pkcs12_kdf(bmp, salt, iterations, 1, 24)
+        iv = _pkcs12_kdf(bmp, salt, iterations, 2, 8)
+        return _cbc_decrypt('3des', key, iv, ciphertext)
+
+    if oid == _ID_PBES2:
+        kdf, scheme = params.children
+        kdf_oid, kdf_params = kdf.children[0].content, kdf.children[1]
+        if kdf_oid != _ID_PBKDF2:
+            raise UnsupportedP12Error("지원하지 않는 PBES2 키 유도 방식")
+        kdf_fields = kdf_params.children
+        salt, iterations = kdf_fields[0].octets(), kdf_fields[1].integer()
+        hash_name = 'sha1'
+        for field in kdf_fields[2:]:
+            if field.tag == _SEQUENCE:
+                hash_name = _PRF_HASHES.get(field.children[0].content)
+                if hash_name is None:
+                    raise UnsupportedP12Error("지원하지 않는 PBKDF2 PRF")
+
+        scheme_fields = scheme.children
+        cipher = _PBES2_CIPHERS.get(scheme_fields[0].content)
+        if cipher is None:
+            raise UnsupportedP12Error("지원하지 않는 PBES2 암호화 방식")
+        cipher_name, key_size = cipher
+        key = hashlib.pbkdf2_hmac(hash_name, password.encode('utf-8'), salt, iterations, key_size)
+        return _cbc_decrypt(cipher_name, key, scheme_fields[1].octets(), ciphertext)
+
+    raise UnsupportedP12Error("지원하지 않는 PKCS#12 암호화 방식")
+
+
+def _attribute_rand(attributes: _Node) -> Optional[bytes]:
+    """SET OF Attribute에서 randomNum 값"""
+    for attribute in attributes.children:
+        fields = attribute.children
+        if len(fields) < 2 or fields[0].content != ID_KISA_NPKI_RAND_NUM:
+            continue
+        for value in fields[1].children:
+            if value.tag == _BIT_STRING:
+                return value.content[1:]
+            return value.octets()
+    return None
+
+
+def _private_key_rand(private_key_info: bytes) -> Optional[bytes]:
+    """PrivateKeyInfo의 attributes [0]에서 randomNum 값"""
+    for field in _parse(private_key_info).children[3:]:
+        if field.tag in (0xa0, 0x80):
+            return _attribute_rand(_Node(_SET, field.content))
+    return None
+
+
+def _safe_contents(p12: _Node, password: str) -> Iterator[_Node]:
+    """AuthenticatedSafe의 SafeContents (암호화된 영역은 복호화, 읽지 못하는 영역은 건너뜀)"""
+    auth_safe = p12.children[1]
+    if auth_safe.children[0].content != _ID_DATA:
+        raise UnsupportedP12Error("공개키 무결성 모드 P12는 지원하지 않습니다")
+    for content_info in _parse(auth_safe.children[1].children[0].octets()).children:
+        content_type, content = content_info.children[0].content, content_info.children[1]
+        if content_type == _ID_DATA:
+            yield _parse(content.children[0].octets())
+        elif content_type == _ID_ENCRYPTED_DATA:
+            encrypted_content_info = content.children[0].children[1]
+            fields = encrypted_content_info.children
+            if len(fields) < 3:
+                continue
+            try:
+                yield _parse(_decrypt(fields[1], fields[2].octets(), password))
+            except ValueError:
+                # 인증서만 담는 RC2 암호화 영역 등: 키 백이 없으므로 건너뜀
+                continue
+
+
+def private_key_infos(p12_data: bytes, password: str) -> Iterator[Tuple[bytes, List[_Node]]]:
+    """
+    P12 안의 개인키(PrivateKeyInfo DER)와 해당 백 속성 목록
+
+    Raises:
+        ValueError: 비밀번호가 틀림 (UnsupportedP12Error: 지원하지 않는 암호화 방식)
+        IndexError: P12 구조가 아님
+    """
+    for safe_contents in _safe_contents(_parse(p12_data), password):
+        for bag in safe_contents.children:
+            fields = bag.children
+            bag_id, value = fields[0].content, fields[1].children[0]
+            attributes = fields[2:3]
+            if bag_id == _ID_KEY_BAG:
+                yield _read_bytes(value), attributes
+            elif bag_id == _ID_SHROUDED_KEY_BAG:
+                algorithm, encrypted = value.children
+                try:
+                    private_key_info = _decrypt(algorithm, encrypted.octets(), password)
+                except UnsupportedP12Error:
+                    raise
+                except ValueError as e:
+                    raise ValueError("개인키 복호화 실패 (비밀번호 확인)") from e
+                yield private_key_info, attributes
+
+
+def _read_bytes(node: _Node) -> bytes:
+    """요소를 다시 DER 바이트로 (태그 + 길이 + 내용)"""
+    length = len(node.content)
+    if length < 0x80:
+        header = bytes([node.tag, length])
+    else:
+        size = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+        header = bytes([node.tag, 0x80 | len(size)]) + size
+    return header + node.content
+
+
+def extract_random_num_p12(p12_data: bytes, password: str) -> bytes:
+    """
+    P12/PFX 데이터에서 randomNum 원본 바이트 추출
+
+    Raises:
+        ValueError: P12 형식 오류, 비밀번호 오류, 또는 randomNum 없음
+    """
+    try:
+        for private_key_info, bag_attributes in private_key_infos(p12_data, password):
+            rand = _private_key_rand(private_key_info)
+            if rand is None and bag_attributes:
+                rand = _attribute_rand(bag_attributes[0])
+            if rand:
+                return rand
+    except (IndexError, AttributeError):
+        raise ValueError("P12 구조를 읽을 수 없습니다 (형식 또는 비밀번호 확인)")
+    raise ValueError("랜덤 번호를 찾을 수 없습니다")
@@ -4,9 +4,18 @@
 """
 
 import os
-from typing import Dict, Optional
+from typing import ContextManager, Dict, Optional
 from pypinksign import PinkSign
 
+# 테스트 스크립트가 파일 경로로 직접 로드하는 경우에는 modules 경로를 추가하여 import
+try:
+    from ..keyring import certificate_keyring
+except ImportError:
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from certificate.keyring import certificate_keyring
+
 
 def parse_certificate_with_password(
     cert_path: str,
@@ -28,7 +37,7 @@ def parse_certificate_with_password(
     
     # P12/PFX 형식
     if cert_path_lower.endswith('.p12') or cert_path_lower.endswith('.pfx'):
-        sign = load_p12_certificate(cert_path, password)
+        lease = load_p12_certificate(cert_path, password)
     
     # DER+KEY 형식
     elif cert_path_lower.endswith('.der'):
@@ -41,52 +50,24 @@ def parse_certificate_with_password(
             else:
                 raise ValueError(f"DER 형식 인증서는 .key 파일이 필요합니다: {cert_path}")
         
-        sign = load_der_key_certificate(cert_path, key_path, password)
+        lease = load_der_key_certificate(cert_path, key_path, password)
     
     else:
         raise ValueError(f"지원하지 않는 인증서 형식: {cert_path}")
     
     # 인증서 정보 추출
-    return get_certificate_info(sign)
+    with lease as sign:
+        return get_certificate_info(sign)
 
 
-def load_p12_certificate(cert_path: str, password: str) -> PinkSign:
-    """P12/PFX 형식 인증서 로드"""
-    if not os.path.exists(cert_path):
-        raise FileNotFoundError(f"인증서 파일을 찾을 수 없습니다: {cert_path}")
-    
-    with open(cert_path, 'rb') as f:
-        p12_data = f.read()
-    
-    sign = PinkSign(
-        p12_data=p12_data,
-        prikey_password=password.encode('utf-8')
-    )
-    
-    return sign
+def load_p12_certificate(cert_path: str, password: str) -> ContextManager[PinkSign]:
+    """P12/PFX 형식 인증서 대여 (with 블록 동안 사용, 키링: 같은 인증서는 한 번만 복호화)"""
+    return certificate_keyring().p12(cert_path, password)
 
 
-def load_der_key_certificate(der_path: str, key_path: str, password: str) -> PinkSign:
-    """DER+KEY 형식 인증서 로드"""
-    if not os.path.exists(der_path):
-        raise FileNotFoundError(f"DER 파일을 찾을 수 없습니다: {der_path}")
-    if not os.path.exists(key_path):
-        raise FileNotFoundError(f"KEY 파일을 찾을 수 없습니다: {key_path}")
-    
-    with open(der_path, 'rb') as f:
-        der_data = f.read()
-    
-    sign = PinkSign(pubkey_data=der_data)
-    
-    with open(key_path, 'rb') as f:
-        key_data = f.read()
-    
-    sign.load_prikey(
-        prikey_data=key_data,
-        prikey_password=password.encode('utf-8')
-    )
-    
-    return sign
+def load_der_key_certificate(der_path: str, key_path: str, password: str) -> ContextManager[PinkSign]:
+    """DER+KEY 형식 인증서 대여 (with 블록 동안 사용, 키링: 같은 인증서는 한 번만 복호화)"""
+    return certificate_keyring().der_key(der_path, key_path, password)
 
 
 def get_certificate_info(sign: PinkSign) -> Dict:
@@ -10,9 +10,12 @@ from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 
 try:
-    from .infer_metadata_from_file import infer_metadata_from_file
+    from ..metadata.infer import infer_metadata_from_file
 except ImportError:
-    from infer_metadata_from_file import infer_metadata_from_file
+    try:
+        from .infer_metadata_from_file import infer_metadata_from_file
+    except ImportError:
+        from infer_metadata_from_file import infer_metadata_from_file
 
 
 def parse_certificate_without_password(cert_path: str) -> Dict:
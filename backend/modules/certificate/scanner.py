@@ -0,0 +1,200 @@
+"""
+인증서 일괄 조회 (비밀번호 불필요)
+저장된 NPKI 인증서(DER/P12/PFX) 전체의 메타데이터를 한 번의 호출로 조회합니다.
+파일 파싱은 프로세스 풀에서 병렬로 처리하고, 결과는 (경로, 크기, 수정 시각) 기준으로 캐시하여
+바뀌지 않은 인증서는 다시 파싱하지 않습니다. 만료 여부/남은 일수는 조회 시점 기준으로 다시 계산합니다.
+
+사용 예:
+    result = scan_certificates(root_dir='~/NPKI')
+    result = scan_certificates(paths=['.../signCert.der', '.../회사.pfx'])
+
+CLI:
+    python -m certificate.scanner [--root DIR] [--cache PATH] [--workers N] [paths...]
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .parsing.without_password import parse_certificate_without_password
+
+DEFAULT_SCAN_CACHE = Path('data') / 'certificate-scan-cache.json'
+
+# 공개 인증서 파일 확장자 (signPri.key 등 개인키 파일은 제외)
+CERT_EXTENSIONS = ('.der', '.p12', '.pfx')
+
+# 이 개수 미만이면 프로세스 풀을 띄우지 않고 현재 프로세스에서 파싱
+_POOL_THRESHOLD = 8
+
+_CACHE_VERSION = 1
+
+
+def find_certificates(root_dir: Union[str, Path]) -> List[str]:
+    """root_dir 아래의 인증서 파일 경로 (정렬됨)"""
+    found = []
+    for dirpath, _, filenames in os.walk(os.path.expanduser(str(root_dir))):
+        for filename in filenames:
+            if filename.lower().endswith(CERT_EXTENSIONS):
+                found.append(os.path.join(dirpath, filename))
+    return sorted(found)
+
+
+def _parse_one(path: str) -> Dict:
+    """인증서 1건 파싱 (프로세스 풀 작업). 실패하면 error 항목"""
+    try:
+        return {'metadata': parse_certificate_without_password(path)}
+    except Exception as e:
+        return {'error': str(e)}
+
+
+def _refresh_expiry(metadata: Dict) -> Dict:
+    """캐시된 메타데이터의 만료 여부/남은 일수를 현재 시각 기준으로 다시 계산"""
+    valid_to = metadata.get('valid_to')
+    if not valid_to:
+        return metadata
+    try:
+        not_after = datetime.fromisoformat(valid_to)
+    except ValueError:
+        return metadata
+    if not_after.tzinfo is None:
+        not_after = not_after.replace(tzinfo=timezone.utc)
+    now = datetime.now(timezone.utc)
+    is_expired = now > not_after
+    return {**metadata, 'is_expired': is_expired, 'days_until_expiry': (not_after - now).days if not is_expired else 0}
+
+
+def _entry(path: str, parsed: Dict) -> Dict:
+    """결과 항목 (get-cert-validity.py와 같은 validFrom/validTo/isExpired 필드 포함)"""
+    if 'error' in parsed:
+        return {'path': path, 'error': parsed['error'], 'validFrom': None, 'validTo': None, 'isExpired': False}
+    metadata = _refresh_expiry(parsed['metadata'])
+    return {
+        'path': path,
+        'validFrom': metadata.get('valid_from'),
+        'validTo': metadata.get('valid_to'),
+        'isExpired': metadata.get('is_expired', False),
+        'metadata': metadata,
+    }
+
+
+def _load_cache(cache_path: Optional[Path]) -> Dict[str, Dict]:
+    if cache_path is None or not cache_path.exists():
+        return {}
+    try:
+        cache = json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != _CACHE_VERSION:
+        return {}
+    return cache.get('entries', {})
+
+
+def _save_cache(cache_path: Path, entries: Dict[str, Dict]) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_suffix(cache_path.suffix + '.tmp')
+    tmp.write_text(json.dumps({'version': _CACHE_VERSION, 'entries': entries}, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp, cache_path)
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def scan_certificates(
+    paths: Optional[Iterable[str]] = None,
+    root_dir: Optional[Union[str, Path]] = None,
+    cache_path: Optional[Union[str, Path]] = DEFAULT_SCAN_CACHE,
+    max_workers: Optional[int] = None
+) -> Dict:
+    """
+    인증서 메타데이터 일괄 조회
+
+    Args:
+        paths: 조회할 인증서 파일 경로 목록
+        root_dir: 이 디렉토리 아래의 인증서를 모두 조회 (paths와 함께 지정 가능)
+        cache_path: 결과 캐시 파일 (None이면 캐시하지 않음)
+        max_workers: 파싱 프로세스 수 (기본: CPU 수)
+
+    Returns:
+        {
+            'certificates': [{'path', 'validFrom', 'validTo', 'isExpired', 'metadata'} 또는 {'path', 'error', ...}],
+            'count': int, 'parsed': int, 'cached': int, 'elapsed': float
+        }
+    """
+    started = time.perf_counter()
+    targets = [os.path.abspath(os.path.expanduser(p)) for p in (paths or [])]
+    if root_dir is not None:
+        targets.extend(find_certificates(root_dir))
+    targets = list(dict.fromkeys(targets))
+
+    cache_path = Path(cache_path) if cache_path is not None else None
+    cached_entries = _load_cache(cache_path)
+
+    results: Dict[str, Dict] = {}
+    stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+    misses = []
+    for path in targets:
+        stamp = stamps[path] = _stamp(path)
+        cached = cached_entries.get(path)
+        if stamp is not None and cached is not None and tuple(cached['stamp']) == stamp:
+            results[path] = cached['result']
+        else:
+            misses.append(path)
+
+    if len(misses) >= _POOL_THRESHOLD and (max_workers is None or max_workers > 1):
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parsed = list(pool.map(_parse_one, misses, chunksize=max(1, len(misses) // 32)))
+    else:
+        parsed = [_parse_one(path) for path in misses]
+    results.update(zip(misses, parsed))
+
+    if cache_path is not None and misses:
+        # 없어진 파일은 캐시에서 제거, 파싱 실패(파일 없음 등)는 캐시하지 않음
+        entries = {p: e for p, e in cached_entries.items() if os.path.exists(p)}
+        for path, result in zip(misses, parsed):
+            if stamps[path] is not None and 'error' not in result:
+                entries[path] = {'stamp': list(stamps[path]), 'result': result}
+        _save_cache(cache_path, entries)
+
+    return {
+        'certificates': [_entry(path, results[path]) for path in targets],
+        'count': len(targets),
+        'parsed': len(misses),
+        'cached': len(targets) - len(misses),
+        'elapsed': round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='인증서 메타데이터 일괄 조회 (JSON 출력)')
+    parser.add_argument('paths', nargs='*', help='인증서 파일 경로')
+    parser.add_argument('--root', help='이 디렉토리 아래의 인증서를 모두 조회')
+    parser.add_argument('--cache', default=str(DEFAULT_SCAN_CACHE), help="캐시 파일 경로 ('none'이면 캐시하지 않음)")
+    parser.add_argument('--workers', type=int, default=None, help='파싱 프로세스 수')
+    args = parser.parse_args(argv)
+
+    if not args.paths and not args.root:
+        print(json.dumps({'error': '인증서 경로 또는 --root가 필요합니다'}, ensure_ascii=False))
+        raise SystemExit(1)
+
+    result = scan_certificates(
+        paths=args.paths,
+        root_dir=args.root,
+        cache_path=None if args.cache.lower() == 'none' else args.cache,
+        max_workers=args.workers
+    )
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
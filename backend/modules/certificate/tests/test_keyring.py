@@ -0,0 +1,105 @@
+import datetime
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.serialization import pkcs12
+from cryptography.x509.oid import NameOID
+
+from ..keyring import CertificateKeyring
+
+
+def _write_p12(path: Path, password: bytes) -> None:
+    """테스트용 자체 서명 P12 생성"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "keyring-test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(key.public_key())
+        .serial_number(x509.random_serial_number()).not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1)).sign(key, hashes.SHA256())
+    )
+    path.write_bytes(pkcs12.serialize_key_and_certificates(
+        b"test", key, cert, None, serialization.BestAvailableEncryption(password)
+    ))
+
+
+class TestCertificateKeyring(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.cert_path = str(Path(cls.tmp.name) / "signCert.p12")
+        _write_p12(Path(cls.cert_path), b"pw1234")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.keyring = CertificateKeyring(idle_timeout=60)
+
+    def tearDown(self):
+        self.keyring.clear()
+
+    def test_decrypts_once(self):
+        with self.keyring.p12(self.cert_path, "pw1234") as first, self.keyring.p12(self.cert_path, "pw1234") as second:
+            self.assertIs(first, second)
+            self.assertTrue(first.pkcs7_signed_msg(b"message"))
+        self.assertEqual((self.keyring.hits, self.keyring.misses), (1, 1))
+
+    def test_wrong_password_is_not_served_from_cache(self):
+        with self.keyring.p12(self.cert_path, "pw1234"):
+            pass
+        with self.assertRaises(ValueError):
+            with self.keyring.p12(self.cert_path, "wrong"):
+                pass
+
+    def test_idle_expiry_zeroizes(self):
+        """사용하지 않으면 백그라운드 정리에서 폐기"""
+        keyring = CertificateKeyring(idle_timeout=0.05)
+        with keyring.p12(self.cert_path, "pw1234") as sign:
+            pass
+        time.sleep(0.3)
+        self.assertIsNone(sign.prikey)
+        self.assertIsNone(sign.prikey_password)
+        self.assertEqual(len(keyring), 0)
+
+    def test_leased_handle_survives_expiry_and_replacement(self):
+        """대여 중인 객체는 만료/교체/evict되어도 반납할 때까지 폐기하지 않음"""
+        keyring = CertificateKeyring(idle_timeout=0.05)
+        with keyring.p12(self.cert_path, "pw1234") as sign:
+            time.sleep(0.3)
+            self.assertEqual(keyring.purge_expired(), 0)
+            stat = os.stat(self.cert_path)
+            os.utime(self.cert_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            with keyring.p12(self.cert_path, "pw1234") as replacement:
+                self.assertIsNot(replacement, sign)
+            keyring.evict(self.cert_path)
+            self.assertTrue(sign.pkcs7_signed_msg(b"message"))
+        self.assertIsNone(sign.prikey)
+        self.assertIsNone(replacement.prikey)
+        keyring.clear()
+
+    def test_replaced_file_is_reloaded(self):
+        with self.keyring.p12(self.cert_path, "pw1234") as sign:
+            pass
+        stat = os.stat(self.cert_path)
+        os.utime(self.cert_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        with self.keyring.p12(self.cert_path, "pw1234") as reloaded:
+            self.assertIsNot(reloaded, sign)
+        self.assertIsNone(sign.prikey)
+
+    def test_evict_and_clear(self):
+        with self.keyring.p12(self.cert_path, "pw1234") as sign:
+            pass
+        self.assertTrue(self.keyring.evict(self.cert_path))
+        self.assertFalse(self.keyring.evict(self.cert_path))
+        self.assertIsNone(sign.prikey)
+
+if __name__ == "__main__":
+    unittest.main()
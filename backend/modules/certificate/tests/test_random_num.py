@@ -0,0 +1,110 @@
+import base64
+import hashlib
+import importlib
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from cryptography.hazmat.primitives import padding, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.serialization import pkcs12
+from pypinksign.pypinksign import inject_rand_in_plain_prikey
+
+from ..keyring import CertificateKeyring
+from ..parsing.random_num import _oid, extract_random_num_p12, private_key_infos
+from .test_keyring import _write_p12
+
+RAND = bytes(range(1, 21))
+
+
+def _tlv(tag: int, content: bytes) -> bytes:
+    length = len(content)
+    if length < 0x80:
+        return bytes([tag, length]) + content
+    size = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+    return bytes([tag, 0x80 | len(size)]) + size + content
+
+
+def _seq(*items: bytes) -> bytes:
+    return _tlv(0x30, b''.join(items))
+
+
+def _oid_tlv(dotted: str) -> bytes:
+    return _tlv(0x06, _oid(dotted))
+
+
+def _pbes2_aes(plain: bytes, password: str) -> bytes:
+    """PBES2(PBKDF2-HMAC-SHA256, AES-256-CBC) EncryptedPrivateKeyInfo"""
+    salt, iv, iterations = os.urandom(8), os.urandom(16), 2048
+    key = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations, 32)
+    padder = padding.PKCS7(128).padder()
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).encryptor()
+    ciphertext = encryptor.update(padder.update(plain) + padder.finalize()) + encryptor.finalize()
+    algorithm = _seq(
+        _oid_tlv('1.2.840.113549.1.5.13'),
+        _seq(
+            _seq(_oid_tlv('1.2.840.113549.1.5.12'),
+                 _seq(_tlv(0x04, salt), _tlv(0x02, iterations.to_bytes(2, 'big')),
+                      _seq(_oid_tlv('1.2.840.113549.2.9'), b'\x05\x00'))),
+            _seq(_oid_tlv('2.16.840.1.101.3.4.1.42'), _tlv(0x04, iv)),
+        ),
+    )
+    return _seq(algorithm, _tlv(0x04, ciphertext))
+
+
+def _npki_p12(password: str) -> bytes:
+    """개인키 속성에 randomNum이 있는 P12 (국내 공동인증서 내보내기 형태)"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pkcs8 = key.private_bytes(serialization.Encoding.DER, serialization.PrivateFormat.PKCS8,
+                              serialization.NoEncryption())
+    private_key_info = base64.b64decode(inject_rand_in_plain_prikey(base64.b64encode(pkcs8).decode(), RAND))
+    bag = _seq(_oid_tlv('1.2.840.113549.1.12.10.1.2'), _tlv(0xa0, _pbes2_aes(private_key_info, password)))
+    safe_contents = _seq(bag)
+    auth_safe = _seq(_seq(_oid_tlv('1.2.840.113549.1.7.1'), _tlv(0xa0, _tlv(0x04, safe_contents))))
+    return _seq(_tlv(0x02, b'\x03'), _seq(_oid_tlv('1.2.840.113549.1.7.1'), _tlv(0xa0, _tlv(0x04, auth_safe))))
+
+
+class TestRandomNum(unittest.TestCase):
+    def test_extracts_from_shrouded_key_attributes(self):
+        self.assertEqual(extract_random_num_p12(_npki_p12("pw1234"), "pw1234"), RAND)
+
+    def test_wrong_password(self):
+        with self.assertRaises(ValueError):
+            extract_random_num_p12(_npki_p12("pw1234"), "wrong")
+
+    def test_decrypts_pkcs12_3des_key_bag(self):
+        """PKCS#12 PBE(SHA1+3DES) 키 유도/복호화가 원래 개인키를 돌려주는지 확인"""
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        encryption = (serialization.PrivateFormat.PKCS12.encryption_builder()
+                      .key_cert_algorithm(pkcs12.PBES.PBESv1SHA1And3KeyTripleDESCBC).build(b"pw1234"))
+        p12 = pkcs12.serialize_key_and_certificates(b"t", key, None, None, encryption)
+
+        infos = list(private_key_infos(p12, "pw1234"))
+        self.assertEqual(len(infos), 1)
+        loaded = serialization.load_der_private_key(infos[0][0], None)
+        self.assertEqual(loaded.private_numbers(), key.private_numbers())
+        with self.assertRaises(ValueError):
+            extract_random_num_p12(p12, "pw1234")
+
+    def test_login_reads_p12_without_subprocess(self):
+        # certificate와 같은 부모 패키지의 hometax (modules.hometax 또는 최상위 hometax)
+        parent = __package__.rsplit('.', 2)[0] + '.' if __package__.count('.') >= 2 else ''
+        extract_random_enc_p12 = importlib.import_module(parent + 'hometax.auth.login').extract_random_enc_p12
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "signCert.p12"
+            path.write_bytes(_npki_p12("pw1234"))
+            self.assertEqual(extract_random_enc_p12(str(path), "pw1234"), base64.b64encode(RAND).decode())
+
+    def test_keyring_loads_p12_without_rand_num(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "plain.p12"
+            _write_p12(path, b"pw1234")
+            with CertificateKeyring().p12(str(path), "pw1234") as sign:
+                self.assertIsNone(getattr(sign, '_rand_num', None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import datetime
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from ..scanner import find_certificates, scan_certificates
+
+
+def _write_der(path: Path, name: str, days: int) -> None:
+    key = ec.generate_private_key(ec.SECP256R1())
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, name)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder().subject_name(subject).issuer_name(subject).public_key(key.public_key())
+        .serial_number(x509.random_serial_number()).not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=days)).sign(key, hashes.SHA256())
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(cert.public_bytes(serialization.Encoding.DER))
+
+
+class TestScanCertificates(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name) / "NPKI"
+        self.cache = Path(self.tmp.name) / "cache.json"
+        for i in range(9):
+            _write_der(self.root / f"cn{i}" / "signCert.der", f"사용자{i}", days=30 + i)
+        (self.root / "cn0" / "signPri.key").write_bytes(b"not a certificate")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_root_in_parallel_then_from_cache(self):
+        self.assertEqual(len(find_certificates(self.root)), 9)
+
+        first = scan_certificates(root_dir=self.root, cache_path=self.cache, max_workers=2)
+        self.assertEqual((first["count"], first["parsed"], first["cached"]), (9, 9, 0))
+        self.assertEqual([c["metadata"]["subject_name"] for c in first["certificates"]], [f"사용자{i}" for i in range(9)])
+        self.assertFalse(any(c["isExpired"] for c in first["certificates"]))
+
+        second = scan_certificates(root_dir=self.root, cache_path=self.cache)
+        self.assertEqual((second["parsed"], second["cached"]), (0, 9))
+        self.assertEqual(second["certificates"], first["certificates"])
+
+    def test_changed_file_is_reparsed(self):
+        scan_certificates(root_dir=self.root, cache_path=self.cache)
+        changed = self.root / "cn3" / "signCert.der"
+        _write_der(changed, "교체된 인증서", days=5)
+        stat = os.stat(changed)
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        result = scan_certificates(root_dir=self.root, cache_path=self.cache)
+        self.assertEqual((result["parsed"], result["cached"]), (1, 8))
+        self.assertEqual(result["certificates"][3]["metadata"]["subject_name"], "교체된 인증서")
+
+    def test_missing_path_reports_error(self):
+        result = scan_certificates(paths=[str(self.root / "missing.der")], cache_path=None)
+        self.assertIn("error", result["certificates"][0])
+        self.assertIsNone(result["certificates"][0]["validTo"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+"""
+인증서 유효기간 조회 (비밀번호 불필요)
+인증서 파일 하나의 유효기간/만료 여부를 JSON 한 줄로 출력합니다.
+server.js가 backend/scripts/get-cert-validity.py를 통해 호출합니다.
+
+CLI:
+    python -m certificate.validity <cert_path>
+    pickup-cert-validity <cert_path>   (pip install -e backend 후)
+"""
+
+import json
+import sys
+import traceback
+from typing import Dict, List, Optional
+
+
+def _error(message: str) -> Dict:
+    return {
+        'error': message,
+        'traceback': traceback.format_exc(),
+        'validFrom': None,
+        'validTo': None,
+        'isExpired': False
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        from .parsing.without_password import parse_certificate_without_password
+    except Exception as e:
+        print(json.dumps(_error(f'모듈 로드 실패: {str(e)}')))
+        return
+
+    if not argv:
+        print(json.dumps({'error': '인증서 경로가 필요합니다'}))
+        sys.exit(1)
+
+    try:
+        metadata = parse_certificate_without_password(argv[0])
+        result = {
+            'validFrom': metadata.get('valid_from'),
+            'validTo': metadata.get('valid_to'),
+            'isExpired': metadata.get('is_expired', False)
+        }
+        print(json.dumps(result, ensure_ascii=False))
+    except Exception as e:
+        print(json.dumps(_error(str(e))))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,17 @@
-from .reports import HometaxTaxReportCollector
-from .auth import *
-from .clients import *
+"""
+홈택스 모듈
+
+수집기는 처음 사용할 때 import합니다 (PEP 562). hometax.logger, hometax.auth.login처럼
+하위 모듈 하나만 쓰는 스크립트가 수집기 전체(requests/httpx/sqlite3 등)를 함께 불러오지 않습니다.
+"""
+
+__all__ = ['HometaxTaxReportCollector', 'AsyncHometaxTaxReportCollector']
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import reports
+        value = getattr(reports, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,9 +9,30 @@ ref의 HometaxScrapper 로직을 기반으로 구현되었습니다:
 """
 
 import requests
-from typing import Dict, Optional
+from typing import ContextManager, Dict, Optional
 from pypinksign import PinkSign
 
+# 통합 스크립트가 파일 경로로 직접 로드하는 경우(패키지 밖)에는 modules 경로를 추가하여 import
+try:
+    from ..logger import get_logger
+    from ..transport import create_session
+    from .session import fetch_additional_cookies
+except ImportError:
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from hometax.logger import get_logger
+    from hometax.transport import create_session
+    from hometax.auth.session import fetch_additional_cookies
+try:
+    from certificate.keyring import certificate_keyring
+    from certificate.parsing.random_num import extract_random_num_p12
+except ImportError:
+    from ...certificate.keyring import certificate_keyring
+    from ...certificate.parsing.random_num import extract_random_num_p12
+
+log = get_logger('hometax.auth.login')
+
 
 def login_with_certificate(
     cert_path: str,
@@ -24,7 +45,7 @@ def login_with_certificate(
     
     DER와 P12/PFX 형식에 따라 다른 방식으로 처리됩니다:
     - DER+KEY: PinkSign 객체에서 직접 randomEnc 추출
-    - P12/PFX: 파일 경로와 비밀번호를 사용하여 randomEnc 추출 (OpenSSL fallback 포함)
+    - P12/PFX: 키링이 P12 키 백에서 읽어 둔 randomNum 사용 (없으면 파일을 직접 파싱)
     
     Args:
         cert_path: 인증서 파일 경로
@@ -49,7 +70,7 @@ def login_with_certificate(
     
     # 1. 인증서 로드 (형식에 따라 다른 방식)
     if is_p12_format:
-        sign = load_p12_certificate(cert_path, password)
+        lease = load_p12_certificate(cert_path, password)
     elif is_der_format:
         if not key_path:
             import os
@@ -59,32 +80,34 @@ def login_with_certificate(
                 key_path = potential_key_path
             else:
                 raise ValueError(f"DER 형식 인증서는 .key 파일이 필요합니다: {cert_path}")
-        sign = load_der_key_certificate(cert_path, key_path, password)
-    else:
-        raise ValueError(f"지원하지 않는 인증서 형식: {cert_path}")
-    
-    # 2. 공개 인증서 추출
-    cert_pem = get_cert_pem(sign)
-    
-    # 3. randomEnc 추출 (형식에 따라 다른 방식)
-    if is_p12_format:
-        # P12/PFX: 파일 경로와 비밀번호 필요 (OpenSSL fallback 포함)
-        random_enc = extract_random_enc_p12(cert_path, password, sign)
-    elif is_der_format:
-        # DER+KEY: PinkSign 객체에서 직접 추출 (파일 경로 불필요)
-        random_enc = extract_random_enc_der_key(sign)
+        lease = load_der_key_certificate(cert_path, key_path, password)
     else:
         raise ValueError(f"지원하지 않는 인증서 형식: {cert_path}")
     
-    # 4. 세션 생성
-    session = requests.Session()
-    
-    # 5. 챌린지 요청
-    pkc_enc_ssn = request_challenge(session)
-    
-    # 6. logSgnt 생성 (ref 로직 방식: serialNum과 timestamp 포함)
-    log_sgnt = generate_logsgnt(sign, pkc_enc_ssn)
-    
+    # 2~6. 서명이 끝날 때까지 키링에서 인증서를 빌려 씀
+    with lease as sign:
+        # 2. 공개 인증서 추출
+        cert_pem = get_cert_pem(sign)
+        
+        # 3. randomEnc 추출 (형식에 따라 다른 방식)
+        if is_p12_format:
+            # P12/PFX: 키링이 붙여 둔 randomNum, 없으면 파일을 직접 파싱 (서브프로세스 없음)
+            random_enc = extract_random_enc_p12(cert_path, password, sign)
+        elif is_der_format:
+            # DER+KEY: PinkSign 객체에서 직접 추출 (파일 경로 불필요)
+            random_enc = extract_random_enc_der_key(sign)
+        else:
+            raise ValueError(f"지원하지 않는 인증서 형식: {cert_path}")
+        
+        # 4. 세션 생성 (공용 연결 풀 사용, 챌린지/pubcLogin.do/SSO/permission.do 호출 시간 계측)
+        session = create_session()
+        
+        # 5. 챌린지 요청
+        pkc_enc_ssn = request_challenge(session)
+        
+        # 6. logSgnt 생성 (ref 로직 방식: serialNum과 timestamp 포함)
+        log_sgnt = generate_logsgnt(sign, pkc_enc_ssn)
+        
     # 7. pubcLogin.do 호출
     result = call_pubclogin(session, log_sgnt, cert_pem, random_enc)
     
@@ -99,50 +122,18 @@ def login_with_certificate(
     
     if fetch_user_info:
         try:
-            import sys
-            import os
-            from pathlib import Path
-            
-            # 현재 파일의 디렉토리를 sys.path에 추가
-            current_dir = Path(__file__).parent
-            if str(current_dir) not in sys.path:
-                sys.path.insert(0, str(current_dir))
-            
-            # 모듈 import 시도
-            try:
-                from ..session import fetch_additional_cookies
-            except ImportError:
-                # 파일명으로 직접 import 시도
-                import importlib.util
-                module_path = current_dir / 'session.py'
-                if module_path.exists():
-                    spec = importlib.util.spec_from_file_location("fetch_additional_cookies", module_path)
-                    fetch_additional_cookies_module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(fetch_additional_cookies_module)
-                    fetch_additional_cookies = fetch_additional_cookies_module.fetch_additional_cookies
-                else:
-                    raise ImportError(f"모듈 파일을 찾을 수 없습니다: {module_path}")
-            
-            print("7단계: 사용자 정보 획득 (permission.do)")
+            log.info('7단계: 사용자 정보 획득 (permission.do)')
             user_info = fetch_additional_cookies(result['session'])
             if user_info['success']:
                 pubc_user_no = user_info.get('pubcUserNo', '')
                 tin = user_info.get('tin', '')
                 char_id = user_info.get('charId', '')
                 user_type = user_info.get('userType', '')
-                print("✅ 사용자 정보 획득 완료")
-                if pubc_user_no:
-                    print(f"   pubcUserNo: {pubc_user_no[:10]}...")
-                if tin:
-                    print(f"   tin: {tin[:10]}...")
+                log.info('사용자 정보 획득 완료', pubcUserNo=bool(pubc_user_no), tin=bool(tin))
             else:
-                print("⚠️  사용자 정보 획득 실패 (계속 진행)")
-                # 디버깅: 실패 원인 로깅
-                print(f"   실패 원인: {user_info.get('error', 'Unknown')}")
+                log.warning('사용자 정보 획득 실패 (계속 진행)', error=user_info.get('error', 'Unknown'))
         except Exception as e:
-            print(f"⚠️  사용자 정보 획득 중 오류 (계속 진행): {e}")
-            import traceback
-            print(f"   상세 오류: {traceback.format_exc()}")
+            log.warning('사용자 정보 획득 중 오류 (계속 진행)', error=e, exc_info=True)
     
     return {
         'success': True,
@@ -155,45 +146,14 @@ def login_with_certificate(
     }
 
 
-def load_p12_certificate(cert_path: str, password: str) -> PinkSign:
-    """P12/PFX 형식 인증서 로드"""
-    import os
-    if not os.path.exists(cert_path):
-        raise FileNotFoundError(f"인증서 파일을 찾을 수 없습니다: {cert_path}")
-    
-    with open(cert_path, 'rb') as f:
-        p12_data = f.read()
-    
-    sign = PinkSign(
-        p12_data=p12_data,
-        prikey_password=password.encode('utf-8')
-    )
-    
-    return sign
+def load_p12_certificate(cert_path: str, password: str) -> ContextManager[PinkSign]:
+    """P12/PFX 형식 인증서 대여 (with 블록 동안 사용, 키링: 같은 인증서는 한 번만 복호화)"""
+    return certificate_keyring().p12(cert_path, password)
 
 
-def load_der_key_certificate(der_path: str, key_path: str, password: str) -> PinkSign:
-    """DER+KEY 형식 인증서 로드"""
-    import os
-    if not os.path.exists(der_path):
-        raise FileNotFoundError(f"DER 파일을 찾을 수 없습니다: {der_path}")
-    if not os.path.exists(key_path):
-        raise FileNotFoundError(f"KEY 파일을 찾을 수 없습니다: {key_path}")
-    
-    with open(der_path, 'rb') as f:
-        der_data = f.read()
-    
-    sign = PinkSign(pubkey_data=der_data)
-    
-    with open(key_path, 'rb') as f:
-        key_data = f.read()
-    
-    sign.load_prikey(
-        prikey_data=key_data,
-        prikey_password=password.encode('utf-8')
-    )
-    
-    return sign
+def load_der_key_certificate(der_path: str, key_path: str, password: str) -> ContextManager[PinkSign]:
+    """DER+KEY 형식 인증서 대여 (with 블록 동안 사용, 키링: 같은 인증서는 한 번만 복호화)"""
+    return certificate_keyring().der_key(der_path, key_path, password)
 
 
 def get_cert_pem(sign: PinkSign) -> str:
@@ -212,8 +172,8 @@ def extract_random_enc_p12(p12_path: str, password: str, sign: Optional[PinkSign
     """
     P12/PFX 형식에서 randomEnc 추출
     
-    방법 1: PinkSign 객체의 _rand_num 속성 사용 (우선)
-    방법 2: OpenSSL subprocess 사용 (fallback)
+    방법 1: PinkSign 객체의 _rand_num 속성 사용 (키링으로 로드했다면 항상 있음)
+    방법 2: P12 파일의 키 백을 직접 복호화하여 randomNum 속성 읽기 (프로세스 내, 서브프로세스 없음)
     
     Args:
         p12_path: P12/PFX 파일 경로
@@ -222,54 +182,24 @@ def extract_random_enc_p12(p12_path: str, password: str, sign: Optional[PinkSign
         
     Returns:
         Base64 인코딩된 randomEnc 문자열
+        
+    Raises:
+        Exception: 랜덤 번호를 찾을 수 없음
     """
-    import subprocess
-    import re
     import base64
     
-    ID_KISA_NPKI_RAND_NUM = '1.2.410.200004.10.1.1.3'
-    
     # 방법 1: PinkSign 객체의 _rand_num 속성 사용 (우선 시도)
-    if sign is not None:
-        try:
-            if hasattr(sign, '_rand_num') and sign._rand_num is not None:
-                random_enc = base64.b64encode(
-                    sign._rand_num.asOctets()
-                ).decode('utf-8')
-                return random_enc
-        except Exception:
-            pass  # 실패 시 OpenSSL 방법으로 전환
-    
-    # 방법 2: OpenSSL subprocess 사용 (fallback)
-    cmd = [
-        'openssl', 'pkcs12', '-info',
-        '-in', p12_path,
-        '-nodes', '-nocerts',
-        '-passin', f'pass:{password}'
-    ]
-    
-    result = subprocess.run(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        timeout=10
-    )
-    
-    if result.returncode != 0:
-        raise Exception(f"OpenSSL 실행 실패: {result.stdout[:200]}")
+    if sign is not None and getattr(sign, '_rand_num', None) is not None:
+        return base64.b64encode(sign._rand_num.asOctets()).decode('utf-8')
     
-    # OID 패턴 찾기
-    pattern = rf'{re.escape(ID_KISA_NPKI_RAND_NUM)}\s*:?\s*([0-9a-fA-F\s:]+)'
-    match = re.search(pattern, result.stdout, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-    
-    if match:
-        hex_string = re.sub(r'[\s:]', '', match.group(1))
-        rand_num_bytes = bytes.fromhex(hex_string)
-        random_enc = base64.b64encode(rand_num_bytes).decode('utf-8')
-        return random_enc
-    
-    raise Exception("랜덤 번호를 찾을 수 없습니다")
+    # 방법 2: PKCS#12 직접 파싱
+    with open(p12_path, 'rb') as f:
+        p12_data = f.read()
+    try:
+        rand_num_bytes = extract_random_num_p12(p12_data, password)
+    except ValueError as e:
+        raise Exception(f"랜덤 번호를 찾을 수 없습니다: {e}")
+    return base64.b64encode(rand_num_bytes).decode('utf-8')
 
 
 def extract_random_enc_der_key(sign: PinkSign) -> str:
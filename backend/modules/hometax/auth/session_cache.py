@@ -0,0 +1,246 @@
+"""
+9. 로그인 세션 캐시
+인증서 시리얼 번호를 키로 로그인된 세션(쿠키, pubcUserNo, txaaAdmNo)을 암호화하여 저장하고,
+permission.do 한 번으로 세션이 살아있는지 확인하여 재로그인을 건너뜁니다.
+
+시리얼은 비밀번호 없이도 읽을 수 있으므로, 캐시 항목에는 로그인에 쓴 비밀번호의 HMAC을 함께 보관하고
+같은 비밀번호로 요청할 때만 세션을 돌려줍니다.
+AXCEL_ENCRYPTION_KEY(또는 encryption_key)가 없으면 세션을 저장하지 않습니다.
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+import hmac
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from cryptography.fernet import Fernet, InvalidToken
+
+from ..logger import get_logger
+from ..metrics import instrument_session
+from ..transport import create_session
+
+log = get_logger('hometax.auth.session_cache')
+
+
+# 세션 캐시 기본 위치 (비밀번호 저장소와 같은 data 폴더)
+DEFAULT_CACHE_DIR = Path('data') / 'hometax-sessions'
+
+# 마지막 확인 이후 이 시간이 지나면 probe 없이 만료로 간주
+DEFAULT_TTL_SECONDS = 30 * 60
+
+PROBE_URL = 'https://teht.hometax.go.kr/permission.do'
+PROBE_SCREEN_ID = 'UTEABHAA03'
+
+# 캐시에 함께 보관하는 세션 정보 필드
+SESSION_INFO_FIELDS = ('pubcUserNo', 'txaaAdmNo', 'tin', 'charId', 'userType')
+
+
+def get_certificate_serial(cert_path: str, password: Optional[str] = None) -> str:
+    """
+    캐시 키로 사용할 인증서 시리얼 번호 추출
+
+    DER는 공개 인증서에서 바로 읽고, P12/PFX는 cryptography로 파싱합니다.
+    시리얼을 읽을 수 없으면 파일 내용의 해시를 대신 사용합니다.
+    """
+    from cryptography import x509
+    from cryptography.hazmat.primitives.serialization import pkcs12
+
+    with open(cert_path, 'rb') as f:
+        data = f.read()
+
+    cert_path_lower = cert_path.lower()
+    try:
+        if cert_path_lower.endswith('.der'):
+            return format(x509.load_der_x509_certificate(data).serial_number, 'x')
+        if cert_path_lower.endswith('.p12') or cert_path_lower.endswith('.pfx'):
+            pw = password.encode('utf-8') if password else None
+            _, cert, _ = pkcs12.load_key_and_certificates(data, pw)
+            if cert is not None:
+                return format(cert.serial_number, 'x')
+    except Exception:
+        pass
+
+    return 'sha256-' + hashlib.sha256(data).hexdigest()
+
+
+def probe_session(session: requests.Session, timeout: int = 10) -> bool:
+    """
+    teht permission.do 한 번으로 세션이 살아있는지 확인
+
+    로그인 오류(errorMsg/code == 'login')가 없으면 살아있는 세션으로 판단합니다.
+    """
+    try:
+        response = session.post(
+            PROBE_URL,
+            data='<map id="postParam"><popupYn>false</popupYn></map>'.encode('utf-8'),
+            params={'screenId': PROBE_SCREEN_ID},
+            headers={'Content-Type': 'application/xml; charset=UTF-8'},
+            timeout=timeout
+        )
+    except requests.exceptions.RequestException:
+        return False
+
+    if response.status_code != 200:
+        return False
+
+    text = response.text
+    if '<errorMsg>login</errorMsg>' in text:
+        return False
+
+    if text.strip().startswith('{'):
+        try:
+            result_msg = response.json().get('resultMsg', {})
+            if isinstance(result_msg, dict) and (result_msg.get('errorMsg') == 'login' or result_msg.get('code') == 'login'):
+                return False
+        except ValueError:
+            return False
+
+    return True
+
+
+class HometaxSessionCache:
+    """
+    인증서별 홈택스 로그인 세션 캐시
+
+    세션 정보는 AXCEL_ENCRYPTION_KEY에서 유도한 키로 Fernet 암호화되어 저장되며,
+    파일명은 시리얼 번호의 해시라서 평문 정보가 디스크에 남지 않습니다.
+    암호화 키가 설정되지 않으면 enabled가 False가 되고 save/load는 아무것도 하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        encryption_key: Optional[str] = None,
+        probe=probe_session
+    ):
+        self.cache_dir = Path(cache_dir or os.environ.get('HOMETAX_SESSION_CACHE_DIR') or DEFAULT_CACHE_DIR)
+        self.ttl_seconds = ttl_seconds
+        self.probe = probe
+
+        # 비밀번호 저장소(storage.ts)와 같은 환경 변수를 사용 (기본 키로 암호화하지 않음)
+        secret = encryption_key or os.environ.get('AXCEL_ENCRYPTION_KEY')
+        self._fernet: Optional[Fernet] = None
+        self._mac_key = b''
+        if not secret:
+            log.warning('AXCEL_ENCRYPTION_KEY가 설정되지 않아 세션 캐시를 사용하지 않습니다')
+            return
+        fernet_key = base64.urlsafe_b64encode(hashlib.sha256(secret.encode('utf-8')).digest())
+        self._fernet = Fernet(fernet_key)
+        self._mac_key = hashlib.sha256(b'hometax-session-password:' + secret.encode('utf-8')).digest()
+
+    @property
+    def enabled(self) -> bool:
+        return self._fernet is not None
+
+    def _password_mac(self, serial: str, password: str) -> str:
+        message = serial.encode('utf-8') + b'\x00' + password.encode('utf-8')
+        return hmac.new(self._mac_key, message, hashlib.sha256).hexdigest()
+
+    def _entry_path(self, serial: str) -> Path:
+        name = hashlib.sha256(serial.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{name}.session"
+
+    def save(self, serial: str, session: requests.Session, info: Dict, password: str) -> None:
+        """로그인된 세션과 세션 정보를 암호화하여 저장 (password: 로그인에 성공한 인증서 비밀번호)"""
+        if not self.enabled:
+            return
+        self._write(serial, session, info, self._password_mac(serial, password))
+
+    def _write(self, serial: str, session: requests.Session, info: Dict, password_mac: str) -> None:
+        entry = {
+            'cookies': [
+                {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path or '/'}
+                for c in session.cookies
+            ],
+            'info': {field: info.get(field) or '' for field in SESSION_INFO_FIELDS},
+            'password_mac': password_mac,
+            'verified_at': time.time(),
+        }
+        token = self._fernet.encrypt(json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(serial)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(token)
+        os.replace(tmp_path, path)
+        try:
+            os.chmod(path, 0o600)
+        except OSError:
+            pass
+
+    def _read(self, serial: str) -> Optional[Dict]:
+        if not self.enabled:
+            return None
+        path = self._entry_path(serial)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return json.loads(self._fernet.decrypt(f.read()).decode('utf-8'))
+        except (InvalidToken, ValueError, OSError):
+            # 키가 바뀌었거나 손상된 캐시는 폐기
+            self.invalidate(serial)
+            return None
+
+    def load(self, serial: str, password: str, session: Optional[requests.Session] = None) -> Optional[Dict]:
+        """
+        캐시된 세션 복원
+
+        저장할 때와 다른 비밀번호이면 캐시를 그대로 두고 None을 반환합니다 (호출자는 로그인으로 검증).
+        TTL이 지났거나 probe에서 로그인 오류가 나면 캐시를 지우고 None을 반환합니다.
+
+        Returns:
+            {
+                'session': requests.Session,
+                'cookies': Dict[str, str],
+                'pubcUserNo': str,
+                'txaaAdmNo': str,
+                ...
+            }
+        """
+        entry = self._read(serial)
+        if entry is None:
+            return None
+
+        password_mac = entry.get('password_mac')
+        if not password_mac:
+            # 비밀번호 확인값이 없는 이전 형식의 캐시는 폐기
+            self.invalidate(serial)
+            return None
+        if not hmac.compare_digest(password_mac, self._password_mac(serial, password)):
+            return None
+
+        if time.time() - entry.get('verified_at', 0) > self.ttl_seconds:
+            self.invalidate(serial)
+            return None
+
+        session = instrument_session(session) if session is not None else create_session()
+        for cookie in entry.get('cookies', []):
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie['domain'], path=cookie['path'])
+
+        if self.probe is not None and not self.probe(session):
+            self.invalidate(serial)
+            return None
+
+        # 확인에 성공했으므로 TTL 연장 (probe로 갱신된 쿠키 포함)
+        info = entry.get('info', {})
+        self._write(serial, session, info, password_mac)
+
+        return {
+            **info,
+            'session': session,
+            'cookies': {c.name: c.value for c in session.cookies},
+        }
+
+    def invalidate(self, serial: str) -> None:
+        try:
+            self._entry_path(serial).unlink()
+        except FileNotFoundError:
+            pass
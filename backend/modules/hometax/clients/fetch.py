@@ -4,17 +4,49 @@
 """
 
 import requests
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
 from datetime import datetime
-import random
+import threading
 import json
-import sys
+import time
+import logging
+
+from functools import lru_cache
+from urllib.parse import urlencode
+
+from ..logger import get_logger, LazyCookies, LazyJson
+from ..rate_control import AimdRateController, get_rate_controller, is_overload_response
+from .registry import client_key
+from ..request_template import RequestTemplate, make_nts
+from ..json_codec import response_json
+
+log = get_logger(__name__)
+
+# 수임 상태 코드 → _engagementStatus 값 (조회 순서가 곧 중복 제거 시 우선순위)
+ENGAGEMENT_STATUSES = {"1": "수임중", "2": "해지중", "3": "미동의"}
+
+# txaaAdmNo별로 서버가 받아주는 조회 방식 캐시 ("all": engagement_code="" 전체 조회, "split": 상태별 조회)
+DEFAULT_MODE_CACHE = Path('data') / 'hometax-client-modes.json'
+MODE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# 수임거래처 목록 페이지 크기
+CLIENT_PAGE_SIZE = 200
+_mode_cache_lock = threading.Lock()
+
+
+class ClientListRejected(Exception):
+    """서버가 목록 조회 요청 자체를 거부함 (resultMsg.result != 'S', 로그인 오류 제외)"""
 
 
 def fetch_hometax_clients(
     session: requests.Session,
     hometax_admin_code: Optional[str] = None,
-    engagement_code: str = "1"
+    engagement_code: str = "1",
+    max_in_flight: int = 4,
+    rate_controller: Optional[AimdRateController] = None,
+    pubc_user_no: str = ''
 ) -> List[Dict]:
     """
     홈택스 수임거래처 조회
@@ -25,110 +57,35 @@ def fetch_hometax_clients(
         session: 로그인된 requests.Session 객체
         hometax_admin_code: 홈택스 관리자 번호 (선택)
         engagement_code: 수임 상태 코드 ("1": 수임중, "2": 해지, "3": 대기)
+        max_in_flight: 첫 페이지의 totalCount로 나머지 페이지를 동시에 조회할 때 최대 동시 요청 수
+        rate_controller: 속도 제어기 (기본: get_rate_controller(pubc_user_no), 신고현황 수집기와 같은 제어기)
+        pubc_user_no: 로그인 사용자 번호 (pubcUserNo, 기본 속도 제어기의 키)
         
     Returns:
         수임거래처 목록 (Dict 리스트)
         
     Raises:
-        Exception: 조회 실패
+        ClientListRejected: 서버가 조회 조건을 거부함
+        Exception: 그 밖의 조회 실패 (세션, HTTP, 과부하 등)
     """
-    # ref의 hometaxActionCall 로직
-    # ref에서는 realScreenId가 빈 문자열이지만 null로 처리됨
-    query = {
-        'actionId': 'ATEABHAA001R10',
-        'screenId': 'UTEABHAA03',
-        'popupYn': 'false',
-        'realScreenId': '',  # 빈 문자열은 유지
-    }
-    
-    body = {
-        'afdsCl': engagement_code,
-        'txaaAdmNo': hometax_admin_code or '',
-        'pageInfoVO': {
-            'pageNum': '1',
-            'pageSize': '200',
-            'totalCount': ''
-        }
-    }
-    
-    # 🔍 디버깅: txaaAdmNo 확인
-    print(f"[DEBUG] fetch_hometax_clients - txaaAdmNo: '{hometax_admin_code or ''}' (길이: {len(hometax_admin_code or '')})", file=sys.stderr)
-    print(f"[DEBUG] fetch_hometax_clients - body.txaaAdmNo: '{body['txaaAdmNo']}' (길이: {len(body['txaaAdmNo'])})", file=sys.stderr)
-    
-    # 쿠키 확인 (디버깅)
-    cookies_before = {cookie.name: cookie.value for cookie in session.cookies}
-    if 'TXPPsessionID' not in cookies_before:
+    # 쿠키 확인
+    if 'TXPPsessionID' not in session.cookies:
         raise Exception("TXPPsessionID 쿠키가 없습니다. SSO 로그인이 필요합니다.")
     
-    # NTS 생성 (ref 로직: randomSecond()와 동일)
-    # ref: Math.floor(Math.random() * (60 - 30) + 30) -> 30~59 사이의 정수
-    sec = random.randrange(30, 60)
-    nts = f"{sec}lpNhzq7ZwSaVt9TU2s8mHzIzLjmDpVKVgvmLBNswI{sec - 11}"
+    rate_controller = rate_controller or get_rate_controller(pubc_user_no or None)
     
-    # 요청 URL (ref 로직: null 값 제외, URLSearchParams 사용)
-    filtered_params = {k: v for k, v in query.items() if v is not None}
-    from urllib.parse import urlencode
-    query_string = urlencode(filtered_params)
-    url = f"https://teht.hometax.go.kr/wqAction.do?{query_string}" if query_string else "https://teht.hometax.go.kr/wqAction.do"
+    # 요청 템플릿 (수임 상태/관리자 번호별로 한 번만 구성, 페이지 번호와 NTS만 채움)
+    template = _client_list_template(engagement_code, hometax_admin_code or '')
     
-    # 요청 본문 (JSON + NTS) - ref 로직과 동일
-    json_body = json.dumps(body, ensure_ascii=False)
-    post_data = f"{json_body}{nts}"
+    log.debug('수임거래처 조회 요청', url=template.url, txaaAdmNo=hometax_admin_code or '', afdsCl=engagement_code,
+              cookies=LazyCookies(session.cookies))
     
-    # ref 로직: headers는 Content-Type만 사용
-    headers = {
-        'Content-Type': 'application/json; charset=UTF-8',
-    }
+    response = _post_page(session, template, 1, rate_controller)
     
-    # 🔍 상세 로깅 추가
-    print("=" * 80, file=sys.stderr)
-    print("[DEBUG] API 호출 상세 정보", file=sys.stderr)
-    print("=" * 80, file=sys.stderr)
-    print(f"URL: {url}", file=sys.stderr)
-    print(f"쿠키 개수: {len(session.cookies)}", file=sys.stderr)
-    print(f"쿠키 목록: {[c.name for c in session.cookies]}", file=sys.stderr)
-    for cookie in session.cookies:
-        print(f"  {cookie.name}:", file=sys.stderr)
-        print(f"    도메인: {cookie.domain}", file=sys.stderr)
-        print(f"    경로: {cookie.path}", file=sys.stderr)
-        print(f"    값 길이: {len(cookie.value)}", file=sys.stderr)
-        if cookie.name in ['TXPPsessionID', 'TEHTsessionID']:
-            print(f"    값 (처음 50자): {cookie.value[:50]}...", file=sys.stderr)
-    print(f"요청 본문 길이: {len(post_data)}", file=sys.stderr)
-    print(f"요청 본문 (처음 300자): {post_data[:300]}", file=sys.stderr)
-    print(f"Headers: {headers}", file=sys.stderr)
-    
-    # 실제 전송될 쿠키 확인
-    from requests import Request
-    req = Request('POST', url, data=post_data.encode('utf-8'), headers=headers)
-    prepared = session.prepare_request(req)
-    cookie_header = prepared.headers.get('Cookie', 'N/A')
-    print(f"실제 전송될 Cookie 헤더: {cookie_header[:200]}..." if len(cookie_header) > 200 else f"실제 전송될 Cookie 헤더: {cookie_header}", file=sys.stderr)
-    print("=" * 80, file=sys.stderr)
-    
-    # ref 로직: this.client.post()는 CookieJar를 통해 자동으로 쿠키를 전달
-    # Python requests.Session도 자동으로 쿠키를 전달하지만, 도메인이 다를 경우 문제가 될 수 있음
-    # teht.hometax.go.kr로 요청할 때 쿠키가 전달되도록 확인
-    # requests.Session은 자동으로 쿠키를 전달하므로, 수동으로 헤더에 추가할 필요 없음
-    # 단, 도메인이 다를 경우를 대비해 쿠키를 확인
-    response = session.post(
-        url,
-        data=post_data.encode('utf-8'),
-        headers=headers,
-        timeout=30
-    )
-    
-    # 🔍 응답 상세 로깅
-    print("=" * 80, file=sys.stderr)
-    print("[DEBUG] API 응답 상세 정보", file=sys.stderr)
-    print("=" * 80, file=sys.stderr)
-    print(f"상태 코드: {response.status_code}", file=sys.stderr)
-    print(f"응답 헤더 (주요):", file=sys.stderr)
-    for key in ['Content-Type', 'Set-Cookie', 'Content-Length']:
-        if key in response.headers:
-            print(f"  {key}: {response.headers[key]}", file=sys.stderr)
-    print(f"응답 본문 길이: {len(response.text)}", file=sys.stderr)
-    print(f"응답 본문 (처음 1000자): {response.text[:1000]}", file=sys.stderr)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug('수임거래처 조회 응답', status=response.status_code,
+                  content_type=response.headers.get('Content-Type'), length=len(response.content),
+                  set_cookie=response.headers.get('Set-Cookie'), body=response.text[:1000])
     
     # 응답 상태 확인
     if response.status_code != 200:
@@ -136,9 +93,8 @@ def fetch_hometax_clients(
     
     response.raise_for_status()
     
-    # 응답 텍스트 확인 (디버깅)
     try:
-        result_data = response.json()
+        result_data = response_json(response)
     except:
         raise Exception(f"응답 파싱 실패. 상태 코드: {response.status_code}, 응답: {response.text[:500]}")
     
@@ -150,117 +106,315 @@ def fetch_hometax_clients(
     result_code = result_msg.get('result', '')
     error_code = result_msg.get('code', '')
     error_msg = result_msg.get('msg', '')
-    detail_msg = result_msg.get('detailMsg', '')
-    
-    # 🔍 오류 유형 구분
-    print("=" * 80, file=sys.stderr)
-    print("[DEBUG] 응답 분석", file=sys.stderr)
-    print("=" * 80, file=sys.stderr)
-    print(f"result 코드: {result_code}", file=sys.stderr)
-    print(f"error 코드: {error_code}", file=sys.stderr)
-    print(f"error 메시지: {error_msg}", file=sys.stderr)
-    print(f"상세 메시지: {detail_msg}", file=sys.stderr)
-    
-    # 오류 유형 판단
-    if error_code == 'login':
-        print("→ 판단: 세션 관리 문제 (로그인/쿠키 문제)", file=sys.stderr)
-    elif '세션정보' in error_msg:
-        print("→ 판단: 세션 정보 누락 문제", file=sys.stderr)
-    elif '서비스 실행 중 오류' in error_msg:
-        print("→ 판단: 서버 내부 오류 (스크래핑 지점 문제 가능)", file=sys.stderr)
-    elif error_code:
-        print(f"→ 판단: 기타 오류 (코드: {error_code})", file=sys.stderr)
-    else:
-        print("→ 판단: 알 수 없는 오류", file=sys.stderr)
-    
-    print(f"전체 응답: {json.dumps(result_data, ensure_ascii=False, indent=2)[:2000]}", file=sys.stderr)
-    print("=" * 80, file=sys.stderr)
     
     if result_code != 'S':
-        # 전체 응답을 로그로 출력 (디버깅)
-        print(f"[DEBUG] 수임거래처 조회 응답: {json.dumps(result_data, ensure_ascii=False, indent=2)[:1000]}", file=sys.stderr)
-        raise Exception(f"수임거래처 조회 실패: {error_msg}")
+        # 오류 유형 구분
+        if error_code == 'login':
+            cause = '세션 관리 문제 (로그인/쿠키 문제)'
+        elif '세션정보' in error_msg:
+            cause = '세션 정보 누락 문제'
+        elif '서비스 실행 중 오류' in error_msg:
+            cause = '서버 내부 오류 (스크래핑 지점 문제 가능)'
+        elif error_code:
+            cause = f'기타 오류 (코드: {error_code})'
+        else:
+            cause = '알 수 없는 오류'
+        log.warning('수임거래처 조회 실패', cause=cause, result=result_code, code=error_code, error=error_msg,
+                    detail=result_msg.get('detailMsg', ''), response=LazyJson(result_data, limit=2000))
+        if error_code == 'login':
+            raise Exception(f"수임거래처 조회 실패: {error_msg}")
+        raise ClientListRejected(f"수임거래처 조회 실패: {error_msg}")
     
     # 수임거래처 목록 추출 (페이지네이션 처리)
-    all_clients = []
-    page_num = 1
-    page_size = 200
-    
-    while True:
-        # 첫 번째 페이지는 이미 조회됨
-        if page_num == 1:
-            list_data = result_data.get('afdsSttnInfrDVOList', [])
-        else:
-            # 다음 페이지 조회
-            body['pageInfoVO']['pageNum'] = str(page_num)
-            
-            # NTS 재생성
-            sec = random.randrange(30, 60)
-            nts = f"{sec}lpNhzq7ZwSaVt9TU2s8mHzIzLjmDpVKVgvmLBNswI{sec - 11}"
-            json_body = json.dumps(body, ensure_ascii=False)
-            post_data = f"{json_body}{nts}"
-            
-            response = session.post(
-                url,
-                data=post_data.encode('utf-8'),
-                headers=headers,
-                timeout=30
-            )
-            
-            if response.status_code != 200:
-                print(f"[WARN] 페이지 {page_num} 조회 실패: {response.status_code}", file=sys.stderr)
-                break
-            
-            try:
-                result_data = response.json()
-            except:
-                print(f"[WARN] 페이지 {page_num} 응답 파싱 실패", file=sys.stderr)
+    page_size = CLIENT_PAGE_SIZE
+    list_data = result_data.get('afdsSttnInfrDVOList', [])
+    if not isinstance(list_data, list) or len(list_data) == 0:
+        log.debug('조회된 거래처 없음', afdsCl=engagement_code)
+        return []
+    
+    all_clients = list(list_data)
+    log.debug('페이지 조회', page=1, count=len(list_data))
+    
+    total_count = _parse_total_count(result_data)
+    if total_count is not None:
+        # totalCount를 알면 나머지 페이지를 동시에 조회 (같은 세션, 최대 max_in_flight개)
+        last_page = (total_count + page_size - 1) // page_size
+        log.debug('전체 페이지 조회', total_count=total_count, pages=last_page)
+        pages = _fetch_pages_concurrently(session, template, range(2, last_page + 1), max_in_flight, rate_controller)
+        for page_num in range(2, last_page + 1):
+            all_clients.extend(pages.get(page_num) or [])
+    elif len(list_data) >= page_size:
+        # totalCount가 없으면 빈 페이지가 나올 때까지 순차 조회
+        page_num = 2
+        while True:
+            page = _fetch_client_page(session, template, page_num, rate_controller)
+            if not page:
                 break
-            
-            result_msg = result_data.get('resultMsg', {})
-            if isinstance(result_msg, str):
-                result_msg = {}
-            
-            if result_msg.get('result') != 'S':
-                print(f"[WARN] 페이지 {page_num} 조회 실패: {result_msg.get('msg', 'Unknown error')}", file=sys.stderr)
+            all_clients.extend(page)
+            log.debug('페이지 조회', page=page_num, count=len(page), accumulated=len(all_clients))
+            if len(page) < page_size:
                 break
-            
-            list_data = result_data.get('afdsSttnInfrDVOList', [])
-        
-        if not isinstance(list_data, list) or len(list_data) == 0:
-            print(f"[DEBUG] 페이지 {page_num}: 조회된 거래처 없음", file=sys.stderr)
-            break
-        
-        all_clients.extend(list_data)
-        print(f"[DEBUG] 페이지 {page_num}: {len(list_data)}개 거래처 조회 (누적: {len(all_clients)}개)", file=sys.stderr)
-        
-        # totalCount 확인 (응답에서 추출)
-        result_msg = result_data.get('resultMsg', {})
-        if isinstance(result_msg, str):
-            result_msg = {}
-        total_count_str = result_msg.get('totalCount') or result_data.get('totalCount')
-        
-        if total_count_str:
-            try:
-                total_count = int(total_count_str)
-                print(f"[DEBUG] 총 거래처 수: {total_count}, 현재 조회: {len(all_clients)}", file=sys.stderr)
-                if len(all_clients) >= total_count:
-                    print(f"[DEBUG] 모든 거래처 조회 완료", file=sys.stderr)
-                    break
-            except:
-                pass
-        
-        # 다음 페이지가 없으면 중단
-        if len(list_data) < page_size:
-            print(f"[DEBUG] 마지막 페이지 도달 (조회된 거래처: {len(list_data)}개)", file=sys.stderr)
-            break
-        
-        page_num += 1
+            page_num += 1
     
-    print(f"[DEBUG] 최종 조회된 거래처 수: {len(all_clients)}", file=sys.stderr)
+    log.debug('수임거래처 조회 완료', afdsCl=engagement_code, count=len(all_clients))
     return all_clients
 
 
+@lru_cache(maxsize=64)
+def _client_list_template(engagement_code: str, hometax_admin_code: str) -> RequestTemplate:
+    """
+    수임거래처 목록 조회 요청 템플릿 (ref의 hometaxActionCall 로직)
+    ref에서는 realScreenId가 빈 문자열이지만 null로 처리됨, null 값은 쿼리에서 제외(URLSearchParams)
+    """
+    query = {
+        'actionId': 'ATEABHAA001R10',
+        'screenId': 'UTEABHAA03',
+        'popupYn': 'false',
+        'realScreenId': '',  # 빈 문자열은 유지
+    }
+    filtered_params = {k: v for k, v in query.items() if v is not None}
+    url = f"https://teht.hometax.go.kr/wqAction.do?{urlencode(filtered_params)}"
+    
+    body = {
+        'afdsCl': engagement_code,
+        'txaaAdmNo': hometax_admin_code,
+        'pageInfoVO': {
+            'pageNum': '1',
+            'pageSize': str(CLIENT_PAGE_SIZE),
+            'totalCount': ''
+        }
+    }
+    
+    # ref 로직: headers는 Content-Type만 사용
+    headers = {
+        'Content-Type': 'application/json; charset=UTF-8',
+    }
+    return RequestTemplate(url, None, headers, body, fields=('pageInfoVO.pageNum',))
+
+
+def _parse_total_count(result_data: Dict) -> Optional[int]:
+    """응답에서 totalCount 추출 (resultMsg 또는 최상위, 없거나 숫자가 아니면 None)"""
+    result_msg = result_data.get('resultMsg', {})
+    if isinstance(result_msg, str):
+        result_msg = {}
+    total_count_str = result_msg.get('totalCount') or result_data.get('totalCount')
+    try:
+        return int(total_count_str) if total_count_str else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _post_page(
+    session: requests.Session,
+    template: RequestTemplate,
+    page_num: int,
+    rate_controller: AimdRateController
+) -> requests.Response:
+    """
+    목록 한 페이지 요청 (과부하 시 속도 제어기에 따라 재시도)
+    requests.Session은 CookieJar로 쿠키를 자동 전달하므로(ref의 this.client.post()와 동일) 수동으로 헤더에 넣지 않음
+    """
+    post_data = template.render({'pageInfoVO.pageNum': str(page_num)})
+    for _ in range(rate_controller.max_retries + 1):
+        rate_controller.acquire()
+        response = session.post(template.url, data=post_data, headers=template.headers, timeout=30)
+        if is_overload_response(response.content):
+            pause = rate_controller.on_overload()
+            log.warning('과부하 제어 감지, 재시도', page=page_num, pause=f"{pause:.0f}s",
+                        rate=f"{rate_controller.current_rate:.2f}/s")
+            continue
+        if response.status_code == 200:
+            rate_controller.on_success()
+        return response
+    raise Exception("과부하 제어: 최대 재시도 횟수 초과")
+
+
+def _fetch_client_page(
+    session: requests.Session,
+    template: RequestTemplate,
+    page_num: int,
+    rate_controller: AimdRateController
+) -> Optional[List[Dict]]:
+    """수임거래처 목록 한 페이지 조회. 실패하면 None"""
+    try:
+        response = _post_page(session, template, page_num, rate_controller)
+    except Exception as e:
+        log.warning('페이지 조회 실패', page=page_num, error=e)
+        return None
+    
+    if response.status_code != 200:
+        log.warning('페이지 조회 실패', page=page_num, status=response.status_code)
+        return None
+    
+    try:
+        result_data = response_json(response)
+    except ValueError:
+        log.warning('페이지 응답 파싱 실패', page=page_num)
+        return None
+    
+    result_msg = result_data.get('resultMsg', {})
+    if isinstance(result_msg, str):
+        result_msg = {}
+    if result_msg.get('result') != 'S':
+        log.warning('페이지 조회 실패', page=page_num, error=result_msg.get('msg', 'Unknown error'))
+        return None
+    
+    list_data = result_data.get('afdsSttnInfrDVOList', [])
+    return list_data if isinstance(list_data, list) else []
+
+
+def _fetch_pages_concurrently(
+    session: requests.Session,
+    template: RequestTemplate,
+    page_nums: Iterable[int],
+    max_in_flight: int,
+    rate_controller: AimdRateController
+) -> Dict[int, List[Dict]]:
+    """
+    여러 페이지를 동시에 조회하여 {페이지 번호: 거래처 목록}으로 반환합니다.
+    동시 조회에서 실패한 페이지는 마지막에 한 번 순차로 다시 시도합니다.
+    """
+    page_nums = list(page_nums)
+    if not page_nums:
+        return {}
+    
+    pages: Dict[int, List[Dict]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_in_flight, len(page_nums))), thread_name_prefix="clients-page") as executor:
+        futures = {executor.submit(_fetch_client_page, session, template, n, rate_controller): n for n in page_nums}
+        for future in as_completed(futures):
+            page = future.result()
+            if page is not None:
+                pages[futures[future]] = page
+    
+    for page_num in page_nums:
+        if page_num not in pages:
+            page = _fetch_client_page(session, template, page_num, rate_controller)
+            if page is not None:
+                pages[page_num] = page
+    
+    log.debug('페이지 동시 조회', pages=f"2~{page_nums[-1]}", count=sum(len(p) for p in pages.values()))
+    return pages
+
+
+def _load_listing_mode(cache_path: Path, key: str) -> Optional[str]:
+    with _mode_cache_lock:
+        try:
+            entry = json.loads(cache_path.read_text(encoding='utf-8')).get(key)
+        except (OSError, ValueError):
+            return None
+    if not entry or time.time() - entry.get('updated_at', 0) > MODE_CACHE_TTL_SECONDS:
+        return None
+    return entry.get('mode')
+
+
+def _save_listing_mode(cache_path: Path, key: str, mode: str) -> None:
+    with _mode_cache_lock:
+        try:
+            modes = json.loads(cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            modes = {}
+        modes[key] = {'mode': mode, 'updated_at': time.time()}
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps(modes, ensure_ascii=False), encoding='utf-8')
+        except OSError as e:
+            log.warning('조회 방식 캐시 저장 실패', error=e)
+
+
+def _dedupe_clients(clients: List[Dict]) -> List[Dict]:
+    """registry.client_key(bsno, 없으면 resno+txprNm, 없으면 내용) 기준 중복 제거, 먼저 나온 항목 유지"""
+    seen = set()
+    unique = []
+    for client in clients:
+        key = client_key({k: v for k, v in client.items() if k != '_engagementStatus'})
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(client)
+    return unique
+
+
+def fetch_all_engagement_statuses(
+    session: requests.Session,
+    hometax_admin_code: Optional[str] = None,
+    max_in_flight: int = 4,
+    mode_cache_path: Optional[Path] = DEFAULT_MODE_CACHE,
+    rate_controller: Optional[AimdRateController] = None,
+    pubc_user_no: str = '',
+    missing_statuses: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    수임중/해지/미동의 전체 수임거래처 조회
+    
+    전체 조회(engagement_code="")를 먼저 시도하고, 서버가 거부하면 세 상태를 동시에 조회하여 합칩니다.
+    어느 방식이 통하는지는 txaaAdmNo별로 mode_cache_path에 기록해 두므로, 다음 실행부터는
+    실패할 전체 조회를 건너뜁니다 (MODE_CACHE_TTL_SECONDS가 지나면 다시 확인).
+    'split'은 서버가 전체 조회를 명시적으로 거부한 경우에만 기록합니다. 시간 초과/과부하 같은
+    일시적인 실패는 이번 실행만 상태별로 조회하고 기록하지 않습니다.
+    
+    Args:
+        session: 로그인된 requests.Session 객체
+        hometax_admin_code: 홈택스 관리자 번호 (선택)
+        max_in_flight: 목록 하나당 페이지 동시 요청 수 (상태별 조회 시 최대 3배)
+        mode_cache_path: 조회 방식 캐시 파일 (None이면 캐시하지 않음)
+        rate_controller: 모든 목록 요청이 공유할 속도 제어기 (기본: get_rate_controller(pubc_user_no))
+        pubc_user_no: 로그인 사용자 번호 (pubcUserNo, 기본 속도 제어기의 키)
+        missing_statuses: 주면 상태별 조회에서 실패한 수임 상태를 여기에 추가합니다.
+            비어 있지 않으면 반환 목록이 일부 상태만 담은 불완전한 목록입니다.
+        
+    Returns:
+        client_key 기준으로 중복 제거된 거래처 목록 (각 거래처에 _engagementStatus 포함)
+    """
+    key = hometax_admin_code or ''
+    rate_controller = rate_controller or get_rate_controller(pubc_user_no or None)
+    cache_path = Path(mode_cache_path) if mode_cache_path else None
+    mode = _load_listing_mode(cache_path, key) if cache_path else None
+    
+    clients_data: List[Dict] = []
+    if mode != 'split':
+        try:
+            clients_data = fetch_hometax_clients(session, hometax_admin_code, "", max_in_flight, rate_controller)
+            log.debug('전체 거래처 조회 성공', count=len(clients_data))
+            mode = 'all'
+            if cache_path:
+                _save_listing_mode(cache_path, key, mode)
+        except ClientListRejected as e:
+            log.info('전체 조회 거부됨, 수임중/해지/미동의 동시 조회', error=e)
+            mode = 'split'
+            if cache_path:
+                _save_listing_mode(cache_path, key, mode)
+        except Exception as e:
+            log.info('전체 조회 실패(일시적), 이번에는 수임중/해지/미동의 동시 조회', error=e)
+            mode = 'split'
+    
+    if mode == 'split':
+        with ThreadPoolExecutor(max_workers=len(ENGAGEMENT_STATUSES), thread_name_prefix="clients-status") as executor:
+            futures = {
+                code: executor.submit(fetch_hometax_clients, session, hometax_admin_code, code, max_in_flight, rate_controller)
+                for code in ENGAGEMENT_STATUSES
+            }
+            for code, status in ENGAGEMENT_STATUSES.items():
+                try:
+                    clients = futures[code].result()
+                except Exception as e:
+                    log.warning('상태별 거래처 조회 실패', status=status, error=e)
+                    if missing_statuses is not None:
+                        missing_statuses.append(status)
+                    continue
+                for client in clients:
+                    client['_engagementStatus'] = status
+                clients_data.extend(clients)
+                log.debug('상태별 거래처 조회', status=status, count=len(clients))
+    
+    # _engagementStatus가 없는 경우(전체 조회) 원본 데이터로 판단
+    for client in clients_data:
+        if '_engagementStatus' not in client:
+            # 해지일이 있으면 해지중
+            client['_engagementStatus'] = '해지중' if client.get('ofbDt') else '수임중'
+    
+    return _dedupe_clients(clients_data)
+
+
 def get_hometax_admin_code(session: requests.Session) -> Optional[str]:
     """
     홈택스 관리자 번호 조회
@@ -275,8 +429,7 @@ def get_hometax_admin_code(session: requests.Session) -> Optional[str]:
     """
     try:
         # permission.do 호출
-        sec = random.randrange(30, 60)
-        nts = f"{sec}lpNhzq7ZwSaVt9TU2s8mHzIzLjmDpVKVgvmLBNswI{sec - 11}"
+        nts = make_nts()
         
         url = "https://hometax.go.kr/permission.do?screenId=index_pp"
         post_data = f"{{}}{nts}"
@@ -293,12 +446,12 @@ def get_hometax_admin_code(session: requests.Session) -> Optional[str]:
         )
         
         response.raise_for_status()
-        result = response.json()
+        result = response_json(response)
         
         txaa_adm_no = result.get('txaaAdmNo')
         return txaa_adm_no
         
     except Exception as e:
-        print(f"관리자 번호 조회 실패: {e}")
+        log.warning('관리자 번호 조회 실패', error=e)
         return None
 
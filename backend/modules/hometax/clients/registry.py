@@ -0,0 +1,237 @@
+"""
+수임거래처 목록 레지스트리 (SQLite)
+인증서별로 마지막으로 받은 거래처 목록을 저장하고, 새로 받은 목록과 비교하여
+신규/제외/해지/수임상태 변경/정보 변경을 기록합니다.
+수집 스크립트는 changed_since()로 바뀐 거래처만 골라 깊은 과거 조회를 예약할 수 있습니다.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+# 실행 위치(CWD)와 관계없이 저장소 루트의 data 폴더 (수집 스크립트와 같은 DB를 보도록)
+DEFAULT_REGISTRY_DB = Path(__file__).resolve().parents[4] / 'data' / 'client-registry.sqlite3'
+
+# 변경 유형
+ADDED = 'added'                            # 새로 나타난 거래처
+REMOVED = 'removed'                        # 목록에서 사라진 거래처
+TERMINATED = 'terminated'                  # 수임 상태가 해지중으로 바뀜
+ENGAGEMENT_CHANGED = 'engagement_changed'  # 그 밖의 수임 상태 변경
+CHANGED = 'changed'                        # 수임 상태 외 정보 변경
+
+TERMINATED_STATUS = '해지중'
+
+# 지문 계산에서 제외하는 필드 (조회 경로에 따라 붙는 메타데이터)
+_VOLATILE_FIELDS = ('_sourceCert', '_sourcePath')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    cert_path TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    client_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS clients (
+    cert_path TEXT NOT NULL,
+    client_key TEXT NOT NULL,
+    engagement_status TEXT,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    changed_at REAL NOT NULL,
+    removed_at REAL,
+    PRIMARY KEY (cert_path, client_key)
+);
+CREATE TABLE IF NOT EXISTS changes (
+    id INTEGER PRIMARY KEY,
+    cert_path TEXT NOT NULL,
+    client_key TEXT NOT NULL,
+    change_type TEXT NOT NULL,
+    old_status TEXT,
+    new_status TEXT,
+    changed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_changes_time ON changes (changed_at);
+CREATE INDEX IF NOT EXISTS idx_clients_changed ON clients (changed_at);
+"""
+
+
+def client_key(client: Dict) -> str:
+    """
+    거래처 식별 키: bsno, 없으면 resno+txprNm, 그것도 없으면 내용 해시
+    홈택스는 resno를 *로 마스킹해서 돌려주므로 resno만으로는 다른 개인이 같은 키가 될 수 있습니다.
+    """
+    if client.get('bsno'):
+        return client['bsno']
+    if client.get('resno') and client.get('txprNm'):
+        return f"resno:{client['resno']}:{client['txprNm']}"
+    return 'hash:' + _fingerprint(client)[:16]
+
+
+def _fingerprint(client: Dict) -> str:
+    stable = {k: v for k, v in client.items() if k not in _VOLATILE_FIELDS}
+    return hashlib.sha256(json.dumps(stable, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ClientRegistry:
+    """
+    인증서별 수임거래처 스냅샷과 변경 이력 (스레드 안전)
+
+    사용 예:
+        registry = ClientRegistry()
+        diff = registry.sync(cert_path, clients)        # {'added': [...], 'removed': [...], ...}
+        changed = registry.changed_since(last_run_ts)   # 이후 신규/변경된 거래처
+    """
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_REGISTRY_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def sync(self, cert_path: str, clients: Iterable[Dict], fetched_at: Optional[float] = None) -> Dict[str, List[Dict]]:
+        """
+        새로 받은 거래처 목록을 저장하고 이전 스냅샷과의 차이를 반환합니다.
+
+        Returns:
+            {'added', 'removed', 'terminated', 'engagement_changed', 'changed': 거래처 목록, 'unchanged': 개수}
+        """
+        now = fetched_at or time.time()
+        diff: Dict[str, list] = {ADDED: [], REMOVED: [], TERMINATED: [], ENGAGEMENT_CHANGED: [], CHANGED: []}
+        unchanged = 0
+        events = []
+
+        with self._lock, self._conn:
+            previous = {
+                row['client_key']: row for row in self._conn.execute(
+                    'SELECT * FROM clients WHERE cert_path = ? AND removed_at IS NULL', (cert_path,)
+                )
+            }
+            seen = set()
+            count = 0
+            for client in clients:
+                count += 1
+                key = client_key(client)
+                if key in seen:
+                    continue
+                seen.add(key)
+                status = client.get('_engagementStatus')
+                fingerprint = _fingerprint(client)
+                data = json.dumps(client, ensure_ascii=False)
+                old = previous.get(key)
+
+                if old is None:
+                    change = ADDED
+                elif old['engagement_status'] != status:
+                    change = TERMINATED if status == TERMINATED_STATUS else ENGAGEMENT_CHANGED
+                elif old['fingerprint'] != fingerprint:
+                    change = CHANGED
+                else:
+                    change = None
+
+                if change is None:
+                    unchanged += 1
+                    self._conn.execute(
+                        'UPDATE clients SET last_seen = ?, data = ? WHERE cert_path = ? AND client_key = ?',
+                        (now, data, cert_path, key)
+                    )
+                    continue
+
+                diff[change].append(client)
+                events.append((cert_path, key, change, old['engagement_status'] if old else None, status, now))
+                self._conn.execute(
+                    'INSERT INTO clients (cert_path, client_key, engagement_status, fingerprint, data, first_seen, last_seen, changed_at, removed_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL) '
+                    'ON CONFLICT (cert_path, client_key) DO UPDATE SET engagement_status = excluded.engagement_status, '
+                    'fingerprint = excluded.fingerprint, data = excluded.data, last_seen = excluded.last_seen, '
+                    'changed_at = excluded.changed_at, removed_at = NULL',
+                    (cert_path, key, status, fingerprint, data, now, now, now)
+                )
+
+            for key, old in previous.items():
+                if key not in seen:
+                    diff[REMOVED].append(json.loads(old['data']))
+                    events.append((cert_path, key, REMOVED, old['engagement_status'], None, now))
+                    self._conn.execute(
+                        'UPDATE clients SET removed_at = ?, changed_at = ? WHERE cert_path = ? AND client_key = ?',
+                        (now, now, cert_path, key)
+                    )
+
+            self._conn.executemany(
+                'INSERT INTO changes (cert_path, client_key, change_type, old_status, new_status, changed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                events
+            )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO snapshots (cert_path, fetched_at, client_count) VALUES (?, ?, ?)',
+                (cert_path, now, count)
+            )
+
+        diff['unchanged'] = unchanged
+        return diff
+
+    def roster(self, cert_path: str) -> List[Dict]:
+        """인증서의 마지막 거래처 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT data FROM clients WHERE cert_path = ? AND removed_at IS NULL ORDER BY first_seen, rowid',
+                (cert_path,)
+            ).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def snapshot_age(self, cert_path: str) -> Optional[float]:
+        """마지막 스냅샷 이후 경과 시간(초). 스냅샷이 없으면 None"""
+        with self._lock:
+            row = self._conn.execute('SELECT fetched_at FROM snapshots WHERE cert_path = ?', (cert_path,)).fetchone()
+        return time.time() - row['fetched_at'] if row else None
+
+    def last_synced_at(self) -> Optional[float]:
+        """모든 인증서가 마지막으로 동기화된 시각 중 가장 이른 값 (직전 조회 이후 변경분을 고를 때 사용)"""
+        with self._lock:
+            row = self._conn.execute('SELECT MIN(fetched_at) AS t FROM snapshots').fetchone()
+        return row['t']
+
+    def changed_since(
+        self,
+        since: float,
+        cert_path: Optional[str] = None,
+        change_types: Iterable[str] = (ADDED, TERMINATED, ENGAGEMENT_CHANGED, CHANGED)
+    ) -> List[Dict]:
+        """
+        since(유닉스 시각) 이후 신규/변경된 거래처의 현재 정보
+        각 거래처에는 마지막 변경 유형이 _change로 붙습니다. 제외(removed)된 거래처는 기본적으로 빠집니다.
+        """
+        change_types = list(change_types)
+        query = (
+            'SELECT c.cert_path, c.client_key, c.data, ch.change_type FROM changes ch '
+            'JOIN clients c ON c.cert_path = ch.cert_path AND c.client_key = ch.client_key '
+            f"WHERE ch.changed_at >= ? AND ch.change_type IN ({','.join('?' * len(change_types))})"
+        )
+        args: list = [since, *change_types]
+        if cert_path is not None:
+            query += ' AND ch.cert_path = ?'
+            args.append(cert_path)
+        query += ' ORDER BY ch.id'
+
+        with self._lock:
+            rows = self._conn.execute(query, args).fetchall()
+
+        # 같은 거래처가 여러 번 바뀌었으면 마지막 변경 유형만 남김
+        latest: Dict[tuple, Dict] = {}
+        for row in rows:
+            client = json.loads(row['data'])
+            client['_change'] = row['change_type']
+            latest[(row['cert_path'], row['client_key'])] = client
+        return list(latest.values())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,80 @@
+"""
+홈택스 응답 JSON 디코더
+응답 본문(bytes)을 한 번만 디코딩합니다. orjson 또는 msgspec이 설치되어 있으면 사용하고, 없으면 표준 json을 씁니다.
+response.text로 문자열을 만든 뒤 response.json()으로 다시 디코딩하는 이중 비용이 없고,
+수백 MB 단위의 신고현황/거래처 백필에서 파싱 시간이 크게 줄어듭니다.
+
+HOMETAX_JSON_BACKEND 환경변수로 백엔드를 고정할 수 있습니다 (orjson | msgspec | json).
+
+사용 예:
+    data = loads(response.content)
+"""
+
+import json
+import os
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+_BACKENDS = ('orjson', 'msgspec', 'json')
+
+
+def _select_backend(name: str = '') -> str:
+    name = (name or os.environ.get('HOMETAX_JSON_BACKEND', '')).strip().lower()
+    if name and name not in _BACKENDS:
+        raise ValueError(f"알 수 없는 JSON 백엔드: {name}")
+    if name == 'orjson' or (not name and orjson is not None):
+        if orjson is None:
+            raise ImportError("orjson이 설치되어 있지 않습니다")
+        return 'orjson'
+    if name == 'msgspec' or (not name and msgspec is not None):
+        if msgspec is None:
+            raise ImportError("msgspec이 설치되어 있지 않습니다")
+        return 'msgspec'
+    return 'json'
+
+
+_backend = _select_backend()
+
+
+def backend() -> str:
+    """현재 사용 중인 디코더 (orjson | msgspec | json)"""
+    return _backend
+
+
+def set_backend(name: str = '') -> str:
+    """디코더를 바꿉니다. 빈 값이면 설치된 것 중 가장 빠른 것을 고릅니다."""
+    global _backend
+    _backend = _select_backend(name)
+    return _backend
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    JSON 디코딩 (bytes 그대로 디코딩, 문자열도 허용)
+
+    Raises:
+        ValueError: 올바른 JSON이 아님 (백엔드와 무관하게 같은 예외)
+    """
+    if _backend == 'orjson':
+        return orjson.loads(data)
+    if _backend == 'msgspec':
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(data)
+
+
+def response_json(response) -> Any:
+    """requests/httpx 응답 본문을 한 번만 디코딩 (response.json() 대체)"""
+    return loads(response.content)
+
@@ -0,0 +1,168 @@
+"""
+홈택스 모듈 공용 로거
+레벨(HOMETAX_LOG_LEVEL, 기본 INFO)과 형식(HOMETAX_LOG_FORMAT=text|json)을 환경 변수로 정하고, 항상 stderr로 출력합니다.
+stdout은 Node.js 연동 스크립트의 JSON 결과 전용이기 때문입니다.
+
+- 꺼진 레벨의 호출은 레코드를 만들지 않으므로, 메시지/필드 포맷은 실제로 출력될 때만 수행됩니다.
+- 비싼 값(JSON 덤프, 쿠키 목록)은 LazyJson/LazyCookies로 넘기면 출력 시점에만 직렬화합니다.
+- 출력 직전에 세션 ID/토큰 값을 가립니다.
+
+사용 예:
+    log = get_logger(__name__)
+    log.debug('페이지 조회', page=2, count=len(rows))
+    log.warning('조회 실패', response=LazyJson(result_data, limit=1000))
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+from typing import Any, Optional
+
+LOG_LEVEL_ENV = 'HOMETAX_LOG_LEVEL'
+LOG_FORMAT_ENV = 'HOMETAX_LOG_FORMAT'
+ROOT_LOGGER = 'hometax'
+
+# 값을 가릴 쿠키/필드 이름 (TXPPsessionID, TEHTsessionID, WMONID, NTS_*, ssoToken 등)
+_SECRET_RE = re.compile(
+    r'(\b(?:\w*sessionID|JSESSIONID|WMONID|NTS_\w+|ssoToken)["\']?\s*[=:]\s*["\']?)([^;"\'&,\s<>]+)',
+    re.IGNORECASE
+)
+
+# LoggerAdapter.process에서 logging에 그대로 넘기는 인자
+_LOGGING_KWARGS = ('exc_info', 'stack_info', 'stacklevel', 'extra')
+
+
+def redact(text: str) -> str:
+    """세션 ID/토큰 값을 앞 4자와 길이만 남기고 가립니다."""
+    return _SECRET_RE.sub(lambda m: f"{m.group(1)}{_mask(m.group(2))}", text)
+
+
+def _mask(value: str) -> str:
+    return f"{value[:4]}***({len(value)})" if len(value) > 8 else '***'
+
+
+class LazyJson:
+    """출력될 때만 JSON으로 직렬화하는 값 (limit: 최대 글자 수)"""
+
+    __slots__ = ('obj', 'limit')
+
+    def __init__(self, obj: Any, limit: Optional[int] = None):
+        self.obj = obj
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = json.dumps(self.obj, ensure_ascii=False, default=str)
+        return text[:self.limit] if self.limit else text
+
+
+class LazyCookies:
+    """출력될 때만 쿠키 이름/도메인/값 길이를 나열하는 값 (값 자체는 남기지 않음)"""
+
+    __slots__ = ('jar',)
+
+    def __init__(self, jar):
+        self.jar = jar
+
+    def __str__(self) -> str:
+        return ', '.join(f"{c.name}@{c.domain}({len(c.value or '')})" for c in self.jar)
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """키워드 인자를 구조화 필드로 받는 로거 (log.info('메시지', key=value))"""
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in _LOGGING_KWARGS}
+        if fields:
+            kwargs['extra'] = {**kwargs.get('extra', {}), 'fields': fields}
+        return msg, kwargs
+
+
+class _RedactingFilter(logging.Filter):
+    """핸들러 단계에서 메시지와 필드를 한 번만 포맷하고 비밀 값을 가립니다."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = redact(record.getMessage())
+        record.args = None
+        fields = getattr(record, 'fields', None)
+        if fields:
+            record.fields = {key: redact(str(value)) for key, value in fields.items()}
+        return True
+
+
+class _TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"[{record.levelname} {record.name}] {record.getMessage()}"
+        fields = getattr(record, 'fields', None)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            **getattr(record, 'fields', {}),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _StderrHandler(logging.StreamHandler):
+    """출력 시점의 sys.stderr로 씁니다 (스크립트가 stdout/stderr를 바꿔 끼워도 따라감)"""
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+# 루트 로거에 붙인 출력 핸들러 표시. 이 모듈이 hometax.logger와 modules.hometax.logger처럼 두 번
+# 로드되어도 핸들러는 하나만 붙도록, 모듈 전역 대신 로거에 붙은 핸들러로 설정 여부를 판단합니다.
+_HANDLER_TAG = '_hometax_stderr_handler'
+
+
+def _find_handler(root: logging.Logger) -> Optional[logging.Handler]:
+    for handler in root.handlers:
+        if getattr(handler, _HANDLER_TAG, False):
+            return handler
+    return None
+
+
+def configure(level: Optional[str] = None, fmt: Optional[str] = None) -> None:
+    """
+    hometax 로거의 레벨과 출력 형식을 설정합니다. 인자를 생략하면 환경 변수(없으면 INFO/text)를 따릅니다.
+    """
+    root = logging.getLogger(ROOT_LOGGER)
+    handler = _find_handler(root)
+    if handler is None:
+        handler = _StderrHandler()
+        setattr(handler, _HANDLER_TAG, True)
+        handler.addFilter(_RedactingFilter())
+        root.addHandler(handler)
+        root.propagate = False
+
+    level = (level or os.environ.get(LOG_LEVEL_ENV) or 'INFO').upper()
+    root.setLevel(getattr(logging, level, logging.INFO))
+    fmt = (fmt or os.environ.get(LOG_FORMAT_ENV) or 'text').lower()
+    handler.setFormatter(_JsonFormatter() if fmt == 'json' else _TextFormatter())
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """hometax 계층의 구조화 로거 (처음 호출 시 환경 변수로 설정)"""
+    if _find_handler(logging.getLogger(ROOT_LOGGER)) is None:
+        configure()
+    if name != ROOT_LOGGER and not name.startswith(ROOT_LOGGER + '.'):
+        name = f"{ROOT_LOGGER}.{name}"
+    return StructuredLogger(logging.getLogger(name), {})
@@ -0,0 +1,198 @@
+"""
+홈택스 요청 계측
+요청마다 엔드포인트(경로 + actionId, 없으면 screenId), 지연 시간, 응답 크기, HTTP 상태, 과부하제어 여부를 기록하고
+엔드포인트별 p50/p95/p99를 집계합니다. 로그인(챌린지, pubcLogin.do, SSO, token.do, permission.do)과
+수집(wqAction.do actionId별) 중 어디에 시간이 드는지 보고 동시 처리 수를 조정하는 데 씁니다.
+
+requests.Session은 instrument_session()으로 응답 훅을 달아 두면 모든 호출이 자동으로 기록됩니다.
+
+사용 예:
+    instrument_session(session)
+    ...
+    print(json.dumps(request_metrics().summary(), ensure_ascii=False))
+    Path('hometax.prom').write_text(request_metrics().prometheus_text())
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .rate_control import is_overload_response
+
+# 엔드포인트별로 백분위 계산에 남겨 두는 최근 표본 수
+DEFAULT_SAMPLE_SIZE = 5000
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+_INSTRUMENTED_ATTR = '_hometax_metrics'
+
+
+def endpoint_name(url: str, params: Optional[Dict] = None) -> str:
+    """
+    URL(과 별도 쿼리)에서 엔드포인트 이름을 만듭니다.
+    예: 'wqAction.do:ATTABZAA001R08', 'permission.do:UTEABHAA03', 'pubcLogin.do'
+    """
+    parts = urlsplit(str(url))
+    path = parts.path.rsplit('/', 1)[-1] or parts.path or '/'
+    query = {k: v[0] for k, v in parse_qs(parts.query).items() if v}
+    if params:
+        query.update({k: v for k, v in params.items() if v})
+    tag = query.get('actionId') or query.get('screenId')
+    return f"{path}:{tag}" if tag else path
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """최근접 순위 백분위"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q * len(sorted_values))
+    return sorted_values[min(len(sorted_values), max(1, rank)) - 1]
+
+
+class _EndpointStats:
+    __slots__ = ('count', 'errors', 'overloads', 'bytes', 'total_seconds', 'max_seconds', 'samples', 'statuses')
+
+    def __init__(self, sample_size: int):
+        self.count = 0
+        self.errors = 0
+        self.overloads = 0
+        self.bytes = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+        self.statuses: Dict[int, int] = {}
+
+
+class RequestMetrics:
+    """엔드포인트별 요청 지표 (스레드 안전)"""
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _EndpointStats] = {}
+
+    def record(self, endpoint: str, seconds: float, size: int = 0, status: int = 200, overload: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = _EndpointStats(self.sample_size)
+            stats.count += 1
+            stats.bytes += size
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.samples.append(seconds)
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if status >= 400:
+                stats.errors += 1
+            if overload:
+                stats.overloads += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        엔드포인트별 집계 (총 소요 시간이 큰 순서)
+
+        Returns:
+            {엔드포인트: {'count', 'errors', 'overloads', 'bytes', 'total_s', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'statuses'}}
+        """
+        with self._lock:
+            snapshot = [
+                (name, s.count, s.errors, s.overloads, s.bytes, s.total_seconds, s.max_seconds, sorted(s.samples), dict(s.statuses))
+                for name, s in self._stats.items()
+            ]
+
+        result = {}
+        for name, count, errors, overloads, size, total, max_seconds, samples, statuses in sorted(snapshot, key=lambda x: -x[5]):
+            entry = {
+                'count': count,
+                'errors': errors,
+                'overloads': overloads,
+                'bytes': size,
+                'total_s': round(total, 3),
+                'mean_ms': round(total / count * 1000, 1) if count else 0.0,
+            }
+            for q in QUANTILES:
+                entry[f"p{int(q * 100)}_ms"] = round(_percentile(samples, q) * 1000, 1)
+            entry['max_ms'] = round(max_seconds * 1000, 1)
+            entry['statuses'] = statuses
+            result[name] = entry
+        return result
+
+    def prometheus_text(self, prefix: str = 'hometax_request') -> str:
+        """Prometheus 텍스트 형식 (node_exporter textfile collector 등에서 읽을 수 있음)"""
+        lines = [
+            f"# HELP {prefix}_duration_seconds Hometax request latency by endpoint",
+            f"# TYPE {prefix}_duration_seconds summary",
+        ]
+        summary = self.summary()
+        for name, entry in summary.items():
+            label = _label(name)
+            for q in QUANTILES:
+                lines.append(f'{prefix}_duration_seconds{{endpoint="{label}",quantile="{q}"}} {entry[f"p{int(q * 100)}_ms"] / 1000:.6f}')
+            lines.append(f'{prefix}_duration_seconds_sum{{endpoint="{label}"}} {entry["total_s"]:.6f}')
+            lines.append(f'{prefix}_duration_seconds_count{{endpoint="{label}"}} {entry["count"]}')
+
+        for metric, key, help_text in (
+            ('response_bytes_total', 'bytes', 'Response bytes received'),
+            ('errors_total', 'errors', 'Responses with HTTP status >= 400'),
+            ('overload_total', 'overloads', 'Overload-control responses'),
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, entry in summary.items():
+                lines.append(f'{prefix}_{metric}{{endpoint="{_label(name)}"}} {entry[key]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_default_metrics = RequestMetrics()
+
+
+def request_metrics() -> RequestMetrics:
+    """프로세스 공용 요청 지표"""
+    return _default_metrics
+
+
+def instrument_session(session, metrics: Optional[RequestMetrics] = None):
+    """
+    requests.Session에 응답 훅을 달아 모든 호출을 기록합니다. 같은 세션에 여러 번 호출해도 한 번만 답니다.
+
+    지연 시간은 요청 전송부터 응답 본문 수신까지입니다 (response.elapsed + 본문 읽기).
+    stream=True 요청은 본문을 읽지 않고 헤더까지의 시간만 기록합니다.
+    """
+    if not hasattr(session, 'hooks') or getattr(session, _INSTRUMENTED_ATTR, None) is not None:
+        return session
+    metrics = metrics or _default_metrics
+
+    def hook(response, *args, **kwargs):
+        try:
+            if kwargs.get('stream'):
+                seconds, content = response.elapsed.total_seconds(), b''
+            else:
+                started = time.perf_counter()
+                content = response.content
+                seconds = response.elapsed.total_seconds() + (time.perf_counter() - started)
+            metrics.record(
+                endpoint_name(response.request.url if response.request is not None else response.url),
+                seconds,
+                len(content),
+                response.status_code,
+                bool(content) and is_overload_response(content)
+            )
+        except Exception:
+            # 계측 실패가 요청을 깨뜨리지 않도록 함
+            pass
+        return response
+
+    session.hooks.setdefault('response', []).append(hook)
+    setattr(session, _INSTRUMENTED_ATTR, metrics)
+    return session
@@ -0,0 +1,159 @@
+"""
+홈택스 호출 속도 제어 (AIMD)
+인증서/세션별로 호출 속도를 조절합니다. 연속으로 성공하면 속도를 조금씩 올리고(가산 증가),
+과부하제어 응답을 받으면 속도를 절반으로 줄이고 연속 과부하 횟수에 비례해 쉬었다가(승산 감소) 재개합니다.
+고정 sleep 대신 서버가 버티는 가장 높은 속도를 찾아갑니다.
+"""
+
+import time
+import asyncio
+import threading
+from typing import Dict, Optional, Union
+
+# 과부하제어 응답 판별 문자열
+OVERLOAD_MARKERS = ("과부하제어", "60초")
+_OVERLOAD_MARKERS_BYTES = tuple(marker.encode('utf-8') for marker in OVERLOAD_MARKERS)
+
+
+def is_overload_response(body: Union[str, bytes]) -> bool:
+    """응답 본문에 홈택스 과부하제어 안내가 포함되어 있는지 확인"""
+    if isinstance(body, bytes):
+        return any(marker in body for marker in _OVERLOAD_MARKERS_BYTES)
+    return any(marker in body for marker in OVERLOAD_MARKERS)
+
+
+class AimdRateController:
+    """
+    AIMD(가산 증가/승산 감소) 방식의 호출 속도 제어기
+
+    Args:
+        key: 인증서 경로나 세션 식별자 (지표 출력용)
+        initial_rate: 시작 속도 (초당 요청 수)
+        min_rate / max_rate: 속도 하한/상한
+        increase_step: success_window번 연속 성공할 때마다 올리는 속도
+        decrease_factor: 과부하 시 곱하는 비율
+        overload_pause: 과부하 1회당 쉬는 시간(초), 연속 과부하 횟수에 비례하여 늘어남
+        max_pause: 쉬는 시간 상한(초)
+        max_retries: 과부하 시 호출부가 재시도할 최대 횟수
+    """
+
+    def __init__(
+        self,
+        key: str = "default",
+        initial_rate: float = 5.0,
+        min_rate: float = 0.2,
+        max_rate: float = 20.0,
+        increase_step: float = 0.5,
+        decrease_factor: float = 0.5,
+        success_window: int = 10,
+        overload_pause: float = 5.0,
+        max_pause: float = 60.0,
+        max_retries: int = 3
+    ):
+        self.key = key
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.success_window = success_window
+        self.overload_pause = overload_pause
+        self.max_pause = max_pause
+        self.max_retries = max_retries
+
+        self._rate = min(max(initial_rate, min_rate), max_rate)
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+        self._consecutive_success = 0
+        self._consecutive_overload = 0
+        self._total_success = 0
+        self._total_overload = 0
+        # 과부하 없이 success_window만큼 버틴 가장 높은 속도
+        self._best_sustained_rate = 0.0
+
+    @property
+    def current_rate(self) -> float:
+        return self._rate
+
+    def _reserve(self) -> float:
+        """다음 호출 슬롯을 예약하고 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_at)
+            self._next_at = start + 1.0 / self._rate
+            return start - now
+
+    def acquire(self) -> None:
+        """현재 속도에 맞춰 다음 호출 시점까지 대기 (스레드용)"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """현재 속도에 맞춰 다음 호출 시점까지 대기 (asyncio용)"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._total_success += 1
+            self._consecutive_overload = 0
+            self._consecutive_success += 1
+            if self._consecutive_success >= self.success_window:
+                self._consecutive_success = 0
+                self._best_sustained_rate = max(self._best_sustained_rate, self._rate)
+                self._rate = min(self.max_rate, self._rate + self.increase_step)
+
+    def on_overload(self) -> float:
+        """
+        과부하 응답을 기록하고 속도를 낮춥니다.
+
+        Returns:
+            다음 호출까지 쉬는 시간(초)
+        """
+        with self._lock:
+            self._total_overload += 1
+            self._consecutive_success = 0
+            self._consecutive_overload += 1
+            self._rate = max(self.min_rate, self._rate * self.decrease_factor)
+
+            pause = min(self.max_pause, self.overload_pause * self._consecutive_overload)
+            self._next_at = max(self._next_at, time.monotonic() + pause)
+            return pause
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                'key': self.key,
+                'current_rate': round(self._rate, 3),
+                'best_sustained_rate': round(self._best_sustained_rate, 3),
+                'total_success': self._total_success,
+                'total_overload': self._total_overload,
+                'consecutive_overload': self._consecutive_overload,
+            }
+
+
+_controllers: Dict[str, AimdRateController] = {}
+_controllers_lock = threading.Lock()
+
+
+def get_rate_controller(key: Optional[str] = None, **kwargs) -> AimdRateController:
+    """
+    인증서/세션 키별 속도 제어기 반환 (없으면 생성)
+
+    같은 키는 프로세스 안에서 하나의 제어기를 공유하므로 호출 지점이 달라도 같은 속도를 따릅니다.
+    """
+    key = key or "default"
+    with _controllers_lock:
+        controller = _controllers.get(key)
+        if controller is None:
+            controller = AimdRateController(key=key, **kwargs)
+            _controllers[key] = controller
+        return controller
+
+
+def rate_controller_metrics() -> Dict[str, Dict]:
+    """모든 속도 제어기의 현재 지표"""
+    with _controllers_lock:
+        controllers = list(_controllers.values())
+    return {controller.key: controller.metrics() for controller in controllers}
@@ -1 +1,17 @@
-from .report_collector import HometaxTaxReportCollector
+# 수집기는 처음 사용할 때 import (동기 수집기만 쓰는 스크립트가 httpx를 불러오지 않도록)
+_EXPORTS = {
+    'HometaxTaxReportCollector': 'report_collector',
+    'AsyncHometaxTaxReportCollector': 'async_collector',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value
+    return value
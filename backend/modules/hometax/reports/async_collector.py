@@ -0,0 +1,135 @@
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple, Union
+
+import requests
+
+from .constants import HOMETAX_WQ_ACTION_URL, TAX_MAP
+from .report_collector import HometaxTaxReportCollector
+from ..rate_control import AimdRateController, is_overload_response
+from ..metrics import endpoint_name, request_metrics
+
+# (tax_name, biz_no, start_date, end_date) 또는 같은 키를 가진 딕셔너리
+ReportTask = Union[Tuple[str, str, str, str], Dict[str, str]]
+
+
+class AsyncHometaxTaxReportCollector(HometaxTaxReportCollector):
+    """
+    asyncio/httpx 기반 홈택스 세목별 신고현황 수집기
+
+    요청 구성(_build_request)과 응답 해석(_parse_response, _extract_rows)은 동기 수집기와 공유하고,
+    전송만 httpx.AsyncClient로 바꿔 한 세션에서 최대 max_in_flight개의 wqAction.do 요청을 동시에 보냅니다.
+    쿠키 저장소는 requests.Session의 것을 그대로 공유하므로 로그인 세션을 그대로 사용할 수 있습니다.
+
+    사용 예:
+        async with AsyncHometaxTaxReportCollector(session=session, pubc_user_no=no, max_in_flight=4) as collector:
+            async for result in collector.collect_many(tasks):
+                ...
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        cookies: Optional[Dict[str, str]] = None,
+        pubc_user_no: str = "",
+        txaa_adm_no: Optional[str] = None,
+        max_in_flight: int = 4,
+        timeout: float = 30,
+        rate_controller: Optional[AimdRateController] = None
+    ):
+        super().__init__(session=session, cookies=cookies, pubc_user_no=pubc_user_no, txaa_adm_no=txaa_adm_no, rate_controller=rate_controller)
+
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("AsyncHometaxTaxReportCollector에는 httpx가 필요합니다 (pip install httpx)") from e
+
+        self.max_in_flight = max(1, max_in_flight)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        # httpx.Cookies는 CookieJar를 받으면 복사하지 않고 같은 jar를 사용
+        self.client = httpx.AsyncClient(
+            cookies=self.session.cookies,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight)
+        )
+
+    async def collect_monthly_report_async(self, tax_name: str, biz_no: str, start_date: str, end_date: str) -> Dict:
+        """collect_monthly_report의 비동기 버전"""
+        try:
+            request = self._build_request(tax_name, biz_no, start_date, end_date)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+
+        for attempt in range(self.rate_controller.max_retries + 1):
+            # 슬롯을 얻은 뒤에 속도 예약: 대기 중인 작업이 시작 속도로 미리 예약해 두면 감속이 늦게 반영됨
+            async with self._semaphore:
+                await self.rate_controller.acquire_async()
+                started = time.perf_counter()
+                try:
+                    response = await self.client.post(
+                        HOMETAX_WQ_ACTION_URL,
+                        params=request["params"],
+                        content=request["data"],
+                        headers=request["headers"]
+                    )
+                except Exception as e:
+                    return {"status": "error", "message": str(e), "raw_text": "No response"}
+                request_metrics().record(
+                    endpoint_name(HOMETAX_WQ_ACTION_URL, request["params"]),
+                    time.perf_counter() - started,
+                    len(response.content),
+                    response.status_code,
+                    is_overload_response(response.content)
+                )
+
+            if self._record_rate(response.status_code, response.content):
+                return self._parse_response(response.status_code, response.content, request.get("schema_key"))
+
+        return {"status": "error", "message": "과부하 제어: 최대 재시도 횟수 초과"}
+
+    async def collect_client_all_taxes_async(
+        self,
+        biz_no: str,
+        start_date: str,
+        end_date: str,
+        taxes: Optional[Iterable[str]] = None
+    ) -> Dict:
+        """collect_client_all_taxes의 비동기 버전 (세목별 요청을 최대 max_in_flight개씩 동시에 전송)"""
+        taxes = list(taxes) if taxes is not None else list(TAX_MAP)
+        responses = await asyncio.gather(
+            *(self.collect_monthly_report_async(tax_name, biz_no, start_date, end_date) for tax_name in taxes)
+        )
+        return self._combine_results(biz_no, start_date, end_date, taxes, dict(zip(taxes, responses)))
+
+    async def collect_many(self, tasks: Iterable[ReportTask]) -> AsyncIterator[Dict]:
+        """
+        여러 (세목, 사업자, 기간) 조회를 동시에 실행하고 끝나는 순서대로 결과를 내보냅니다.
+
+        각 결과에는 tax_name, biz_no, start_date, end_date가 함께 담깁니다.
+        """
+        async def run(task: ReportTask) -> Dict:
+            if isinstance(task, dict):
+                tax_name, biz_no = task["tax_name"], task["biz_no"]
+                start_date, end_date = task["start_date"], task["end_date"]
+            else:
+                tax_name, biz_no, start_date, end_date = task
+            result = await self.collect_monthly_report_async(tax_name, biz_no, start_date, end_date)
+            result.update({"tax_name": tax_name, "biz_no": biz_no, "start_date": start_date, "end_date": end_date})
+            return result
+
+        pending = [asyncio.ensure_future(run(task)) for task in tasks]
+        try:
+            for next_done in asyncio.as_completed(pending):
+                yield await next_done
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
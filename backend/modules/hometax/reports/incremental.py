@@ -0,0 +1,241 @@
+"""
+증분 수집 (high-water mark)
+(사업자, 세목)별로 이미 조회한 과세연월 구간을 기록해 두고, 다음 실행에서는
+아직 조회하지 않은 월과 신고/수정이 아직 바뀔 수 있는 최근 몇 개월만 홈택스에 다시 묻습니다.
+조회 결과는 행의 과세연월 기준으로 기존 DATA_{사업자}_{세목}_{YYYYMM}.json 월별 파일에 병합합니다.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+DEFAULT_WATERMARK_DB = Path('data') / 'collection-watermarks.sqlite3'
+
+# 신고/수정신고로 아직 바뀔 수 있어 매번 다시 조회하는 최근 개월 수
+DEFAULT_MUTABLE_MONTHS = 2
+
+# 응답 행에서 과세연월을 찾는 필드 (앞쪽 우선)
+MONTH_FIELDS = ('txnrmYm', 'pymnYm', 'rtnYm', 'sbmsYm')
+
+# 전체 기간 결과 파일: DATA_{사업자}_{세목}_{YYYYMMDD}_{YYYYMMDD}.json
+_RANGE_FILE_RE = re.compile(r'^DATA_(?P<biz_no>[^_]+)_(?P<tax_name>.+)_(?P<start>\d{8})_(?P<end>\d{8})\.json$')
+
+
+def ym_add(ym: str, months: int) -> str:
+    """YYYYMM에 개월 수를 더합니다."""
+    index = int(ym[:4]) * 12 + int(ym[4:6]) - 1 + months
+    return f"{index // 12:04d}{index % 12 + 1:02d}"
+
+
+def month_count(start_ym: str, end_ym: str) -> int:
+    """start_ym ~ end_ym 구간의 개월 수 (양 끝 포함)"""
+    return (int(end_ym[:4]) - int(start_ym[:4])) * 12 + int(end_ym[4:6]) - int(start_ym[4:6]) + 1
+
+
+def ym_range_to_dates(start_ym: str, end_ym: str) -> Tuple[str, str]:
+    """(YYYYMM, YYYYMM) 구간을 조회용 (YYYYMMDD, YYYYMMDD)로 변환"""
+    import calendar
+    last_day = calendar.monthrange(int(end_ym[:4]), int(end_ym[4:6]))[1]
+    return f"{start_ym}01", f"{end_ym}{last_day:02d}"
+
+
+def plan_ranges(
+    coverage: Optional[Tuple[str, str]],
+    window_start: str,
+    window_end: str,
+    mutable_months: int = DEFAULT_MUTABLE_MONTHS
+) -> List[Tuple[str, str]]:
+    """
+    이미 조회한 구간(coverage)을 보고 window 안에서 다시 조회할 (시작월, 종료월) 구간 목록을 만듭니다.
+
+    - 기록이 없거나 window와 겹치지 않으면 window 전체
+    - window 앞쪽이 비어 있으면 그 앞부분
+    - 마지막 조회월 이후 월과, window 끝에서 mutable_months개월은 다시 조회
+    """
+    if coverage is None:
+        return [(window_start, window_end)]
+
+    covered_from, covered_through = coverage
+    if covered_through < ym_add(window_start, -1) or covered_from > ym_add(window_end, 1):
+        return [(window_start, window_end)]
+
+    ranges = []
+    if covered_from > window_start:
+        ranges.append((window_start, ym_add(covered_from, -1)))
+
+    tail_start = min(ym_add(covered_through, 1), ym_add(window_end, 1 - mutable_months))
+    tail_start = max(tail_start, window_start)
+    if tail_start <= window_end:
+        if ranges and ym_add(ranges[-1][1], 1) >= tail_start:
+            ranges[-1] = (ranges[-1][0], window_end)
+        else:
+            ranges.append((tail_start, window_end))
+    return ranges
+
+
+def row_month(row: Dict, month_field: Optional[str] = None) -> Optional[str]:
+    """
+    응답 행의 과세연월(YYYYMM). 연월 필드가 없으면 None
+    month_field를 알면(row_schema 캐시) 그 필드만 읽고, 비어 있을 때만 전체 필드를 확인합니다.
+    """
+    if month_field is not None:
+        value = row.get(month_field)
+        if value:
+            value = str(value)
+            return value if len(value) == 6 else None
+    for field in MONTH_FIELDS:
+        value = row.get(field)
+        if value:
+            value = str(value)
+            return value if len(value) == 6 else None
+    return None
+
+
+def index_rows_by_month(rows: List[Dict], month_field: Optional[str] = None) -> Dict[str, List[int]]:
+    """
+    응답 행 번호를 과세연월(YYYYMM)별로 묶습니다. 연월 필드가 없는 행은 제외
+    행 번호만 담아 결과 딕셔너리("monthly_index")에 넣어 JSON으로 저장해도 행이 중복되지 않습니다.
+    """
+    index: Dict[str, List[int]] = {}
+    for position, row in enumerate(rows):
+        tax_month = row_month(row, month_field)
+        if tax_month:
+            index.setdefault(tax_month, []).append(position)
+    return index
+
+
+def group_rows_by_month(
+    rows: List[Dict],
+    month_field: Optional[str] = None,
+    index: Optional[Dict[str, List[int]]] = None
+) -> Dict[str, List[Dict]]:
+    """응답 행을 과세연월(YYYYMM)별로 묶습니다. 추출 때 만든 index가 있으면 행을 다시 훑지 않습니다."""
+    if index is None:
+        index = index_rows_by_month(rows, month_field)
+    return {month: [rows[position] for position in positions] for month, positions in index.items()}
+
+
+def merge_monthly_results(
+    tax_dir: Union[str, Path],
+    biz_no: str,
+    tax_name: str,
+    res: Dict
+) -> Dict[str, int]:
+    """
+    조회 결과를 행의 과세연월별 월별 파일에 병합합니다.
+
+    조회 기간은 신고일 기준이라 행의 과세연월은 조회 기간보다 앞설 수 있으므로, 응답에 있는 모든 월을
+    기록합니다. 같은 월의 행이 다른 조회 기간에서 올 수 있어 기존 파일의 행은 유지하고 새 행만 더하며,
+    이번 응답에 없는 월의 파일은 건드리지 않습니다.
+
+    Returns:
+        {YYYYMM: 저장한 행 수}
+    """
+    tax_dir = Path(tax_dir)
+    tax_dir.mkdir(parents=True, exist_ok=True)
+    monthly = group_rows_by_month(res.get("data", []), res.get("month_field"), res.get("monthly_index"))
+
+    written = {}
+    for month, rows in sorted(monthly.items()):
+        path = tax_dir / f"DATA_{biz_no}_{tax_name}_{month}.json"
+        merged = _read_month_rows(path)
+        seen = {_row_key(row) for row in merged}
+        for row in rows:
+            key = _row_key(row)
+            if key not in seen:
+                seen.add(key)
+                merged.append(row)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"status": "success", "count": len(merged), "data": merged, "raw": res.get("raw", {})},
+                      f, ensure_ascii=False, indent=2)
+        written[month] = len(merged)
+    return written
+
+
+def _read_month_rows(path: Path) -> List[Dict]:
+    """기존 월별 파일의 행 (없거나 읽을 수 없으면 빈 목록)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f).get("data")
+    except (OSError, ValueError, AttributeError):
+        return []
+    return rows if isinstance(rows, list) else []
+
+
+def _row_key(row: Dict) -> str:
+    return json.dumps(row, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+
+class WatermarkStore:
+    """(사업자, 세목)별 조회 완료 구간 저장소 (SQLite, 스레드 안전)"""
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_WATERMARK_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS watermarks ('
+            ' biz_no TEXT NOT NULL, tax_name TEXT NOT NULL,'
+            ' covered_from TEXT NOT NULL, covered_through TEXT NOT NULL, updated_at REAL NOT NULL,'
+            ' PRIMARY KEY (biz_no, tax_name))'
+        )
+        self._conn.commit()
+
+    def get(self, biz_no: str, tax_name: str) -> Optional[Tuple[str, str]]:
+        """(covered_from, covered_through) 또는 None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT covered_from, covered_through FROM watermarks WHERE biz_no = ? AND tax_name = ?',
+                (biz_no, tax_name)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def record(self, biz_no: str, tax_name: str, start_ym: str, end_ym: str) -> Tuple[str, str]:
+        """조회에 성공한 구간을 반영합니다. 기존 구간과 겹치거나 맞닿으면 합치고, 떨어져 있으면 새 구간으로 교체"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                'SELECT covered_from, covered_through FROM watermarks WHERE biz_no = ? AND tax_name = ?',
+                (biz_no, tax_name)
+            ).fetchone()
+            covered = (start_ym, end_ym)
+            if row and ym_add(row[1], 1) >= start_ym and ym_add(end_ym, 1) >= row[0]:
+                covered = (min(row[0], start_ym), max(row[1], end_ym))
+            self._conn.execute(
+                'INSERT OR REPLACE INTO watermarks (biz_no, tax_name, covered_from, covered_through, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (biz_no, tax_name, covered[0], covered[1], time.time())
+            )
+            return covered
+
+    def seed_from_files(self, tax_dir: Union[str, Path]) -> int:
+        """
+        기존 전체 기간 결과 파일(DATA_{사업자}_{세목}_{시작일}_{종료일}.json)에서 조회 구간을 읽어 반영합니다.
+        증분 모드를 처음 켤 때 이미 받아 둔 기간을 다시 조회하지 않기 위함이며, 기록이 이미 있는 (사업자, 세목)은 건드리지 않습니다.
+
+        Returns:
+            반영한 파일 수
+        """
+        found: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        for path in Path(tax_dir).glob('DATA_*_*_*_*.json'):
+            match = _RANGE_FILE_RE.match(path.name)
+            if match:
+                found.setdefault((match['biz_no'], match['tax_name']), []).append((match['start'][:6], match['end'][:6]))
+
+        count = 0
+        for (biz_no, tax_name), ranges in found.items():
+            if self.get(biz_no, tax_name) is not None:
+                continue
+            for start_ym, end_ym in sorted(ranges):
+                self.record(biz_no, tax_name, start_ym, end_ym)
+                count += 1
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
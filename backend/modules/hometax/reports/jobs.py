@@ -0,0 +1,180 @@
+"""
+이어받기 가능한 수집 작업 저장소 (SQLite)
+수집 작업을 (인증서, 사업자, 세목, 기간) 단위로 쪼개 pending/done/failed 상태로 기록하고,
+단위 하나가 끝날 때마다 바로 체크포인트합니다. 중간에 멈춰도 다시 실행하면 남은 단위만 조회하고,
+실패한 단위만 골라서 재실행할 수 있습니다.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+DEFAULT_JOB_DB = Path('data') / 'collection-jobs.sqlite3'
+
+STATUS_PENDING = 'pending'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    job_id TEXT NOT NULL,
+    unit_key TEXT NOT NULL,
+    cert_path TEXT NOT NULL,
+    biz_no TEXT NOT NULL,
+    biz_name TEXT,
+    tax_name TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result_count INTEGER,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_id, unit_key)
+);
+CREATE INDEX IF NOT EXISTS idx_units_status ON units (job_id, status, cert_path);
+"""
+
+
+def make_unit_key(biz_no: str, tax_name: str, start_date: str, end_date: str) -> str:
+    """작업 단위 식별자 (같은 작업 안에서 사업자/세목/기간이 같으면 같은 단위)"""
+    return f"{biz_no}|{tax_name}|{start_date}|{end_date}"
+
+
+class CollectionJobStore:
+    """
+    수집 작업 단위의 상태를 SQLite에 기록합니다 (스레드 안전).
+
+    사용 예:
+        store = CollectionJobStore()
+        store.create_job(job_id, params)
+        store.enqueue(job_id, units)            # 이미 있는 단위는 건너뜀 (이어받기)
+        for unit in store.pending(job_id, cert_path=path):
+            ...
+            store.mark_done(job_id, unit['unit_key'], count)
+    """
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_JOB_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def create_job(self, job_id: str, params: Optional[Dict] = None) -> bool:
+        """작업 등록. 새로 만들었으면 True, 이미 있으면(이어받기) False"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'INSERT OR IGNORE INTO jobs (job_id, params, created_at) VALUES (?, ?, ?)',
+                (job_id, json.dumps(params or {}, ensure_ascii=False), time.time())
+            )
+            return cursor.rowcount == 1
+
+    def delete_job(self, job_id: str) -> None:
+        """작업과 모든 단위 기록 삭제 (처음부터 다시 수집할 때)"""
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM units WHERE job_id = ?', (job_id,))
+            self._conn.execute('DELETE FROM jobs WHERE job_id = ?', (job_id,))
+
+    def enqueue(self, job_id: str, units: Iterable[Dict]) -> int:
+        """
+        작업 단위 추가. 이미 기록된 단위(완료/실패 포함)는 그대로 둡니다.
+
+        Args:
+            units: cert_path, biz_no, tax_name, start_date, end_date (선택: biz_name)를 가진 딕셔너리
+
+        Returns:
+            새로 추가된 단위 수
+        """
+        now = time.time()
+        rows = [
+            (
+                job_id,
+                make_unit_key(u['biz_no'], u['tax_name'], u['start_date'], u['end_date']),
+                u['cert_path'], u['biz_no'], u.get('biz_name'), u['tax_name'],
+                u['start_date'], u['end_date'], now
+            )
+            for u in units
+        ]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO units '
+                '(job_id, unit_key, cert_path, biz_no, biz_name, tax_name, start_date, end_date, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            return self._conn.total_changes - before
+
+    def pending(self, job_id: str, cert_path: Optional[str] = None, include_failed: bool = False) -> List[Dict]:
+        """아직 끝나지 않은 단위 목록 (등록 순서대로)"""
+        statuses = (STATUS_PENDING, STATUS_FAILED) if include_failed else (STATUS_PENDING,)
+        query = f"SELECT * FROM units WHERE job_id = ? AND status IN ({','.join('?' * len(statuses))})"
+        args: list = [job_id, *statuses]
+        if cert_path is not None:
+            query += ' AND cert_path = ?'
+            args.append(cert_path)
+        query += ' ORDER BY rowid'
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(query, args)]
+
+    def mark_done(self, job_id: str, unit_key: str, result_count: int = 0) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE units SET status = ?, attempts = attempts + 1, result_count = ?, error = NULL, updated_at = ? '
+                'WHERE job_id = ? AND unit_key = ?',
+                (STATUS_DONE, result_count, time.time(), job_id, unit_key)
+            )
+
+    def mark_failed(self, job_id: str, unit_key: str, error: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                'UPDATE units SET status = ?, attempts = attempts + 1, error = ?, updated_at = ? '
+                'WHERE job_id = ? AND unit_key = ?',
+                (STATUS_FAILED, error, time.time(), job_id, unit_key)
+            )
+
+    def reset_failed(self, job_id: str, tax_name: Optional[str] = None) -> int:
+        """실패한 단위를 다시 pending으로 돌립니다 (세목 지정 가능). 돌린 단위 수 반환"""
+        query = 'UPDATE units SET status = ?, updated_at = ? WHERE job_id = ? AND status = ?'
+        args: list = [STATUS_PENDING, time.time(), job_id, STATUS_FAILED]
+        if tax_name:
+            query += ' AND tax_name = ?'
+            args.append(tax_name)
+        with self._lock, self._conn:
+            return self._conn.execute(query, args).rowcount
+
+    def failures(self, job_id: str) -> List[Dict]:
+        with self._lock:
+            return [
+                dict(row) for row in self._conn.execute(
+                    'SELECT * FROM units WHERE job_id = ? AND status = ? ORDER BY rowid', (job_id, STATUS_FAILED)
+                )
+            ]
+
+    def summary(self, job_id: str) -> Dict[str, int]:
+        """상태별 단위 수"""
+        counts = {STATUS_PENDING: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        with self._lock:
+            for row in self._conn.execute(
+                'SELECT status, COUNT(*) AS n FROM units WHERE job_id = ? GROUP BY status', (job_id,)
+            ):
+                counts[row['status']] = row['n']
+        counts['total'] = sum(counts.values())
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
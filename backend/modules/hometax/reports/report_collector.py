@@ -1,127 +1,258 @@
-import json
-import random
 import requests
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from .constants import HOMETAX_WQ_ACTION_URL, DEFAULT_ACTION_ID, DEFAULT_SCREEN_ID, TAX_MAP
+from ..rate_control import AimdRateController, get_rate_controller, is_overload_response
+from ..logger import get_logger, LazyCookies
+from ..metrics import instrument_session
+from ..transport import create_session
+from ..request_template import RequestTemplate, make_nts
+from ..json_codec import loads
+from .row_schema import SchemaKey, extract_rows, extract_rows_by_month, schema_key
+
+log = get_logger(__name__)
 
 class HometaxTaxReportCollector:
     """
     홈택스 세목별 신고현황 데이터를 수집하는 모듈
     """
 
-    def __init__(self, session: Optional[requests.Session] = None, cookies: Optional[Dict[str, str]] = None, pubc_user_no: str = "", txaa_adm_no: Optional[str] = None):
+    def __init__(self, session: Optional[requests.Session] = None, cookies: Optional[Dict[str, str]] = None, pubc_user_no: str = "", txaa_adm_no: Optional[str] = None, rate_controller: Optional[AimdRateController] = None):
         if session:
             self.session = session
         else:
-            self.session = requests.Session()
+            self.session = create_session()
             if cookies:
                 self.session.cookies.update(cookies)
+        # wqAction.do 호출을 actionId별로 계측
+        instrument_session(self.session)
         
         self.pubc_user_no = pubc_user_no
         self.txaa_adm_no = txaa_adm_no
+        # 호출 속도 제어 (지정하지 않으면 사용자 번호별 공유 제어기)
+        self.rate_controller = rate_controller or get_rate_controller(pubc_user_no or None)
         self.headers = {
             "Content-Type": "application/json; charset=UTF-8",
             "Accept": "application/json",
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
+        # (actionId, screenId, 세목)별 요청 템플릿 (고정 필드/헤더를 한 번만 구성)
+        self._templates: Dict[tuple, RequestTemplate] = {}
 
     def _generate_nts_token(self) -> str:
         """홈택스 전용 nts 보안 토큰 생성"""
-        sec = random.randrange(30, 60)
-        return f"{sec}lpNhzq7ZwSaVt9TU2s8mHzIzLjmDpVKVgvmLBNswI{sec - 11}"
+        return make_nts()
 
-    def collect_monthly_report(self, tax_name: str, biz_no: str, start_date: str, end_date: str) -> Dict:
+    def _build_request(self, tax_name: str, biz_no: str, start_date: str, end_date: str) -> Dict:
         """
-        특정 세목, 특정 기간에 대한 신고 데이터를 조회합니다.
+        wqAction.do 요청 구성 (동기/비동기 수집기 공용)
+        세목별 템플릿에 사업자번호/기간/nts만 채웁니다.
+
+        Returns:
+            {'params': Dict, 'headers': Dict, 'data': bytes, 'schema_key': (actionId, 세목 코드)}
+
+        Raises:
+            ValueError: 알 수 없는 세목
+        """
+        template = self._request_template(tax_name)
+        data = template.render(
+            {"rtnDtEnd": end_date, "rtnDtSrt": start_date, "txprRgtNo": biz_no},
+            self._generate_nts_token()
+        )
+        return {
+            "params": template.params,
+            "headers": template.headers,
+            "data": data,
+            "schema_key": schema_key(template.params["actionId"], TAX_MAP[tax_name]["itrf_cd"])
+        }
+
+    def _request_template(
+        self,
+        tax_name: str,
+        action_id: str = DEFAULT_ACTION_ID,
+        screen_id: str = DEFAULT_SCREEN_ID
+    ) -> RequestTemplate:
+        """
+        (actionId, screenId, 세목)별 요청 템플릿: 조회마다 바뀌지 않는 쿼리/헤더(Referer 포함)/본문을 한 번만 구성
+        본문의 기간(rtnDtSrt/rtnDtEnd)과 사업자번호(txprRgtNo)는 _build_request에서 채웁니다.
+
+        Raises:
+            ValueError: 알 수 없는 세목
         """
+        key = (action_id, screen_id, tax_name)
+        template = self._templates.get(key)
+        if template is not None:
+            return template
+
         tax_info = TAX_MAP.get(tax_name)
         if not tax_info:
-            return {"status": "error", "message": f"Unknown tax type: {tax_name}"}
+            raise ValueError(f"Unknown tax type: {tax_name}")
 
-        itrf_cd = tax_info["itrf_cd"]
-        menu_code = tax_info["menu_code"]
-        
-        nts = self._generate_nts_token()
-        
         params = {
-            "actionId": DEFAULT_ACTION_ID,
-            "screenId": DEFAULT_SCREEN_ID,
+            "actionId": action_id,
+            "screenId": screen_id,
             "popupYn": "true",
-            "realScreenId": DEFAULT_SCREEN_ID
+            "realScreenId": screen_id
         }
-        
+
         body = {
             "befCallYn": "",
             "dprtUserId": "",
-            "itrfCd": itrf_cd,
+            "itrfCd": tax_info["itrf_cd"],
             "ntplInfpYn": "Y",
             "pubcUserNo": self.pubc_user_no,
-            "rtnDtEnd": end_date,
-            "rtnDtSrt": start_date,
-            "scrnId": DEFAULT_SCREEN_ID,
-            "txprRgtNo": biz_no,
+            "rtnDtEnd": "",
+            "rtnDtSrt": "",
+            "scrnId": screen_id,
+            "txprRgtNo": "",
             "pageInfoVO": {"pageNum": "1"}
         }
-        
+
         # 세무대리 관리번호가 있으면 추가
         if self.txaa_adm_no:
             body["txaaAdmNo"] = self.txaa_adm_no
-        
-        json_body = json.dumps(body, ensure_ascii=False)
-        payload = f"{json_body}{nts}"
-        
+
         # Referer 설정 (홈택스 검증용)
         headers = self.headers.copy()
-        headers["Referer"] = f"https://hometax.go.kr/websquare/websquare.html?w2xPath=/ui/pp/index_pp.xml&tmIdx=04&tm2lIdx=0405000000&tm3lIdx={menu_code}"
-        
-        # [DEBUG]
-        import sys
-        print(f"[DEBUG Collector] Requesting {tax_name} for {biz_no}", file=sys.stderr)
-        print(f"[DEBUG Collector] Cookie Keys: {list(self.session.cookies.get_dict().keys())}", file=sys.stderr)
-        if "TXPPsessionID" in self.session.cookies:
-             print(f"[DEBUG Collector] TXPPsessionID: {self.session.cookies['TXPPsessionID'][:20]}...", file=sys.stderr)
+        headers["Referer"] = f"https://hometax.go.kr/websquare/websquare.html?w2xPath=/ui/pp/index_pp.xml&tmIdx=04&tm2lIdx=0405000000&tm3lIdx={tax_info['menu_code']}"
+
+        template = RequestTemplate(HOMETAX_WQ_ACTION_URL, params, headers, body, fields=("rtnDtEnd", "rtnDtSrt", "txprRgtNo"))
+        self._templates[key] = template
+        return template
+
+    def _parse_response(self, status_code: int, content: bytes, schema: Optional[SchemaKey] = None) -> Dict:
+        """
+        wqAction.do 응답을 결과 딕셔너리로 변환 (동기/비동기 수집기 공용)
+        schema(_build_request의 schema_key)를 주면 캐시된 행 목록 키/과세연월 필드를 사용합니다.
+        """
+        if status_code != 200:
+            return {"status": "error", "message": f"HTTP {status_code}"}
 
         try:
-            response = self.session.post(
-                HOMETAX_WQ_ACTION_URL,
-                params=params,
-                data=payload.encode('utf-8'),
-                headers=headers,
-                timeout=30
-            )
-            
-            if response.status_code != 200:
-                return {"status": "error", "message": f"HTTP {response.status_code}"}
-            
-            result = response.json()
-            rows = self._extract_rows(result)
-            
-            return {
-                "status": "success",
-                "count": len(rows),
-                "data": rows,
-                "raw": result
-            }
+            result = loads(content)
         except Exception as e:
             return {
                 "status": "error", 
                 "message": f"JSON 파싱 실패: {str(e)}", 
-                "raw_text": response.text[:2000] if 'response' in locals() else "No response"
+                "raw_text": content[:2000].decode('utf-8', errors='replace')
             }
 
-    def _extract_rows(self, result_data: Dict) -> List:
-        """JSON 응답에서 실제 데이터 리스트 추출"""
-        rows = []
-        # 패턴 1: dlt... 로 시작하는 리스트 키 찾기
-        for key, value in result_data.items():
-            if isinstance(value, list) and key.startswith("dlt"):
-                rows = value
-                break
+        rows, month_field, monthly_index = extract_rows_by_month(result, schema)
+        return {
+            "status": "success",
+            "count": len(rows),
+            "data": rows,
+            "month_field": month_field,
+            "monthly_index": monthly_index,
+            "raw": result
+        }
+
+    def collect_monthly_report(self, tax_name: str, biz_no: str, start_date: str, end_date: str) -> Dict:
+        """
+        특정 세목, 특정 기간에 대한 신고 데이터를 조회합니다.
+        """
+        try:
+            request = self._build_request(tax_name, biz_no, start_date, end_date)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
         
-        # 패턴 2: 딕셔너리 리스트가 담긴 첫 번째 키 찾기 (범용)
-        if not rows:
-            for key, value in result_data.items():
-                if isinstance(value, list) and len(value) > 0 and isinstance(value[0], dict):
-                    rows = value
-                    break
-        return rows
+        log.debug('신고현황 조회 요청', tax=tax_name, biz_no=biz_no, start=start_date, end=end_date,
+                  cookies=LazyCookies(self.session.cookies))
+        return self._send(request)
+
+    def collect_client_all_taxes(
+        self,
+        biz_no: str,
+        start_date: str,
+        end_date: str,
+        taxes: Optional[Iterable[str]] = None
+    ) -> Dict:
+        """
+        한 거래처의 여러 세목을 같은 세션(유지된 연결)으로 연달아 조회하여 하나의 결과로 묶습니다.
+        세목별 요청은 템플릿에서 미리 만들어 두고 전송만 이어서 합니다.
+
+        Args:
+            taxes: 조회할 세목 (기본: TAX_MAP 전체 8개)
+
+        Returns:
+            {
+                'status': 'success' | 'partial' | 'error',
+                'biz_no', 'start_date', 'end_date',
+                'count': 전체 행 수,
+                'results': {세목: collect_monthly_report와 같은 형식의 결과},
+                'failed': [실패한 세목]
+            }
+        """
+        taxes = list(taxes) if taxes is not None else list(TAX_MAP)
+        requests_by_tax = {}
+        results: Dict[str, Dict] = {}
+        for tax_name in taxes:
+            try:
+                requests_by_tax[tax_name] = self._build_request(tax_name, biz_no, start_date, end_date)
+            except ValueError as e:
+                results[tax_name] = {"status": "error", "message": str(e)}
+
+        log.debug('거래처 전체 세목 조회', biz_no=biz_no, start=start_date, end=end_date, taxes=len(requests_by_tax))
+        for tax_name, request in requests_by_tax.items():
+            results[tax_name] = self._send(request)
+
+        return self._combine_results(biz_no, start_date, end_date, taxes, results)
+
+    @staticmethod
+    def _combine_results(biz_no: str, start_date: str, end_date: str, taxes: List[str], results: Dict[str, Dict]) -> Dict:
+        """세목별 결과를 거래처 단위 결과로 묶습니다 (동기/비동기 수집기 공용)"""
+        ordered = {tax_name: results[tax_name] for tax_name in taxes}
+        failed = [tax_name for tax_name, res in ordered.items() if res.get("status") != "success"]
+        if not failed:
+            status = "success"
+        elif len(failed) < len(ordered):
+            status = "partial"
+        else:
+            status = "error"
+        return {
+            "status": status,
+            "biz_no": biz_no,
+            "start_date": start_date,
+            "end_date": end_date,
+            "count": sum(res.get("count", 0) for res in ordered.values() if res.get("status") == "success"),
+            "results": ordered,
+            "failed": failed
+        }
+
+    def _send(self, request: Dict) -> Dict:
+        """구성된 요청 전송 (과부하 시 속도 제어기에 따라 재시도)"""
+        for attempt in range(self.rate_controller.max_retries + 1):
+            self.rate_controller.acquire()
+            try:
+                response = self.session.post(
+                    HOMETAX_WQ_ACTION_URL,
+                    params=request["params"],
+                    data=request["data"],
+                    headers=request["headers"],
+                    timeout=30
+                )
+            except Exception as e:
+                return {"status": "error", "message": str(e), "raw_text": "No response"}
+
+            if self._record_rate(response.status_code, response.content):
+                return self._parse_response(response.status_code, response.content, request.get("schema_key"))
+
+        return {"status": "error", "message": "과부하 제어: 최대 재시도 횟수 초과"}
+
+    def _record_rate(self, status_code: int, content: bytes) -> bool:
+        """
+        응답 결과를 속도 제어기에 반영합니다.
+
+        Returns:
+            과부하 응답이면 False (재시도 필요), 그 외에는 True
+        """
+        if is_overload_response(content):
+            pause = self.rate_controller.on_overload()
+            log.warning('과부하 제어 감지, 재시도', pause=f"{pause:.0f}s", rate=f"{self.rate_controller.current_rate:.2f}/s")
+            return False
+        if status_code == 200:
+            self.rate_controller.on_success()
+        return True
+
+    def _extract_rows(self, result_data: Dict, schema: Optional[SchemaKey] = None) -> List:
+        """JSON 응답에서 실제 데이터 리스트 추출 (row_schema 캐시 사용)"""
+        return extract_rows(result_data, schema)[0]
@@ -0,0 +1,402 @@
+"""
+세목별 신고현황 결과 저장소 (SQLite)
+(사업자, 세목, 기간)마다 JSON 파일을 여러 개 쓰는 대신, 조회 1건은 queries에, 응답 행은 report_rows에
+정규화하여 저장합니다. 원본 응답은 zlib으로 압축해 내용 해시 기준으로 한 번만 저장합니다.
+
+분석용 요약(coverage: 사업자×세목별 조회 결과, clients: 거래처별 수임 상태)은 저장 시점에 함께 갱신하므로
+분석 스크립트는 수집 폴더를 다시 읽지 않고 successes()/failures()/coverage_matrix() 등으로 바로 조회합니다.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
+
+from .incremental import index_rows_by_month
+
+DEFAULT_RESULT_DB = Path('data') / 'report-results.sqlite3'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    size INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS queries (
+    id INTEGER PRIMARY KEY,
+    biz_no TEXT NOT NULL,
+    tax_name TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    cert_path TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    response_id INTEGER REFERENCES responses(id),
+    collected_at REAL NOT NULL,
+    UNIQUE (biz_no, tax_name, start_date, end_date)
+);
+CREATE TABLE IF NOT EXISTS failed_attempts (
+    id INTEGER PRIMARY KEY,
+    query_id INTEGER NOT NULL REFERENCES queries(id) ON DELETE CASCADE,
+    status TEXT NOT NULL,
+    error TEXT,
+    attempted_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS report_rows (
+    query_id INTEGER NOT NULL REFERENCES queries(id) ON DELETE CASCADE,
+    row_index INTEGER NOT NULL,
+    biz_no TEXT NOT NULL,
+    tax_name TEXT NOT NULL,
+    month TEXT,
+    cert_path TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL,
+    PRIMARY KEY (query_id, row_index)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    biz_no TEXT NOT NULL,
+    tax_name TEXT NOT NULL,
+    cert_path TEXT NOT NULL DEFAULT '',
+    last_status TEXT NOT NULL,
+    last_error TEXT,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    first_month TEXT,
+    last_month TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (biz_no, tax_name)
+);
+CREATE TABLE IF NOT EXISTS clients (
+    id INTEGER PRIMARY KEY,
+    biz_no TEXT,
+    biz_name TEXT,
+    cert_path TEXT,
+    engagement_status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_clients_biz ON clients (biz_no);
+CREATE INDEX IF NOT EXISTS idx_coverage_tax ON coverage (tax_name, row_count);
+CREATE INDEX IF NOT EXISTS idx_rows_biz_tax_month ON report_rows (biz_no, tax_name, month);
+CREATE INDEX IF NOT EXISTS idx_rows_tax_month ON report_rows (tax_name, month);
+CREATE INDEX IF NOT EXISTS idx_rows_cert ON report_rows (cert_path);
+CREATE INDEX IF NOT EXISTS idx_queries_biz_tax ON queries (biz_no, tax_name);
+CREATE INDEX IF NOT EXISTS idx_queries_cert ON queries (cert_path);
+"""
+
+
+ENGAGEMENT_UNKNOWN = '알수없음'
+
+
+def client_biz_no(client: Dict) -> str:
+    """거래처 목록 항목의 사업자번호 (없으면 주민번호에서 * 제거, 둘 다 없으면 빈 문자열)"""
+    return client.get('bsno') or (client.get('resno') or '').replace('*', '')
+
+
+def _encode_raw(raw: Union[str, bytes, Dict, List]) -> bytes:
+    if isinstance(raw, bytes):
+        return raw
+    if isinstance(raw, str):
+        return raw.encode('utf-8')
+    return json.dumps(raw, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+class ReportResultStore:
+    """
+    조회 결과를 정규화된 행으로 저장하는 SQLite 저장소 (스레드 안전)
+
+    사용 예:
+        store = ReportResultStore(OUTPUT_DIR / "results.sqlite3")
+        store.save_result(res, biz_no, "원천세", "20250101", "20251231", cert_path=path)
+        rows = store.rows(biz_no=biz_no, tax_name="원천세", month_from="202501")
+    """
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_RESULT_DB, store_raw: bool = True):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.store_raw = store_raw
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _save_raw(self, raw: Union[str, bytes, Dict, List]) -> int:
+        """원본 응답을 압축해 저장하고 id를 반환 (같은 내용은 한 번만 저장, 잠금 안에서 호출)"""
+        body = _encode_raw(raw)
+        digest = hashlib.sha256(body).hexdigest()
+        row = self._conn.execute('SELECT id FROM responses WHERE digest = ?', (digest,)).fetchone()
+        if row:
+            return row['id']
+        cursor = self._conn.execute(
+            'INSERT INTO responses (digest, size, body) VALUES (?, ?, ?)',
+            (digest, len(body), zlib.compress(body, 6))
+        )
+        return cursor.lastrowid
+
+    def save_result(
+        self,
+        res: Dict,
+        biz_no: str,
+        tax_name: str,
+        start_date: str,
+        end_date: str,
+        cert_path: str = ''
+    ) -> int:
+        """
+        조회 결과 1건 저장. 같은 (사업자, 세목, 기간)을 다시 저장하면 이전 행을 교체합니다.
+        성공(0건 포함)과 오류 모두 기록하므로 조회 여부/실패 사유도 여기서 조회할 수 있습니다.
+        이미 성공한 기간을 다시 조회하다 실패(오류/과부하)하면 이전 성공과 행은 그대로 두고
+        실패 시도만 failed_attempts에 남깁니다.
+
+        Returns:
+            query id (실패 시도만 기록한 경우 유지된 성공 조회의 id)
+        """
+        rows = res.get("data") or []
+        monthly_index = res.get("monthly_index")
+        if monthly_index is None:
+            monthly_index = index_rows_by_month(rows, res.get("month_field"))
+        row_months = {position: month for month, positions in monthly_index.items() for position in positions}
+        raw = res.get("raw")
+        success = res.get("status") == "success"
+        with self._lock, self._conn:
+            previous = self._conn.execute(
+                'SELECT id, status FROM queries WHERE biz_no = ? AND tax_name = ? AND start_date = ? AND end_date = ?',
+                (biz_no, tax_name, start_date, end_date)
+            ).fetchone()
+            if not success and previous is not None and previous['status'] == 'success':
+                self._conn.execute(
+                    'INSERT INTO failed_attempts (query_id, status, error, attempted_at) VALUES (?, ?, ?, ?)',
+                    (previous['id'], res.get("status", "error"), res.get("error") or res.get("message"), time.time())
+                )
+                return previous['id']
+
+            response_id = self._save_raw(raw) if self.store_raw and raw else None
+            if success:
+                # 조회 기간(신고일 기준)이 겹치는 이전 조회에서 온 행은 이번 응답이 최신이므로 교체
+                # (행의 과세연월은 신고 기간과 다른 축이므로 월로 범위를 잡지 않음)
+                self._conn.execute(
+                    'DELETE FROM report_rows WHERE biz_no = ? AND tax_name = ? AND query_id IN '
+                    '(SELECT id FROM queries WHERE biz_no = ? AND tax_name = ? AND start_date <= ? AND end_date >= ?)',
+                    (biz_no, tax_name, biz_no, tax_name, end_date, start_date)
+                )
+            if previous is not None:
+                self._conn.execute('DELETE FROM queries WHERE id = ?', (previous['id'],))
+            cursor = self._conn.execute(
+                'INSERT INTO queries '
+                '(biz_no, tax_name, start_date, end_date, cert_path, status, row_count, error, response_id, collected_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (biz_no, tax_name, start_date, end_date, cert_path, res.get("status", "error"),
+                 len(rows), res.get("error") or res.get("message"), response_id, time.time())
+            )
+            query_id = cursor.lastrowid
+            self._conn.executemany(
+                'INSERT INTO report_rows (query_id, row_index, biz_no, tax_name, month, cert_path, data) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [
+                    (query_id, index, biz_no, tax_name, row_months.get(index), cert_path,
+                     json.dumps(row, ensure_ascii=False, separators=(',', ':')))
+                    for index, row in enumerate(rows)
+                ]
+            )
+            self._update_coverage(biz_no, tax_name, cert_path, res)
+            return query_id
+
+    def _update_coverage(self, biz_no: str, tax_name: str, cert_path: str, res: Dict) -> None:
+        """(사업자, 세목) 요약 갱신 (잠금/트랜잭션 안에서 호출)"""
+        row_count, first_month, last_month = self._conn.execute(
+            'SELECT COUNT(*), MIN(month), MAX(month) FROM report_rows WHERE biz_no = ? AND tax_name = ?',
+            (biz_no, tax_name)
+        ).fetchone()
+        self._conn.execute(
+            'INSERT OR REPLACE INTO coverage '
+            '(biz_no, tax_name, cert_path, last_status, last_error, row_count, first_month, last_month, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (biz_no, tax_name, cert_path, res.get("status", "error"), res.get("error") or res.get("message"),
+             row_count, first_month, last_month, time.time())
+        )
+
+    def register_clients(self, clients: List[Dict]) -> int:
+        """
+        거래처 목록(fetch-all-clients.py 결과)을 저장합니다. 이전 목록은 교체됩니다.
+        failures_by_engagement_status()가 수임 상태별로 집계할 때 사용합니다.
+        """
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM clients')
+            self._conn.executemany(
+                'INSERT INTO clients (biz_no, biz_name, cert_path, engagement_status) VALUES (?, ?, ?, ?)',
+                [
+                    (client_biz_no(c) or None, c.get('txprNm'), c.get('_sourcePath'),
+                     c.get('_engagementStatus') or ENGAGEMENT_UNKNOWN)
+                    for c in clients
+                ]
+            )
+        return len(clients)
+
+    def successes(self, tax_name: str, month_from: Optional[str] = None, month_to: Optional[str] = None) -> Set[str]:
+        """해당 세목에서 데이터가 1건 이상 조회된 사업자번호 (월 범위 지정 시 그 범위의 행 기준)"""
+        with self._lock:
+            if month_from is None and month_to is None:
+                fetched = self._conn.execute(
+                    'SELECT biz_no FROM coverage WHERE tax_name = ? AND row_count > 0', (tax_name,)
+                ).fetchall()
+            else:
+                fetched = self._conn.execute(
+                    'SELECT DISTINCT biz_no FROM report_rows WHERE tax_name = ? AND month BETWEEN ? AND ?',
+                    (tax_name, month_from or '000000', month_to or '999999')
+                ).fetchall()
+        return {r[0] for r in fetched}
+
+    def queried(self, tax_name: str, month_from: Optional[str] = None, month_to: Optional[str] = None) -> Set[str]:
+        """해당 세목을 조회한 적이 있는 사업자번호 (월 범위 지정 시 조회 기간이 겹치는 것만)"""
+        with self._lock:
+            if month_from is None and month_to is None:
+                fetched = self._conn.execute('SELECT biz_no FROM coverage WHERE tax_name = ?', (tax_name,)).fetchall()
+            else:
+                fetched = self._conn.execute(
+                    'SELECT DISTINCT biz_no FROM queries WHERE tax_name = ? AND start_date <= ? AND end_date >= ?',
+                    (tax_name, f"{month_to or '999999'}31", f"{month_from or '000000'}01")
+                ).fetchall()
+        return {r[0] for r in fetched}
+
+    def failures(self, tax_name: str, month_from: Optional[str] = None, month_to: Optional[str] = None) -> Set[str]:
+        """조회했지만 데이터가 없었던(또는 오류였던) 사업자번호"""
+        return self.queried(tax_name, month_from, month_to) - self.successes(tax_name, month_from, month_to)
+
+    def failures_by_engagement_status(self, tax_name: str) -> Dict[str, Dict[str, int]]:
+        """
+        등록된 거래처를 수임 상태별로 나눠 해당 세목 조회 결과를 집계합니다.
+
+        Returns:
+            {수임상태: {total, success, failed, no_biz_no, not_queried}}
+            total은 사업자번호가 있는 거래처 수
+        """
+        query = (
+            'SELECT c.engagement_status AS status,'
+            ' SUM(c.biz_no IS NULL) AS no_biz_no,'
+            ' SUM(c.biz_no IS NOT NULL) AS total,'
+            ' SUM(c.biz_no IS NOT NULL AND cv.row_count > 0) AS success,'
+            ' SUM(c.biz_no IS NOT NULL AND cv.row_count = 0) AS failed,'
+            ' SUM(c.biz_no IS NOT NULL AND cv.biz_no IS NULL) AS not_queried'
+            ' FROM clients c LEFT JOIN coverage cv ON cv.biz_no = c.biz_no AND cv.tax_name = ?'
+            ' GROUP BY c.engagement_status'
+        )
+        with self._lock:
+            fetched = self._conn.execute(query, (tax_name,)).fetchall()
+        return {
+            r['status']: {key: r[key] or 0 for key in ('total', 'success', 'failed', 'no_biz_no', 'not_queried')}
+            for r in fetched
+        }
+
+    def coverage_matrix(self, tax_names: Optional[List[str]] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        사업자 × 세목 조회 현황
+
+        Returns:
+            {사업자번호: {세목: {'state': 'success'|'empty'|'error', 'rows', 'first_month', 'last_month'}}}
+            조회하지 않은 세목은 빠집니다.
+        """
+        query = 'SELECT * FROM coverage'
+        args: list = []
+        if tax_names:
+            query += f" WHERE tax_name IN ({','.join('?' * len(tax_names))})"
+            args.extend(tax_names)
+        with self._lock:
+            fetched = self._conn.execute(query, args).fetchall()
+
+        matrix: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for r in fetched:
+            if r['row_count'] > 0:
+                state = 'success'
+            elif r['last_status'] == 'success':
+                state = 'empty'
+            else:
+                state = 'error'
+            matrix.setdefault(r['biz_no'], {})[r['tax_name']] = {
+                'state': state, 'rows': r['row_count'], 'first_month': r['first_month'], 'last_month': r['last_month']
+            }
+        return matrix
+
+    def rows(
+        self,
+        biz_no: Optional[str] = None,
+        tax_name: Optional[str] = None,
+        month_from: Optional[str] = None,
+        month_to: Optional[str] = None,
+        cert_path: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """조건에 맞는 응답 행 목록. 각 행은 원래 필드에 _biz_no, _tax_name, _month가 추가됩니다."""
+        clauses, args = [], []
+        for column, value in (('biz_no', biz_no), ('tax_name', tax_name), ('cert_path', cert_path)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                args.append(value)
+        if month_from is not None:
+            clauses.append('month >= ?')
+            args.append(month_from)
+        if month_to is not None:
+            clauses.append('month <= ?')
+            args.append(month_to)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        query = f'SELECT biz_no, tax_name, month, data FROM report_rows{where} ORDER BY biz_no, tax_name, month, query_id, row_index'
+
+        with self._lock:
+            fetched = self._conn.execute(query, args).fetchall()
+        return [
+            {**json.loads(r['data']), '_biz_no': r['biz_no'], '_tax_name': r['tax_name'], '_month': r['month']}
+            for r in fetched
+        ]
+
+    def queries(self, status: Optional[str] = None, tax_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """조회 기록 (원본 응답 제외)"""
+        clauses, args = [], []
+        if status is not None:
+            clauses.append('status = ?')
+            args.append(status)
+        if tax_name is not None:
+            clauses.append('tax_name = ?')
+            args.append(tax_name)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock:
+            fetched = self._conn.execute(f'SELECT * FROM queries{where} ORDER BY id', args).fetchall()
+        return [dict(r) for r in fetched]
+
+    def failed_attempts(self, query_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """성공한 기간을 다시 조회하다 실패한 기록 (이전 성공 결과는 유지됨)"""
+        query = ('SELECT f.*, q.biz_no, q.tax_name, q.start_date, q.end_date '
+                 'FROM failed_attempts f JOIN queries q ON q.id = f.query_id')
+        args: list = []
+        if query_id is not None:
+            query += ' WHERE f.query_id = ?'
+            args.append(query_id)
+        with self._lock:
+            fetched = self._conn.execute(query + ' ORDER BY f.id', args).fetchall()
+        return [dict(r) for r in fetched]
+
+    def raw_response(self, query_id: int) -> Optional[Dict]:
+        """조회 1건의 원본 응답 (저장하지 않았으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT r.body FROM queries q JOIN responses r ON r.id = q.response_id WHERE q.id = ?', (query_id,)
+            ).fetchone()
+        return json.loads(zlib.decompress(row['body'])) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {
+                table: self._conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                for table in ('queries', 'report_rows', 'responses')
+            }
+            raw_size = self._conn.execute('SELECT COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM responses').fetchone()
+        counts['raw_bytes'] = raw_size[0]
+        counts['raw_compressed_bytes'] = raw_size[1]
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
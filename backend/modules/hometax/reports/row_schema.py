@@ -0,0 +1,119 @@
+"""
+응답 행 스키마 캐시
+wqAction.do 응답에서 행 목록이 담긴 키(dlt...)와 행의 과세연월 필드(txnrmYm/pymnYm/rtnYm/sbmsYm)는
+(actionId, 세목 코드)마다 일정합니다. 처음 본 응답에서 한 번 찾아 기억해 두고, 이후에는 키를 바로 읽어
+응답 키 전체를 두 번 훑거나 행마다 연월 필드 네 개를 차례로 확인하지 않습니다.
+캐시된 키가 응답에 없으면(스키마 변경, 빈 응답 등) 그때만 다시 찾습니다.
+
+사용 예:
+    key = schema_key('ATERNABA016R01', '14')
+    rows, month_field, monthly_index = extract_rows_by_month(result_data, key)
+    monthly = group_rows_by_month(rows, month_field, monthly_index)   # 행을 다시 훑지 않음
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .incremental import MONTH_FIELDS, index_rows_by_month
+
+SchemaKey = Tuple[str, str]
+
+
+def schema_key(action_id: str, itrf_cd: str = '') -> SchemaKey:
+    return (action_id, itrf_cd)
+
+
+def _discover_rows_key(result_data: Dict) -> Optional[str]:
+    """
+    행 목록 키 찾기 (기존 _extract_rows와 같은 우선순위)
+    1) 행이 있는 dlt... 리스트 키 2) 딕셔너리 리스트가 담긴 첫 번째 키 3) 빈 dlt... 리스트 키
+    """
+    empty_dlt = None
+    for key, value in result_data.items():
+        if isinstance(value, list) and key.startswith("dlt"):
+            if value:
+                return key
+            if empty_dlt is None:
+                empty_dlt = key
+    for key, value in result_data.items():
+        if isinstance(value, list) and len(value) > 0 and isinstance(value[0], dict):
+            return key
+    return empty_dlt
+
+
+def _discover_month_field(row: Dict) -> Optional[str]:
+    for field in MONTH_FIELDS:
+        if row.get(field):
+            return field
+    return None
+
+
+class RowSchemaCache:
+    """(actionId, 세목 코드)별 행 목록 키와 과세연월 필드 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas: Dict[SchemaKey, Tuple[str, Optional[str]]] = {}
+
+    def extract(self, result_data: Dict, key: Optional[SchemaKey] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        응답에서 행 목록과 과세연월 필드 이름을 꺼냅니다.
+        캐시된 키에 행이 있으면 바로 반환하고, 없을 때(미스, 빈 응답, 스키마 변경)만 응답 키를 훑습니다.
+        행이 있는 응답에서 찾은 스키마만 기억합니다.
+
+        Returns:
+            (행 목록, 과세연월 필드 또는 None)
+        """
+        cached = self._schemas.get(key) if key is not None else None
+        if cached is not None:
+            rows = result_data.get(cached[0])
+            if isinstance(rows, list) and rows:
+                return rows, cached[1]
+
+        rows_key = _discover_rows_key(result_data)
+        if rows_key is None:
+            return [], None
+        rows = result_data[rows_key]
+        if not rows:
+            return rows, None
+
+        month_field = _discover_month_field(rows[0]) if isinstance(rows[0], dict) else None
+        if key is not None:
+            with self._lock:
+                self._schemas[key] = (rows_key, month_field)
+        return rows, month_field
+
+    def get(self, key: SchemaKey) -> Optional[Tuple[str, Optional[str]]]:
+        return self._schemas.get(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._schemas.clear()
+
+
+_default_cache = RowSchemaCache()
+
+
+def row_schema_cache() -> RowSchemaCache:
+    """프로세스 공용 스키마 캐시"""
+    return _default_cache
+
+
+def extract_rows(result_data: Dict, key: Optional[SchemaKey] = None) -> Tuple[List[Dict], Optional[str]]:
+    """공용 캐시로 행 목록과 과세연월 필드를 꺼냅니다."""
+    return _default_cache.extract(result_data, key)
+
+
+def extract_rows_by_month(
+    result_data: Dict,
+    key: Optional[SchemaKey] = None
+) -> Tuple[List[Dict], Optional[str], Dict[str, List[int]]]:
+    """
+    행 목록과 과세연월 필드를 꺼내면서 행 번호를 과세연월별로 묶습니다.
+    수집 결과의 "monthly_index"로 넘기면 월별 파일 병합/결과 저장소가 행을 다시 훑지 않습니다.
+
+    Returns:
+        (행 목록, 과세연월 필드 또는 None, {YYYYMM: [행 번호]})
+    """
+    rows, month_field = _default_cache.extract(result_data, key)
+    return rows, month_field, index_rows_by_month(rows, month_field)
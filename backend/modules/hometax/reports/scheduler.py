@@ -0,0 +1,122 @@
+"""
+여러 인증서를 동시에 수집하는 스케줄러
+인증서마다 홈택스 계정(서버 측 호출 제한)이 따로 있으므로, 인증서별로 세션과 호출 속도 제어기를
+분리한 채 N개의 인증서를 병렬로 처리하고 진행 상황과 결과를 합칩니다.
+"""
+
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..rate_control import get_rate_controller
+
+
+@dataclass
+class CertificateJob:
+    """인증서 하나와 그 인증서로 수집할 거래처 목록"""
+    cert_name: str
+    cert_path: str
+    password: str
+    clients: List[Dict] = field(default_factory=list)
+
+
+class ProgressTracker:
+    """여러 스레드에서 갱신하는 수집 진행 상황 (스레드 안전)"""
+
+    def __init__(self, total_units: int = 0, report_every: int = 50, stream=None):
+        self.total_units = total_units
+        self.report_every = report_every
+        self.stream = stream or sys.stdout
+        self.counters: Dict[str, int] = {}
+        self.done_units = 0
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def add(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def unit_done(self, label: str = "") -> None:
+        """작업 단위(예: 거래처 1곳) 하나가 끝났음을 기록하고 주기적으로 진행 상황을 출력"""
+        with self._lock:
+            self.done_units += 1
+            done = self.done_units
+        if self.report_every and (done % self.report_every == 0 or done == self.total_units):
+            elapsed = time.time() - self.started_at
+            total = self.total_units or '?'
+            print(f"  [전체 {done}/{total}] 진행 중... (소요 시간: {elapsed/60:.1f}분) {label}", file=self.stream, flush=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counters,
+                'done_units': self.done_units,
+                'total_units': self.total_units,
+                'elapsed_seconds': time.time() - self.started_at,
+            }
+
+
+class MultiCertificateScheduler:
+    """
+    인증서 단위로 작업을 병렬 실행합니다.
+
+    사용 예:
+        scheduler = MultiCertificateScheduler(max_workers=4, min_interval=0.1)
+        results = scheduler.run(jobs, collect_certificate)
+
+    속도 제어기는 거래처 목록/신고현황 조회와 같은 pubcUserNo 키로 공유해야 하므로 로그인 뒤에야 정해집니다.
+    그래서 throttle은 기본적으로 None이며, worker_fn은 로그인 후 scheduler.rate_controller(pubcUserNo)
+    (시작 속도 1/min_interval)를 씁니다. 별도 제어기가 필요하면 throttle_factory=lambda job: ...로 넘깁니다.
+    worker_fn(job, throttle, progress)는 인증서 하나의 로그인과 수집 전체를 담당하며,
+    반환값은 cert_name을 키로 results에 모입니다. 한 인증서에서 예외가 나도 다른 인증서는 계속 진행합니다.
+
+    Ctrl-C(KeyboardInterrupt)가 들어오면 stop_event를 세우고 아직 시작하지 않은 인증서를 취소한 뒤
+    예외를 다시 올립니다. worker_fn은 작업 단위 사이마다 scheduler.stop_event.is_set()을 확인해
+    진행 중인 단위만 마치고 돌아와야 합니다.
+    """
+
+    def __init__(self, max_workers: int = 4, min_interval: float = 0.1, throttle_factory: Optional[Callable[[CertificateJob], Any]] = None):
+        self.max_workers = max(1, max_workers)
+        self.min_interval = min_interval
+        self.throttle_factory = throttle_factory
+        self.stop_event = threading.Event()
+
+    def rate_controller(self, pubc_user_no: str):
+        """로그인 사용자(pubcUserNo)별 공유 AIMD 속도 제어기 (처음 만들 때 시작 속도 1/min_interval)"""
+        initial_rate = 1.0 / self.min_interval if self.min_interval > 0 else 20.0
+        return get_rate_controller(pubc_user_no or None, initial_rate=initial_rate, max_rate=max(20.0, initial_rate))
+
+    def run(
+        self,
+        jobs: List[CertificateJob],
+        worker_fn: Callable[[CertificateJob, Any, ProgressTracker], Any],
+        progress: Optional[ProgressTracker] = None
+    ) -> Dict[str, Dict]:
+        progress = progress or ProgressTracker(total_units=sum(len(job.clients) for job in jobs))
+        results: Dict[str, Dict] = {}
+
+        self.stop_event.clear()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cert")
+        try:
+            futures = {
+                executor.submit(worker_fn, job, self.throttle_factory(job) if self.throttle_factory else None, progress): job
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    results[job.cert_name] = {'success': True, 'result': future.result()}
+                except Exception as e:
+                    print(f"  [FAIL] [{job.cert_name}] 수집 중 오류: {e}", file=sys.stderr, flush=True)
+                    results[job.cert_name] = {'success': False, 'error': str(e)}
+        except KeyboardInterrupt:
+            # 대기 중인 인증서는 취소하고, 실행 중인 워커는 다음 단위 전에 멈추도록 알림
+            self.stop_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown(wait=True)
+
+        return results
@@ -0,0 +1,79 @@
+"""
+wqAction.do 요청 템플릿
+(actionId, screenId, 세목 등)마다 한 번만 쿼리/헤더/본문을 구성하고, 본문 JSON을 고정 조각으로 미리 직렬화해 둡니다.
+호출마다 바뀌는 필드(사업자번호, 기간, 페이지 번호 등)와 nts 토큰만 끼워 넣으므로
+수만 건을 조회해도 요청 구성 비용(딕셔너리 복사, json.dumps, Referer 포맷)이 거의 들지 않습니다.
+
+렌더링 결과는 같은 값으로 채운 본문을 json.dumps(ensure_ascii=False)한 것 + nts와 바이트 단위로 같습니다.
+
+사용 예:
+    template = RequestTemplate(url, params, headers, body, fields=('txprRgtNo', 'rtnDtSrt', 'rtnDtEnd'))
+    session.post(template.url, params=template.params, headers=template.headers,
+                 data=template.render({'txprRgtNo': biz_no, 'rtnDtSrt': start, 'rtnDtEnd': end}, nts))
+"""
+
+import json
+import random
+import re
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+_SLOT_RE = re.compile(r'"@@slot(\d+)@@"')
+
+
+def make_nts() -> str:
+    """NTS 토큰 생성 (ref 로직: randomSecond()와 동일, 30~59초)"""
+    sec = random.randrange(30, 60)
+    return f"{sec}lpNhzq7ZwSaVt9TU2s8mHzIzLjmDpVKVgvmLBNswI{sec - 11}"
+
+
+class RequestTemplate:
+    """
+    미리 직렬화된 wqAction.do 요청
+
+    Args:
+        url: 요청 URL
+        params: 쿼리 파라미터 (호출 간 공유, 수정하지 말 것)
+        headers: 요청 헤더 (호출 간 공유, 수정하지 말 것)
+        body: 본문 딕셔너리. fields에 해당하는 값은 자리표시로 바뀌며 나머지는 그대로 고정
+        fields: 호출마다 채울 필드 경로 (중첩 필드는 'pageInfoVO.pageNum'처럼 점으로 구분)
+    """
+
+    __slots__ = ('url', 'params', 'headers', 'fields', '_fragments', '_order')
+
+    def __init__(
+        self,
+        url: str,
+        params: Optional[Mapping[str, str]],
+        headers: Mapping[str, str],
+        body: Dict[str, Any],
+        fields: Iterable[str] = ()
+    ):
+        self.url = url
+        self.params = dict(params) if params else None
+        self.headers = dict(headers)
+        self.fields = tuple(fields)
+
+        marked = json.loads(json.dumps(body))
+        for index, path in enumerate(self.fields):
+            *parents, leaf = path.split('.')
+            target = marked
+            for name in parents:
+                target = target[name]
+            if leaf not in target:
+                raise KeyError(f"템플릿 본문에 없는 필드: {path}")
+            target[leaf] = f"@@slot{index}@@"
+
+        parts = _SLOT_RE.split(json.dumps(marked, ensure_ascii=False))
+        # parts: [고정 조각, 필드 번호, 고정 조각, 필드 번호, ..., 고정 조각]
+        self._fragments = tuple(parts[0::2])
+        self._order = tuple(self.fields[int(i)] for i in parts[1::2])
+
+    def render(self, values: Mapping[str, Any], nts: Optional[str] = None) -> bytes:
+        """필드 값을 채운 본문 + nts 토큰 (nts를 생략하면 새로 생성)"""
+        fragments = self._fragments
+        out = [fragments[0]]
+        for index, path in enumerate(self._order, 1):
+            out.append(json.dumps(values[path], ensure_ascii=False))
+            out.append(fragments[index])
+        out.append(nts if nts is not None else make_nts())
+        return ''.join(out).encode('utf-8')
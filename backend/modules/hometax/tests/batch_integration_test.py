@@ -5,7 +5,6 @@ import calendar
 from pathlib import Path
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
-import subprocess
 
 # 프로젝트 루트 및 모듈 경로 설정
 PROJECT_ROOT = Path("/Users/sunnitic/Desktop/00_dev_/Pickup")
@@ -15,23 +14,22 @@ sys.path.insert(0, str(PROJECT_ROOT / "backend" / "modules"))
 from hometax.reports.report_collector import HometaxTaxReportCollector
 from hometax.reports.constants import TAX_MAP
 
+_worker_client = None
+
 def get_session_via_script(cert_path, password):
-    """get-session-with-permission.py 스크립트를 호출하여 세션 획득"""
-    script_path = PROJECT_ROOT / "backend" / "integration" / "scripts" / "get-session-with-permission.py"
+    """hometax-worker.py 상주 워커를 통해 세션 획득 (인증서마다 프로세스를 새로 띄우지 않음)"""
+    global _worker_client
     try:
-        result = subprocess.run(
-            ["python3", str(script_path), cert_path, password],
-            capture_output=True, text=True, timeout=120
-        )
-        if result.returncode != 0:
-            return {"success": False, "error": result.stderr}
-        
-        # 마지막 줄의 JSON 추출
-        lines = result.stdout.strip().split("\n")
-        for line in reversed(lines):
-            if line.startswith("{"):
-                return json.loads(line)
-        return {"success": False, "error": "No JSON found in output"}
+        if _worker_client is None:
+            import importlib.util
+            worker_path = PROJECT_ROOT / "backend" / "integration" / "scripts" / "hometax-worker.py"
+            spec = importlib.util.spec_from_file_location("hometax_worker", worker_path)
+            worker_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(worker_module)
+            _worker_client = worker_module.HometaxWorkerClient()
+        result = _worker_client.call("login", cert_path=cert_path, password=password)
+        result["success"] = True
+        return result
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -105,12 +103,9 @@ def main():
                     end_dt = f"{year}{month:02d}{last_day:02d}"
                     
                     summary["total_requests"] += 1
+                    # 호출 간격은 수집기의 속도 제어기가 조절
                     res = collector.collect_monthly_report(tax_name, biz_no, start_dt, end_dt)
                     
-                    # 홈택스 차단 방지를 위한 미세 지연 추가
-                    import time
-                    time.sleep(0.3)
-                    
                     if res.get("status") == "success":
                         summary["success_count"] += 1
                         count = res.get("count", 0)
@@ -133,5 +128,8 @@ def main():
     print(f"- 데이터 발견(BINGO): {summary['bingo_count']}")
     print("="*50)
 
+    if _worker_client is not None:
+        _worker_client.close()
+
 if __name__ == "__main__":
     main()
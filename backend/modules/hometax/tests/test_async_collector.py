@@ -0,0 +1,100 @@
+import asyncio
+import json
+import unittest
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from ..rate_control import AimdRateController
+from ..reports.async_collector import AsyncHometaxTaxReportCollector
+
+
+@unittest.skipIf(httpx is None, "httpx가 설치되어 있지 않습니다")
+class TestAsyncReportCollector(unittest.TestCase):
+    def _collector(self, handler, max_in_flight=2):
+        collector = AsyncHometaxTaxReportCollector(
+            cookies={"TXPPsessionID": "test"},
+            pubc_user_no="12345678",
+            max_in_flight=max_in_flight,
+            rate_controller=AimdRateController(initial_rate=1000, max_rate=1000)
+        )
+        # 전송 계층만 가짜로 교체 (쿠키 저장소는 그대로 공유)
+        collector.client = httpx.AsyncClient(cookies=collector.session.cookies, transport=httpx.MockTransport(handler))
+        return collector
+
+    def test_collect_many_streams_all_results(self):
+        """모든 작업 결과가 세목/사업자 정보와 함께 반환되는지 확인"""
+        def handler(request):
+            body, _ = json.JSONDecoder().raw_decode(request.content.decode("utf-8"))  # 본문 뒤에 nts 토큰이 붙음
+            return httpx.Response(200, json={"dltList": [{"itrfCd": body["itrfCd"], "txprRgtNo": body["txprRgtNo"]}]})
+
+        async def run():
+            collector = self._collector(handler)
+            tasks = [("원천세", "1000000001", "20250101", "20251231"), {"tax_name": "부가세", "biz_no": "1000000002", "start_date": "20250101", "end_date": "20251231"}]
+            results = [r async for r in collector.collect_many(tasks)]
+            await collector.aclose()
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual(len(results), 2)
+        by_biz = {r["biz_no"]: r for r in results}
+        self.assertEqual(by_biz["1000000001"]["data"][0]["itrfCd"], "14")
+        self.assertEqual(by_biz["1000000002"]["tax_name"], "부가세")
+        self.assertTrue(all(r["status"] == "success" for r in results))
+
+    def test_in_flight_is_bounded(self):
+        """동시에 진행 중인 요청 수가 max_in_flight를 넘지 않는지 확인"""
+        state = {"current": 0, "peak": 0}
+
+        async def handler(request):
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+            await asyncio.sleep(0.01)
+            state["current"] -= 1
+            return httpx.Response(200, json={"dltList": []})
+
+        async def run():
+            collector = self._collector(handler, max_in_flight=2)
+            tasks = [("원천세", str(i), "20250101", "20251231") for i in range(6)]
+            results = [r async for r in collector.collect_many(tasks)]
+            await collector.aclose()
+            return results
+
+        results = asyncio.run(run())
+        self.assertEqual(len(results), 6)
+        self.assertLessEqual(state["peak"], 2)
+
+    def test_rate_is_reserved_only_after_slot(self):
+        """대기 중인 작업이 속도 슬롯을 미리 예약하지 않는지 확인 (감속이 바로 반영되도록)"""
+        acquired = []
+
+        class CountingController(AimdRateController):
+            async def acquire_async(self):
+                acquired.append(1)
+                await super().acquire_async()
+
+        state = {"done": 0, "booked": []}
+
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            # 예약했지만 아직 끝나지 않은 요청 수
+            state["booked"].append(len(acquired) - state["done"])
+            state["done"] += 1
+            return httpx.Response(200, json={"dltList": []})
+
+        async def run():
+            collector = self._collector(handler, max_in_flight=2)
+            collector.rate_controller = CountingController(initial_rate=1000, max_rate=1000)
+            tasks = [("원천세", str(i), "20250101", "20251231") for i in range(6)]
+            results = [r async for r in collector.collect_many(tasks)]
+            await collector.aclose()
+            return results
+
+        self.assertEqual(len(asyncio.run(run())), 6)
+        self.assertLessEqual(max(state["booked"]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..clients.registry import ClientRegistry, client_key, ADDED, REMOVED, TERMINATED, CHANGED
+
+
+def _client(bsno, name="거래처", status="수임중", **extra):
+    return {"bsno": bsno, "txprNm": name, "_engagementStatus": status,
+            "_sourceCert": "세무사", "_sourcePath": "a.p12", **extra}
+
+
+class TestClientRegistry(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.registry = ClientRegistry(Path(self._tmp.name) / "registry.sqlite3")
+
+    def tearDown(self):
+        self.registry.close()
+        self._tmp.cleanup()
+
+    def test_sync_detects_changes(self):
+        """신규/제외/해지/정보 변경을 구분하는지 확인"""
+        first = self.registry.sync("a.p12", [_client("1"), _client("2"), _client("3")], fetched_at=100)
+        self.assertEqual(len(first[ADDED]), 3)
+        self.assertEqual(first["unchanged"], 0)
+
+        second = self.registry.sync(
+            "a.p12",
+            [_client("1", _sourceCert="다른 이름"), _client("2", status="해지중"), _client("4", name="변경")],
+            fetched_at=200
+        )
+        self.assertEqual([c["bsno"] for c in second[ADDED]], ["4"])
+        self.assertEqual([c["bsno"] for c in second[REMOVED]], ["3"])
+        self.assertEqual([c["bsno"] for c in second[TERMINATED]], ["2"])
+        self.assertEqual(second[CHANGED], [])
+        # 조회 경로 메타데이터만 다르면 변경으로 보지 않음
+        self.assertEqual(second["unchanged"], 1)
+
+        third = self.registry.sync("a.p12", [_client("1", name="상호 변경"), _client("2", status="해지중"), _client("4", name="변경")],
+                                   fetched_at=300)
+        self.assertEqual([c["bsno"] for c in third[CHANGED]], ["1"])
+        self.assertEqual([c["bsno"] for c in self.registry.roster("a.p12")], ["1", "2", "4"])
+
+    def test_masked_resno_does_not_merge_individuals(self):
+        """마스킹된 주민번호가 같아도 이름이 다르면 다른 거래처로 보는지 확인"""
+        first = {"resno": "900101-1******", "txprNm": "홍길동"}
+        second = {"resno": "900101-1******", "txprNm": "김철수"}
+        self.assertNotEqual(client_key(first), client_key(second))
+        self.assertNotEqual(client_key({"resno": "900101-1******", "addr": "a"}),
+                            client_key({"resno": "900101-1******", "addr": "b"}))
+
+        diff = self.registry.sync("a.p12", [first, second], fetched_at=100)
+        self.assertEqual(len(diff[ADDED]), 2)
+
+    def test_changed_since_returns_latest_state(self):
+        """기준 시각 이후 신규/변경된 거래처만, 인증서별로 골라내는지 확인"""
+        self.registry.sync("a.p12", [_client("1"), _client("2")], fetched_at=100)
+        self.registry.sync("b.p12", [_client("9")], fetched_at=100)
+        self.registry.sync("a.p12", [_client("1", name="변경"), _client("3")], fetched_at=200)
+
+        changed = self.registry.changed_since(150)
+        self.assertEqual(sorted((c["bsno"], c["_change"]) for c in changed), [("1", CHANGED), ("3", ADDED)])
+        self.assertEqual(changed[0]["txprNm"] if changed[0]["bsno"] == "1" else changed[1]["txprNm"], "변경")
+        self.assertEqual(len(self.registry.changed_since(0, cert_path="b.p12")), 1)
+        self.assertEqual(self.registry.last_synced_at(), 100)
+
+    def test_snapshot_age(self):
+        self.assertIsNone(self.registry.snapshot_age("a.p12"))
+        self.registry.sync("a.p12", [_client("1")])
+        self.assertLess(self.registry.snapshot_age("a.p12"), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
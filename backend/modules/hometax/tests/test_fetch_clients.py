@@ -0,0 +1,161 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import requests
+
+from ..clients.fetch import fetch_all_engagement_statuses, fetch_hometax_clients
+from ..rate_control import AimdRateController
+
+
+def _fast_controller():
+    return AimdRateController(initial_rate=1000, max_rate=1000, overload_pause=0)
+
+
+class _FakeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+        self.text = json.dumps(payload, ensure_ascii=False)
+        self.content = self.text.encode('utf-8')
+        self.headers = {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        pass
+
+
+class _PagedSession(requests.Session):
+    """totalCount만큼의 거래처를 pageSize 단위로 돌려주는 가짜 세션"""
+
+    def __init__(self, total, fail_once=(), overload_once=()):
+        super().__init__()
+        self.overload_once = set(overload_once)
+        self.cookies.set("TXPPsessionID", "test")
+        self.total = total
+        self.fail_once = set(fail_once)
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def post(self, url, data=None, **kwargs):
+        body, _ = json.JSONDecoder().raw_decode(data.decode("utf-8"))
+        page, size = int(body["pageInfoVO"]["pageNum"]), int(body["pageInfoVO"]["pageSize"])
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+            if page in self.fail_once:
+                self.fail_once.discard(page)
+                return _FakeResponse({"resultMsg": {"result": "F", "msg": "temporary"}})
+            if page in self.overload_once:
+                self.overload_once.discard(page)
+                return _FakeResponse({"resultMsg": {"result": "F", "msg": "과부하제어 중입니다. 60초 후 다시 시도하세요"}})
+
+        rows = [{"bsno": str(i)} for i in range((page - 1) * size, min(page * size, self.total))]
+        return _FakeResponse({"resultMsg": {"result": "S", "totalCount": str(self.total)}, "afdsSttnInfrDVOList": rows})
+
+
+class TestFetchClients(unittest.TestCase):
+    def test_pages_fetched_concurrently_in_order(self):
+        """totalCount 이후 페이지를 동시에 조회하고 순서대로 합치는지 확인"""
+        session = _PagedSession(total=1050)
+        clients = fetch_hometax_clients(session, "123", "1", max_in_flight=3, rate_controller=_fast_controller())
+
+        self.assertEqual([c["bsno"] for c in clients], [str(i) for i in range(1050)])
+        self.assertGreater(session.peak, 1)
+        self.assertLessEqual(session.peak, 3)
+
+    def test_failed_page_is_retried(self):
+        """동시 조회에서 실패한 페이지를 다시 조회하는지 확인"""
+        session = _PagedSession(total=450, fail_once={2})
+        clients = fetch_hometax_clients(session, "123", "1", rate_controller=_fast_controller())
+        self.assertEqual(len(clients), 450)
+
+    def test_overloaded_page_backs_off_and_retries(self):
+        """과부하제어 응답을 속도 제어기에 보고하고 같은 페이지를 다시 조회하는지 확인"""
+        session = _PagedSession(total=450, overload_once={2})
+        controller = _fast_controller()
+        clients = fetch_hometax_clients(session, "123", "1", rate_controller=controller)
+
+        self.assertEqual(len(clients), 450)
+        self.assertEqual(controller.metrics()["total_overload"], 1)
+        self.assertEqual(controller.metrics()["total_success"], 3)
+
+class _StatusSession(requests.Session):
+    """전체 조회(afdsCl="")는 거부하고 상태별 목록만 돌려주는 가짜 세션"""
+
+    LISTS = {"1": [{"bsno": "A"}, {"bsno": "B"}], "2": [{"bsno": "B"}, {"resno": "900101-1******", "txprNm": "홍길동"}, {"resno": "900101-1******", "txprNm": "김철수"}], "3": [{"bsno": "C"}]}
+
+    def __init__(self, all_error=None, failing_status=None):
+        super().__init__()
+        self.cookies.set("TXPPsessionID", "test")
+        self.calls = []
+        self.all_error = all_error
+        self.failing_status = failing_status
+
+    def post(self, url, data=None, **kwargs):
+        body, _ = json.JSONDecoder().raw_decode(data.decode("utf-8"))
+        self.calls.append(body["afdsCl"])
+        if body["afdsCl"] == "" and self.all_error is not None:
+            raise self.all_error
+        if body["afdsCl"] == self.failing_status:
+            raise requests.ConnectionError("connection reset")
+        if body["afdsCl"] == "":
+            return _FakeResponse({"resultMsg": {"result": "F", "msg": "afdsCl 필수"}})
+        rows = [dict(row) for row in self.LISTS[body["afdsCl"]]]
+        return _FakeResponse({"resultMsg": {"result": "S", "totalCount": str(len(rows))}, "afdsSttnInfrDVOList": rows})
+
+
+class TestFetchAllEngagementStatuses(unittest.TestCase):
+    def test_split_mode_dedupes_and_is_cached(self):
+        """전체 조회 실패 시 상태별로 합치고 중복을 제거하며, 다음 실행은 전체 조회를 건너뛰는지 확인"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "modes.json"
+
+            session = _StatusSession()
+            clients = fetch_all_engagement_statuses(session, "123", mode_cache_path=cache_path, rate_controller=_fast_controller())
+            self.assertEqual(
+                [(c.get("bsno") or c.get("txprNm"), c["_engagementStatus"]) for c in clients],
+                [("A", "수임중"), ("B", "수임중"), ("홍길동", "해지중"), ("김철수", "해지중"), ("C", "미동의")]
+            )
+            self.assertIn("", session.calls)
+
+            session = _StatusSession()
+            fetch_all_engagement_statuses(session, "123", mode_cache_path=cache_path, rate_controller=_fast_controller())
+            self.assertNotIn("", session.calls)
+            self.assertEqual(sorted(session.calls), ["1", "2", "3"])
+
+    def test_transient_failure_is_not_cached(self):
+        """전체 조회가 시간 초과로 실패하면 이번만 상태별로 조회하고 'split'을 기록하지 않는지 확인"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "modes.json"
+
+            session = _StatusSession(all_error=requests.Timeout("read timed out"))
+            clients = fetch_all_engagement_statuses(session, "123", mode_cache_path=cache_path, rate_controller=_fast_controller())
+            self.assertEqual(len(clients), 5)
+            self.assertFalse(cache_path.exists())
+
+            session = _StatusSession()
+            fetch_all_engagement_statuses(session, "123", mode_cache_path=cache_path, rate_controller=_fast_controller())
+            self.assertIn("", session.calls)
+
+    def test_failed_status_is_reported_as_missing(self):
+        """상태별 조회 하나가 실패하면 목록은 돌려주되 빠진 상태를 알려 주는지 확인"""
+        missing = []
+        clients = fetch_all_engagement_statuses(_StatusSession(failing_status="2"), "123", mode_cache_path=None,
+                                                rate_controller=_fast_controller(), missing_statuses=missing)
+        self.assertEqual(missing, ["해지중"])
+        self.assertEqual([c["bsno"] for c in clients], ["A", "B", "C"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..reports.incremental import WatermarkStore, merge_monthly_results, plan_ranges, ym_add, ym_range_to_dates
+
+
+class TestIncremental(unittest.TestCase):
+    def test_month_arithmetic(self):
+        self.assertEqual(ym_add("202412", 1), "202501")
+        self.assertEqual(ym_add("202501", -13), "202312")
+        self.assertEqual(ym_range_to_dates("202401", "202402"), ("20240101", "20240229"))
+
+    def test_plan_ranges(self):
+        """이미 조회한 구간은 건너뛰고 누락/최근 월만 조회하는지 확인"""
+        # 기록 없음 → 전체
+        self.assertEqual(plan_ranges(None, "202311", "202510"), [("202311", "202510")])
+        # 지난 달까지 조회 완료 → 새 달 + 최근 2개월만
+        self.assertEqual(plan_ranges(("202310", "202509"), "202311", "202510", 2), [("202509", "202510")])
+        # 이번 달까지 모두 조회 → 최근 2개월만 재조회
+        self.assertEqual(plan_ranges(("202311", "202510"), "202311", "202510", 2), [("202509", "202510")])
+        # 앞부분 누락
+        self.assertEqual(plan_ranges(("202401", "202510"), "202311", "202510", 1), [("202311", "202312"), ("202510", "202510")])
+        # window와 동떨어진 기록 → 전체
+        self.assertEqual(plan_ranges(("202001", "202012"), "202311", "202510"), [("202311", "202510")])
+
+    def test_watermark_merge_and_seed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "DATA_123_원천세_20231101_20251031.json").write_text("{}", encoding="utf-8")
+            store = WatermarkStore(Path(tmp) / "wm.sqlite3")
+            self.assertEqual(store.seed_from_files(tmp), 1)
+            self.assertEqual(store.get("123", "원천세"), ("202311", "202510"))
+            self.assertEqual(store.record("123", "원천세", "202510", "202511"), ("202311", "202511"))
+            self.assertEqual(store.record("123", "원천세", "202601", "202601"), ("202601", "202601"))
+            self.assertEqual(store.seed_from_files(tmp), 0)
+            store.close()
+
+    def test_merge_monthly_results_writes_every_tax_month(self):
+        """조회 기간 밖의 과세연월도 기록하고, 응답에 없는 월 파일은 지우지 않는지 확인"""
+        with tempfile.TemporaryDirectory() as tmp:
+            tax_dir = Path(tmp)
+            existing = {"data": [{"txnrmYm": "202510", "amt": 0}]}
+            (tax_dir / "DATA_123_원천세_202510.json").write_text(json.dumps(existing), encoding="utf-8")
+            (tax_dir / "DATA_123_원천세_202511.json").write_text("{}", encoding="utf-8")
+
+            # 2025년 11월 신고분: 9월/10월 귀속 행
+            rows = [{"txnrmYm": "202509", "amt": 1}, {"txnrmYm": "202510", "amt": 2}, {"txnrmYm": "202510", "amt": 0}]
+            written = merge_monthly_results(tax_dir, "123", "원천세", {"status": "success", "count": 3, "data": rows})
+
+            self.assertEqual(written, {"202509": 1, "202510": 2})
+            self.assertTrue((tax_dir / "DATA_123_원천세_202511.json").exists())
+            saved = json.loads((tax_dir / "DATA_123_원천세_202510.json").read_text(encoding="utf-8"))
+            self.assertEqual([r["amt"] for r in saved["data"]], [0, 2])
+
+if __name__ == '__main__':
+    unittest.main()
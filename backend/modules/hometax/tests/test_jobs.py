@@ -0,0 +1,57 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..reports.jobs import CollectionJobStore
+
+
+def _units(cert_path, biz_nos, taxes=("원천세", "부가세")):
+    return [
+        {"cert_path": cert_path, "biz_no": biz_no, "tax_name": tax, "start_date": "20240101", "end_date": "20251231"}
+        for biz_no in biz_nos for tax in taxes
+    ]
+
+
+class TestCollectionJobStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = CollectionJobStore(Path(self._tmp.name) / "jobs.sqlite3")
+
+    def tearDown(self):
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_resume_skips_completed_units(self):
+        """다시 등록해도 완료된 단위는 pending으로 돌아오지 않는지 확인"""
+        self.assertTrue(self.store.create_job("job", {"start_dt": "20240101"}))
+        self.assertEqual(self.store.enqueue("job", _units("a.p12", ["1", "2"])), 4)
+
+        first = self.store.pending("job")
+        self.store.mark_done("job", first[0]["unit_key"], 3)
+        self.store.mark_failed("job", first[1]["unit_key"], "과부하 제어")
+
+        # 재실행: 같은 작업/단위 재등록
+        self.assertFalse(self.store.create_job("job"))
+        self.assertEqual(self.store.enqueue("job", _units("a.p12", ["1", "2"])), 0)
+        self.assertEqual([u["unit_key"] for u in self.store.pending("job")], [u["unit_key"] for u in first[2:]])
+        self.assertEqual(self.store.summary("job"), {"pending": 2, "done": 1, "failed": 1, "total": 4})
+
+    def test_retry_failed_selectively(self):
+        """실패 단위만 골라 다시 pending으로 돌릴 수 있는지 확인"""
+        self.store.create_job("job")
+        self.store.enqueue("job", _units("a.p12", ["1"]) + _units("b.p12", ["2"]))
+        for unit in self.store.pending("job"):
+            if unit["tax_name"] == "원천세":
+                self.store.mark_failed("job", unit["unit_key"], "timeout")
+            else:
+                self.store.mark_done("job", unit["unit_key"])
+
+        self.assertEqual(len(self.store.pending("job")), 0)
+        self.assertEqual(len(self.store.pending("job", cert_path="b.p12", include_failed=True)), 1)
+        self.assertEqual(self.store.reset_failed("job", tax_name="원천세"), 2)
+        self.assertEqual(self.store.summary("job")["pending"], 2)
+        self.assertEqual(self.store.failures("job"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import json
+import unittest
+
+from .. import json_codec
+from ..json_codec import loads
+
+_AVAILABLE = [name for name, module in (("orjson", json_codec.orjson), ("msgspec", json_codec.msgspec)) if module] + ["json"]
+
+_BODY = json.dumps({
+    "resultMsg": {"result": "S", "totalCount": "2"},
+    "afdsSttnInfrDVOList": [
+        {"bsno": "1234567890", "txprNm": "가나상사", "afdsCl": "1", "extra": [1, 2]},
+        {"resno": "900101-1******", "txprNm": "홍길동"},
+    ],
+}, ensure_ascii=False).encode("utf-8")
+
+
+class TestJsonCodec(unittest.TestCase):
+    def tearDown(self):
+        json_codec.set_backend()
+
+    def test_backends_decode_identically(self):
+        for name in _AVAILABLE:
+            with self.subTest(backend=name):
+                json_codec.set_backend(name)
+                self.assertEqual(loads(_BODY), json.loads(_BODY))
+                self.assertEqual(loads(_BODY.decode("utf-8")), json.loads(_BODY))
+                with self.assertRaises(ValueError):
+                    loads(b"<html>overload</html>")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            json_codec.set_backend("simplejson")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import importlib
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+MODULES_DIR = Path(__file__).resolve().parents[2]
+
+
+def _loaded_after(code: str) -> list:
+    """새 인터프리터에서 code를 실행한 뒤 로드된 모듈 이름 목록"""
+    script = f"import sys, json\nsys.path.insert(0, {str(MODULES_DIR)!r})\n{code}\nprint(json.dumps(sorted(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_submodule_import_skips_collectors(self):
+        """hometax.logger만 import하면 수집기/requests를 불러오지 않는지 확인"""
+        loaded = _loaded_after("import hometax.logger")
+        self.assertNotIn("hometax.reports", loaded)
+        self.assertNotIn("requests", loaded)
+
+    def test_sync_collector_skips_async_collector(self):
+        loaded = _loaded_after("from hometax.reports import HometaxTaxReportCollector")
+        self.assertIn("hometax.reports.report_collector", loaded)
+        self.assertNotIn("hometax.reports.async_collector", loaded)
+
+    def test_package_attributes_resolve(self):
+        hometax = importlib.import_module(__package__.rsplit('.', 1)[0])
+        from ..reports.async_collector import AsyncHometaxTaxReportCollector
+        from ..reports.report_collector import HometaxTaxReportCollector
+
+        self.assertIs(hometax.HometaxTaxReportCollector, HometaxTaxReportCollector)
+        self.assertIs(hometax.AsyncHometaxTaxReportCollector, AsyncHometaxTaxReportCollector)
+        with self.assertRaises(AttributeError):
+            hometax.NoSuchCollector
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import contextlib
+import importlib.util
+import io
+import json
+import logging
+import unittest
+
+from .. import logger as logger_module
+from ..logger import configure, get_logger, redact, LazyJson
+
+
+class _Exploding:
+    def __str__(self):
+        raise AssertionError("꺼진 레벨에서 직렬화됨")
+
+
+class TestLogger(unittest.TestCase):
+    def tearDown(self):
+        configure()
+
+    def _capture(self, fn):
+        buffer = io.StringIO()
+        with contextlib.redirect_stderr(buffer):
+            fn()
+        return buffer.getvalue()
+
+    def test_disabled_level_does_no_formatting(self):
+        """INFO 레벨에서는 debug 호출의 필드를 직렬화하지 않는지 확인"""
+        configure(level='INFO', fmt='text')
+        log = get_logger('test')
+        output = self._capture(lambda: log.debug('응답', response=_Exploding(), dump=LazyJson(_Exploding())))
+        self.assertEqual(output, '')
+
+    def test_fields_and_redaction(self):
+        """구조화 필드 출력과 세션 ID 가림 확인"""
+        configure(level='DEBUG', fmt='json')
+        log = get_logger('test')
+        output = self._capture(lambda: log.info('쿠키 TXPPsessionID=abcdef1234567890', page=2,
+                                                header='WMONID=zzzzzzzzzz; other=1'))
+        entry = json.loads(output)
+        self.assertEqual(entry['logger'], 'hometax.test')
+        self.assertEqual(entry['page'], '2')
+        self.assertNotIn('abcdef1234567890', output)
+        self.assertNotIn('zzzzzzzzzz', output)
+        self.assertIn('other=1', entry['header'])
+
+    def test_second_module_copy_does_not_add_handler(self):
+        """같은 파일이 다른 모듈 이름으로 한 번 더 로드되어도 출력 핸들러가 하나인지 확인"""
+        spec = importlib.util.spec_from_file_location('hometax_logger_copy', logger_module.__file__)
+        copy = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(copy)
+        copy.configure(level='INFO', fmt='text')
+
+        output = self._capture(lambda: copy.get_logger('test').info('한 번만'))
+        self.assertEqual(output.count('한 번만'), 1)
+        handlers = logging.getLogger('hometax').handlers
+        self.assertEqual(sum(1 for h in handlers if getattr(h, logger_module._HANDLER_TAG, False)), 1)
+
+    def test_redact_leaves_ordinary_text(self):
+        self.assertEqual(redact('clients: 5, page=2'), 'clients: 5, page=2')
+        self.assertEqual(redact('TEHTsessionID: short'), 'TEHTsessionID: ***')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+import requests
+from requests.adapters import BaseAdapter
+
+from ..metrics import RequestMetrics, endpoint_name, instrument_session
+
+
+class _FakeAdapter(BaseAdapter):
+    """네트워크 없이 고정 응답을 돌려주는 어댑터"""
+
+    def __init__(self, body: bytes, status: int = 200):
+        super().__init__()
+        self.body = body
+        self.status = status
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = self.body
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+class TestRequestMetrics(unittest.TestCase):
+    def test_endpoint_name(self):
+        self.assertEqual(endpoint_name("https://hometax.go.kr/wqAction.do?actionId=ATTABZAA001R08&screenId=UTEABAAA13"),
+                         "wqAction.do:ATTABZAA001R08")
+        self.assertEqual(endpoint_name("https://teht.hometax.go.kr/permission.do", {"screenId": "UTEABHAA03"}),
+                         "permission.do:UTEABHAA03")
+        self.assertEqual(endpoint_name("https://hometax.go.kr/pubcLogin.do"), "pubcLogin.do")
+
+    def test_percentiles(self):
+        metrics = RequestMetrics()
+        for ms in range(1, 101):
+            metrics.record("wqAction.do:A", ms / 1000, size=10)
+        metrics.record("wqAction.do:A", 0.5, status=500, overload=True)
+
+        entry = metrics.summary()["wqAction.do:A"]
+        self.assertEqual(entry["count"], 101)
+        self.assertEqual(entry["p50_ms"], 51.0)
+        self.assertEqual(entry["p99_ms"], 100.0)
+        self.assertEqual(entry["max_ms"], 500.0)
+        self.assertEqual((entry["errors"], entry["overloads"], entry["bytes"]), (1, 1, 1000))
+
+        text = metrics.prometheus_text()
+        self.assertIn('hometax_request_duration_seconds{endpoint="wqAction.do:A",quantile="0.5"} 0.051000', text)
+        self.assertIn('hometax_request_duration_seconds_count{endpoint="wqAction.do:A"} 101', text)
+        self.assertIn('hometax_request_overload_total{endpoint="wqAction.do:A"} 1', text)
+
+    def test_instrumented_session_records_every_call(self):
+        """응답 훅이 한 번만 달리고 과부하 응답을 구분하는지 확인"""
+        metrics = RequestMetrics()
+        session = requests.Session()
+        session.mount("https://", _FakeAdapter("과부하제어 60초".encode("utf-8")))
+        instrument_session(session, metrics)
+        instrument_session(session, metrics)
+
+        session.post("https://hometax.go.kr/wqAction.do", params={"actionId": "ATEABHAA001R01"})
+        session.post("https://hometax.go.kr/wqAction.do", params={"actionId": "ATEABHAA001R01"})
+
+        entry = metrics.summary()["wqAction.do:ATEABHAA001R01"]
+        self.assertEqual(entry["count"], 2)
+        self.assertEqual(entry["overloads"], 2)
+        self.assertEqual(entry["bytes"], 2 * len("과부하제어 60초".encode("utf-8")))
+
+
+if __name__ == "__main__":
+    unittest.main()
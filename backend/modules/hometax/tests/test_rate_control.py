@@ -0,0 +1,40 @@
+import unittest
+
+from ..rate_control import AimdRateController, get_rate_controller, is_overload_response, rate_controller_metrics
+
+
+class TestRateControl(unittest.TestCase):
+    def test_overload_detection(self):
+        """과부하제어 안내 문구를 str/bytes 모두에서 찾는지 확인"""
+        self.assertTrue(is_overload_response("과부하제어 중입니다. 60초 후 다시 시도하세요"))
+        self.assertTrue(is_overload_response("과부하제어".encode("utf-8")))
+        self.assertFalse(is_overload_response('{"dltList": []}'))
+
+    def test_additive_increase(self):
+        """success_window번 연속 성공하면 increase_step만큼 속도가 오르는지 확인"""
+        controller = AimdRateController(initial_rate=2.0, increase_step=0.5, success_window=3)
+        for _ in range(3):
+            controller.on_success()
+        self.assertEqual(controller.current_rate, 2.5)
+        self.assertEqual(controller.metrics()["best_sustained_rate"], 2.0)
+
+    def test_multiplicative_decrease_and_pause(self):
+        """과부하 시 속도가 절반이 되고 쉬는 시간이 연속 횟수에 비례하는지 확인"""
+        controller = AimdRateController(initial_rate=4.0, min_rate=1.5, overload_pause=2.0, max_pause=3.0)
+        self.assertEqual(controller.on_overload(), 2.0)
+        self.assertEqual(controller.current_rate, 2.0)
+        self.assertEqual(controller.on_overload(), 3.0)
+        self.assertEqual(controller.current_rate, 1.5)
+        controller.on_success()
+        self.assertEqual(controller.metrics()["consecutive_overload"], 0)
+
+    def test_registry_shares_controller_per_key(self):
+        """같은 키는 같은 제어기를 공유하는지 확인"""
+        first = get_rate_controller("test-cert-a.p12", initial_rate=3.0)
+        self.assertIs(get_rate_controller("test-cert-a.p12"), first)
+        self.assertIsNot(get_rate_controller("test-cert-b.p12"), first)
+        self.assertIn("test-cert-a.p12", rate_controller_metrics())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,39 @@
+import json
 import unittest
+
+import requests
+from requests.adapters import BaseAdapter
+
+from ..rate_control import AimdRateController
 from ..reports.report_collector import HometaxTaxReportCollector
 from ..reports.constants import TAX_MAP
 
+
+class _EchoAdapter(BaseAdapter):
+    """요청 본문의 세목 코드를 행으로 돌려주는 가짜 어댑터 (failing 세목 코드는 HTTP 500)"""
+
+    def __init__(self, failing=()):
+        super().__init__()
+        self.failing = set(failing)
+        self.bodies = []
+
+    def send(self, request, **kwargs):
+        body, _ = json.JSONDecoder().raw_decode(request.body.decode("utf-8"))  # 본문 뒤에 nts 토큰이 붙음
+        self.bodies.append(body)
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        if body["itrfCd"] in self.failing:
+            response.status_code, response._content = 500, b""
+        else:
+            response.status_code = 200
+            response._content = json.dumps({"dltList": [{"itrfCd": body["itrfCd"], "txprRgtNo": body["txprRgtNo"]}]}).encode("utf-8")
+        return response
+
+    def close(self):
+        pass
+
+
 class TestReportCollector(unittest.TestCase):
     def setUp(self):
         # 테스트용 가짜 세션 정보
@@ -23,5 +55,27 @@ class TestReportCollector(unittest.TestCase):
         self.assertTrue(len(token) > 20)
         self.assertTrue(token[0:2].isdigit())
 
+    def test_collect_client_all_taxes(self):
+        """한 거래처의 여러 세목을 한 번에 조회하고 세목별 결과를 묶는지 확인"""
+        collector = HometaxTaxReportCollector(cookies=self.cookies, pubc_user_no=self.pubc_user_no,
+                                              rate_controller=AimdRateController(initial_rate=1000, max_rate=1000))
+        adapter = _EchoAdapter(failing={TAX_MAP["법인세"]["itrf_cd"]})
+        collector.session.mount("https://", adapter)
+
+        result = collector.collect_client_all_taxes("1000000001", "20240101", "20251231", taxes=["원천세", "법인세", "부가세"])
+
+        self.assertEqual(result["status"], "partial")
+        self.assertEqual(list(result["results"]), ["원천세", "법인세", "부가세"])
+        self.assertEqual(result["failed"], ["법인세"])
+        self.assertEqual(result["count"], 2)
+        self.assertEqual(result["results"]["부가세"]["data"][0]["itrfCd"], "41")
+        self.assertEqual({(b["txprRgtNo"], b["rtnDtSrt"], b["rtnDtEnd"]) for b in adapter.bodies},
+                         {("1000000001", "20240101", "20251231")})
+
+        # 템플릿은 세목별로 한 번만 구성되고 조회 값이 섞이지 않음
+        collector.collect_client_all_taxes("1000000002", "20250101", "20250131", taxes=["원천세"])
+        self.assertIs(collector._request_template("원천세"), collector._request_template("원천세"))
+        self.assertEqual(adapter.bodies[-1]["txprRgtNo"], "1000000002")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,44 @@
+import json
+import unittest
+
+from ..request_template import RequestTemplate, make_nts
+
+
+class TestRequestTemplate(unittest.TestCase):
+    def setUp(self):
+        self.body = {
+            "itrfCd": "14",
+            "pubcUserNo": "12345678",
+            "rtnDtSrt": "",
+            "txprRgtNo": "",
+            "pageInfoVO": {"pageNum": "1", "pageSize": "200"},
+        }
+
+    def test_render_matches_json_dumps(self):
+        """렌더링 결과가 값을 채운 본문의 json.dumps + nts와 같은지 확인"""
+        template = RequestTemplate("https://teht.hometax.go.kr/wqAction.do", {"actionId": "A"}, {"Content-Type": "x"},
+                                   self.body, fields=("txprRgtNo", "rtnDtSrt", "pageInfoVO.pageNum"))
+        values = {"txprRgtNo": '12"3\\한글', "rtnDtSrt": "20240101", "pageInfoVO.pageNum": "3"}
+
+        expected = json.loads(json.dumps(self.body))
+        expected.update(txprRgtNo=values["txprRgtNo"], rtnDtSrt=values["rtnDtSrt"])
+        expected["pageInfoVO"]["pageNum"] = "3"
+        self.assertEqual(template.render(values, "NTS"), (json.dumps(expected, ensure_ascii=False) + "NTS").encode("utf-8"))
+
+        # 원본 본문은 바뀌지 않음
+        self.assertEqual(self.body["txprRgtNo"], "")
+
+    def test_nts_is_generated_when_omitted(self):
+        template = RequestTemplate("u", None, {}, self.body, fields=("txprRgtNo",))
+        rendered = template.render({"txprRgtNo": "1"}).decode("utf-8")
+        body, end = json.JSONDecoder().raw_decode(rendered)
+        self.assertEqual(body["txprRgtNo"], "1")
+        self.assertEqual(len(rendered[end:]), len(make_nts()))
+
+    def test_unknown_field(self):
+        with self.assertRaises(KeyError):
+            RequestTemplate("u", None, {}, self.body, fields=("missing",))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from ..reports.result_store import ReportResultStore
+
+
+def _res(rows, status="success"):
+    return {"status": status, "count": len(rows), "data": rows, "raw": {"dltList": rows, "resultCnt": len(rows)}}
+
+
+class TestReportResultStore(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store = ReportResultStore(Path(self._tmp.name) / "results.sqlite3")
+
+    def tearDown(self):
+        self.store.close()
+        self._tmp.cleanup()
+
+    def test_rows_are_normalized_and_queryable(self):
+        rows = [{"txnrmYm": "202501", "amt": 1}, {"txnrmYm": "202502", "amt": 2}]
+        query_id = self.store.save_result(_res(rows), "123", "원천세", "20250101", "20250228", cert_path="a.p12")
+        self.store.save_result(_res([]), "456", "원천세", "20250101", "20250228", cert_path="a.p12")
+        self.store.save_result({"status": "error", "error": "HTTP 500", "count": 0}, "789", "원천세", "20250101", "20250228")
+
+        february = self.store.rows(tax_name="원천세", month_from="202502")
+        self.assertEqual([(r["_biz_no"], r["amt"]) for r in february], [("123", 2)])
+        self.assertEqual(len(self.store.rows(cert_path="a.p12")), 2)
+        self.assertEqual(self.store.raw_response(query_id)["resultCnt"], 2)
+        self.assertEqual([q["biz_no"] for q in self.store.queries(status="error")], ["789"])
+
+    def test_requery_replaces_rows_and_dedups_raw(self):
+        rows = [{"txnrmYm": "202501", "amt": 1}]
+        self.store.save_result(_res(rows), "123", "원천세", "20250101", "20250131")
+        self.store.save_result(_res(rows), "123", "원천세", "20250101", "20250131")
+        # 기간이 겹치는 새 조회는 같은 월 행을 교체
+        self.store.save_result(_res([{"txnrmYm": "202501", "amt": 9}]), "123", "원천세", "20241201", "20250131")
+
+        self.assertEqual([r["amt"] for r in self.store.rows(biz_no="123")], [9])
+        stats = self.store.stats()
+        self.assertEqual(stats["queries"], 2)
+        self.assertEqual(stats["responses"], 2)
+
+    def test_failed_requery_keeps_previous_success(self):
+        """성공한 기간을 다시 조회하다 실패해도 이전 행/요약이 남는지 확인"""
+        query_id = self.store.save_result(_res([{"txnrmYm": "202501", "amt": 1}]), "123", "원천세", "20250101", "20250131")
+        kept = self.store.save_result({"status": "overload", "error": "HTTP 503", "count": 0}, "123", "원천세", "20250101", "20250131")
+
+        self.assertEqual(kept, query_id)
+        self.assertEqual(self.store.stats()["report_rows"], 1)
+        self.assertEqual(self.store.coverage_matrix()["123"]["원천세"]["state"], "success")
+        self.assertEqual([(a["status"], a["error"]) for a in self.store.failed_attempts(query_id)], [("overload", "HTTP 503")])
+        self.assertEqual(self.store.queries(status="success")[0]["id"], query_id)
+
+    def test_rows_without_month_are_replaced_by_overlapping_query(self):
+        self.store.save_result(_res([{"amt": 1}]), "123", "종소세", "20250101", "20250630")
+        self.store.save_result(_res([{"amt": 2}]), "123", "종소세", "20250401", "20251231")
+        self.store.save_result(_res([{"amt": 3}]), "123", "종소세", "20260101", "20261231")
+
+        self.assertEqual(sorted(r["amt"] for r in self.store.rows(biz_no="123")), [2, 3])
+
+    def test_rows_from_other_filing_windows_are_kept(self):
+        """과세연월이 이번 조회 기간 안이라도 겹치지 않는 기간에 신고된 행은 지우지 않는지 확인"""
+        # 2024년 1월에 신고된 2023년 12월 귀속분
+        self.store.save_result(_res([{"txnrmYm": "202312", "amt": 1}]), "123", "원천세", "20240101", "20240131")
+        # 2023년 11~12월 신고분 (과세연월이 조회 기간보다 앞선 행 포함)
+        self.store.save_result(_res([{"txnrmYm": "202310", "amt": 2}, {"txnrmYm": "202311", "amt": 3}]),
+                               "123", "원천세", "20231101", "20231231")
+
+        self.assertEqual(sorted(r["amt"] for r in self.store.rows(biz_no="123")), [1, 2, 3])
+
+    def test_analysis_queries(self):
+        """저장 시점에 갱신된 요약으로 성공/실패/수임 상태별 집계가 되는지 확인"""
+        self.store.save_result(_res([{"txnrmYm": "202501"}]), "111", "원천세", "20250101", "20250331")
+        self.store.save_result(_res([]), "222", "원천세", "20250101", "20250331")
+        self.store.save_result(_res([{"txnrmYm": "202503"}]), "222", "부가세", "20250101", "20250331")
+        self.store.register_clients([
+            {"bsno": "111", "_engagementStatus": "수임중"},
+            {"bsno": "222", "_engagementStatus": "해지중"},
+            {"bsno": "333", "_engagementStatus": "수임중"},
+            {"resno": "", "_engagementStatus": "수임중"},
+        ])
+
+        self.assertEqual(self.store.successes("원천세"), {"111"})
+        self.assertEqual(self.store.failures("원천세"), {"222"})
+        self.assertEqual(self.store.successes("원천세", "202502", "202503"), set())
+        self.assertEqual(self.store.failures_by_engagement_status("원천세"), {
+            "수임중": {"total": 2, "success": 1, "failed": 0, "no_biz_no": 1, "not_queried": 1},
+            "해지중": {"total": 1, "success": 0, "failed": 1, "no_biz_no": 0, "not_queried": 0},
+        })
+        matrix = self.store.coverage_matrix()
+        self.assertEqual(matrix["222"]["원천세"]["state"], "empty")
+        self.assertEqual(matrix["222"]["부가세"]["last_month"], "202503")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from ..reports.incremental import group_rows_by_month
+from ..reports.row_schema import RowSchemaCache, extract_rows_by_month, row_schema_cache, schema_key
+
+
+class TestRowSchemaCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = RowSchemaCache()
+        self.key = schema_key("ATERNABA016R01", "14")
+
+    def test_learns_rows_key_and_month_field(self):
+        response = {"resultMsg": {"code": "S"}, "dltList": [{"pymnYm": "202501", "rtnYm": "202412"}]}
+        rows, month_field = self.cache.extract(response, self.key)
+        self.assertEqual(rows, response["dltList"])
+        self.assertEqual(month_field, "pymnYm")
+        self.assertEqual(self.cache.get(self.key), ("dltList", "pymnYm"))
+
+        # 캐시 적중: 같은 키를 바로 읽음
+        response = {"dltList": [{"pymnYm": "202502"}, {"pymnYm": "202503"}]}
+        rows, month_field = self.cache.extract(response, self.key)
+        self.assertIs(rows, response["dltList"])
+        self.assertEqual(set(group_rows_by_month(rows, month_field)), {"202502", "202503"})
+
+    def test_empty_response_is_not_cached(self):
+        rows, month_field = self.cache.extract({"dltList": [], "other": []}, self.key)
+        self.assertEqual((rows, month_field), ([], None))
+        self.assertIsNone(self.cache.get(self.key))
+
+    def test_rediscovers_when_schema_changes(self):
+        self.cache.extract({"dltList": [{"txnrmYm": "202501"}]}, self.key)
+        rows, month_field = self.cache.extract({"dltOther": [{"rtnYm": "202409"}]}, self.key)
+        self.assertEqual(rows, [{"rtnYm": "202409"}])
+        self.assertEqual(self.cache.get(self.key), ("dltOther", "rtnYm"))
+
+    def test_discovery_order_matches_previous_extraction(self):
+        """행이 있는 dlt 키 > 딕셔너리 리스트 키 > 빈 dlt 키"""
+        rows, _ = self.cache.extract({"dltEmpty": [], "items": [{"rtnYm": "202401"}]})
+        self.assertEqual(rows, [{"rtnYm": "202401"}])
+
+    def test_known_field_falls_back_for_rows_without_it(self):
+        rows = [{"pymnYm": "202501"}, {"pymnYm": "", "rtnYm": "202412"}, {"pymnYm": "2025"}]
+        self.assertEqual(group_rows_by_month(rows, "pymnYm"), {"202501": [rows[0]], "202412": [rows[1]]})
+
+    def test_extraction_returns_month_index(self):
+        response = {"dltList": [{"pymnYm": "202502"}, {"pymnYm": ""}, {"pymnYm": "202501"}, {"pymnYm": "202502"}]}
+        row_schema_cache().clear()  # 다른 테스트가 같은 키로 채운 공용 캐시를 비움
+        self.addCleanup(row_schema_cache().clear)
+        rows, month_field, monthly_index = extract_rows_by_month(response, self.key)
+        self.assertEqual(month_field, "pymnYm")
+        self.assertEqual(monthly_index, {"202502": [0, 3], "202501": [2]})
+
+        # 병합 시에는 행의 연월 필드를 다시 읽지 않고 index로 묶음
+        for row in rows:
+            row.clear()
+        self.assertEqual(group_rows_by_month(rows, month_field, monthly_index),
+                         {"202502": [rows[0], rows[3]], "202501": [rows[2]]})
+
+
+if __name__ == "__main__":
+    unittest.main()
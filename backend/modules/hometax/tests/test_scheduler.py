@@ -0,0 +1,83 @@
+import time
+import threading
+import unittest
+from unittest import mock
+
+from ..rate_control import get_rate_controller
+from ..reports import scheduler as scheduler_module
+from ..reports.scheduler import CertificateJob, MultiCertificateScheduler, ProgressTracker
+
+
+class TestScheduler(unittest.TestCase):
+    def test_certificates_run_in_parallel(self):
+        """인증서별 작업이 동시에 실행되는지 확인"""
+        jobs = [CertificateJob(f"cert{i}", f"/tmp/cert{i}.p12", "pw", [{"bsno": str(i)}]) for i in range(3)]
+        barrier = threading.Barrier(3, timeout=2)
+
+        def worker(job, throttle, progress):
+            barrier.wait()  # 3개가 동시에 실행되지 않으면 타임아웃
+            progress.add("api_calls")
+            progress.unit_done()
+            return job.cert_name
+
+        progress = ProgressTracker(total_units=3, report_every=0)
+        results = MultiCertificateScheduler(max_workers=3).run(jobs, worker, progress)
+
+        self.assertEqual({name: r["result"] for name, r in results.items()}, {"cert0": "cert0", "cert1": "cert1", "cert2": "cert2"})
+        self.assertEqual(progress.snapshot()["api_calls"], 3)
+
+    def test_rate_controller_is_shared_by_user_no(self):
+        """로그인 사용자(pubcUserNo)별로 목록/신고현황 조회와 같은 제어기를 쓰는지 확인"""
+        scheduler = MultiCertificateScheduler(min_interval=0.5)
+        controller = scheduler.rate_controller("sched-user-1")
+        self.assertIs(controller, get_rate_controller("sched-user-1"))
+        self.assertIsNot(controller, scheduler.rate_controller("sched-user-2"))
+        self.assertEqual(controller.current_rate, 2.0)
+
+    def test_failure_is_isolated(self):
+        """한 인증서의 예외가 다른 인증서 결과에 영향을 주지 않는지 확인"""
+        jobs = [CertificateJob("ok", "/tmp/ok.p12", "pw"), CertificateJob("bad", "/tmp/bad.p12", "pw")]
+
+        def worker(job, throttle, progress):
+            if job.cert_name == "bad":
+                raise RuntimeError("login failed")
+            return "done"
+
+        results = MultiCertificateScheduler(max_workers=2).run(jobs, worker, ProgressTracker(report_every=0))
+        self.assertTrue(results["ok"]["success"])
+        self.assertFalse(results["bad"]["success"])
+        self.assertIn("login failed", results["bad"]["error"])
+
+    def test_interrupt_stops_workers_and_cancels_pending(self):
+        """Ctrl-C 시 실행 중인 워커는 단위 사이에서 멈추고 대기 중인 인증서는 시작하지 않는지 확인"""
+        jobs = [CertificateJob(f"cert{i}", f"/tmp/cert{i}.p12", "pw", list(range(100))) for i in range(3)]
+        scheduler = MultiCertificateScheduler(max_workers=1)
+        started = threading.Event()
+        ran, finished = [], threading.Event()
+
+        def worker(job, throttle, progress):
+            ran.append(job.cert_name)
+            for _ in job.clients:
+                if scheduler.stop_event.is_set():
+                    break
+                started.set()
+                time.sleep(0.01)
+                progress.unit_done()
+            finished.set()
+
+        def interrupted(futures):
+            started.wait(2)
+            raise KeyboardInterrupt
+
+        progress = ProgressTracker(report_every=0)
+        with mock.patch.object(scheduler_module, "as_completed", interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                scheduler.run(jobs, worker, progress)
+
+        self.assertTrue(finished.wait(2))
+        self.assertEqual(ran, ["cert0"])
+        self.assertLess(progress.snapshot()["done_units"], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import requests
+
+from ..auth.session_cache import HometaxSessionCache
+
+
+class TestSessionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+        self.session = requests.Session()
+        self.session.cookies.set("TXPPsessionID", "secret-session", domain=".hometax.go.kr", path="/")
+        self.info = {"pubcUserNo": "12345678", "txaaAdmNo": "A0001"}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """저장한 세션이 쿠키와 세션 정보까지 복원되는지 확인"""
+        cache = HometaxSessionCache(cache_dir=self.cache_dir, probe=lambda s: True, encryption_key="k")
+        cache.save("abc123", self.session, self.info, "pw1234")
+
+        restored = cache.load("abc123", "pw1234")
+        self.assertIsNotNone(restored)
+        self.assertEqual(restored["pubcUserNo"], "12345678")
+        self.assertEqual(restored["txaaAdmNo"], "A0001")
+        self.assertEqual(restored["cookies"]["TXPPsessionID"], "secret-session")
+
+    def test_encrypted_at_rest(self):
+        """디스크에 평문 쿠키나 시리얼이 남지 않는지 확인"""
+        cache = HometaxSessionCache(cache_dir=self.cache_dir, probe=lambda s: True, encryption_key="k")
+        cache.save("abc123", self.session, self.info, "pw1234")
+
+        files = list(self.cache_dir.iterdir())
+        self.assertEqual(len(files), 1)
+        self.assertNotIn("abc123", files[0].name)
+        content = files[0].read_bytes()
+        self.assertNotIn(b"secret-session", content)
+        self.assertNotIn(b"12345678", content)
+
+        # 다른 키로는 복원할 수 없음
+        other = HometaxSessionCache(cache_dir=self.cache_dir, probe=lambda s: True, encryption_key="other")
+        self.assertIsNone(other.load("abc123", "pw1234"))
+
+    def test_ttl_expired(self):
+        """TTL이 지난 세션은 probe 없이 폐기되는지 확인"""
+        probed = []
+        cache = HometaxSessionCache(cache_dir=self.cache_dir, ttl_seconds=0, probe=lambda s: probed.append(s) or True, encryption_key="k")
+        cache.save("abc123", self.session, self.info, "pw1234")
+        time.sleep(0.01)
+
+        self.assertIsNone(cache.load("abc123", "pw1234"))
+        self.assertEqual(probed, [])
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+
+    def test_dead_session_invalidated(self):
+        """probe가 실패하면 캐시를 지우는지 확인"""
+        cache = HometaxSessionCache(cache_dir=self.cache_dir, probe=lambda s: False, encryption_key="k")
+        cache.save("abc123", self.session, self.info, "pw1234")
+
+        self.assertIsNone(cache.load("abc123", "pw1234"))
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+
+    def test_wrong_password_does_not_get_cached_session(self):
+        """비밀번호가 다르면 세션을 돌려주지 않고, 캐시도 지우지 않는지 확인"""
+        cache = HometaxSessionCache(cache_dir=self.cache_dir, probe=lambda s: True, encryption_key="k")
+        cache.save("abc123", self.session, self.info, "pw1234")
+
+        self.assertIsNone(cache.load("abc123", "wrong"))
+        self.assertIsNotNone(cache.load("abc123", "pw1234"))
+
+    def test_disabled_without_encryption_key(self):
+        """암호화 키가 없으면 기본 키로 저장하지 않는지 확인"""
+        with mock.patch.dict(os.environ, {"AXCEL_ENCRYPTION_KEY": ""}):
+            cache = HometaxSessionCache(cache_dir=self.cache_dir, probe=lambda s: True)
+        self.assertFalse(cache.enabled)
+        cache.save("abc123", self.session, self.info, "pw1234")
+
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+        self.assertIsNone(cache.load("abc123", "pw1234"))
+
+
+if __name__ == '__main__':
+    unittest.main()
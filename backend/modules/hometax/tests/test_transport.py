@@ -0,0 +1,56 @@
+import unittest
+
+from urllib3.exceptions import ReadTimeoutError
+
+from .. import transport
+from ..metrics import RequestMetrics, instrument_session
+
+
+class TestTransport(unittest.TestCase):
+    def tearDown(self):
+        transport.configure_transport()
+
+    def test_sessions_share_one_pool(self):
+        """세션마다 쿠키는 따로, 연결 풀은 공유하는지 확인"""
+        first = transport.create_session()
+        second = transport.create_session()
+        adapter = transport.shared_adapter()
+
+        self.assertIs(first.get_adapter("https://teht.hometax.go.kr/wqAction.do"), adapter)
+        self.assertIs(second.get_adapter("https://hometax.go.kr/permission.do"), adapter)
+        self.assertIsNot(first.cookies, second.cookies)
+
+        # 세션 하나를 닫아도 공용 풀은 유지
+        pool = adapter.poolmanager.connection_from_url("https://teht.hometax.go.kr")
+        first.close()
+        self.assertIs(adapter.poolmanager.connection_from_url("https://teht.hometax.go.kr"), pool)
+
+    def test_configure_pool_and_retry(self):
+        adapter = transport.configure_transport(pool_maxsize=32)
+        self.assertIs(transport.shared_adapter(), adapter)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter.max_retries.connect, 2)
+        self.assertEqual(adapter.max_retries.read, 1)
+        self.assertNotIn("POST", adapter.max_retries.allowed_methods)
+
+    def test_read_retry_only_for_query_posts(self):
+        """읽기 오류 시 조회(wqAction.do) POST만 다시 보내고 로그인 POST는 다시 보내지 않는지 확인"""
+        error = ReadTimeoutError(None, "/", "read timed out")
+        retry = transport.default_retry()
+
+        self.assertEqual(retry.increment("POST", "/wqAction.do?actionId=ATTABZAA001R08", error=error).read, 0)
+        self.assertEqual(retry.increment("GET", "/permission.do", error=error).read, 0)
+        for url in ("/pubcLogin.do?domain=hometax.go.kr", "/token.do"):
+            with self.assertRaises(ReadTimeoutError):
+                retry.increment("POST", url, error=error)
+
+    def test_instrumentation_is_optional(self):
+        self.assertFalse(transport.create_session(instrument=False).hooks["response"])
+        session = transport.create_session()
+        self.assertEqual(len(session.hooks["response"]), 1)
+        instrument_session(session, RequestMetrics())
+        self.assertEqual(len(session.hooks["response"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+홈택스 HTTP 전송 계층 (공용 연결 풀)
+hometax.go.kr / teht.hometax.go.kr 호출이 프로세스 안에서 하나의 HTTPAdapter(연결 풀)를 공유하도록 합니다.
+세션(쿠키 저장소)은 인증서마다 따로 두고 연결만 공유하므로, 수천 건의 신고현황 조회가
+매번 TLS 핸드셰이크를 하지 않고 몇 개의 유지된 연결을 돌려 씁니다.
+
+연결 단계 오류와 유지 연결이 서버 쪽에서 끊긴(connection reset) 경우에만 짧게 재시도합니다.
+읽기 단계 오류는 조회 요청(wqAction.do)만 다시 보냅니다. 로그인(pubcLogin.do), SSO, token.do 같은
+POST는 서버에서 이미 처리되었을 수 있으므로 다시 보내지 않습니다.
+HTTP 상태 코드 재시도는 하지 않습니다 (과부하제어는 rate_control이 처리).
+
+사용 예:
+    session = create_session()                 # 로그인/거래처/신고현황 공용
+    response = post(url, data=..., cookies=c)  # requests.post 대체 (쿠키는 호출마다 독립)
+"""
+
+import threading
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .metrics import instrument_session
+
+# 호스트별로 유지할 연결 수 (인증서 워커 4 × 인증서당 동시 요청 4)
+DEFAULT_POOL_MAXSIZE = 16
+# 연결 풀을 캐시할 호스트 수 (hometax.go.kr, teht.hometax.go.kr, www.hometax.go.kr 등)
+DEFAULT_POOL_CONNECTIONS = 8
+
+
+# 읽기 오류 시 POST도 다시 보내도 되는 조회 경로
+QUERY_PATHS = ('/wqAction.do',)
+
+
+class QueryRetry(Retry):
+    """
+    읽기 오류 재시도는 urllib3 기본값(멱등 메서드)만 허용하되,
+    조회 경로(QUERY_PATHS)로 가는 POST는 예외로 다시 보내는 재시도 정책
+    """
+
+    def increment(self, method=None, url=None, *args, **kwargs):
+        if (method and method.upper() == 'POST' and url and urlsplit(url).path.endswith(QUERY_PATHS)
+                and self.allowed_methods is not None and 'POST' not in self.allowed_methods):
+            retry = self.new(allowed_methods=frozenset(self.allowed_methods) | {'POST'})
+            return retry.increment(method, url, *args, **kwargs)
+        return super().increment(method, url, *args, **kwargs)
+
+
+def default_retry() -> Retry:
+    """
+    연결 실패와 끊긴 유지 연결만 재시도하는 정책
+    읽기 단계 오류는 멱등 메서드와 조회 요청(wqAction.do POST)만 한 번 다시 보냅니다.
+    """
+    return QueryRetry(
+        total=3,
+        connect=2,
+        read=1,
+        status=0,
+        other=0,
+        redirect=5,
+        backoff_factor=0.2,
+        raise_on_status=False,
+    )
+
+
+class _SharedAdapter(HTTPAdapter):
+    """여러 세션에 함께 마운트되는 어댑터. 세션 하나가 닫혀도 다른 세션의 연결 풀은 유지합니다."""
+
+    def close(self):
+        pass
+
+    def close_pools(self):
+        super().close()
+
+
+_adapter: Optional[_SharedAdapter] = None
+_adapter_lock = threading.Lock()
+
+
+def configure_transport(
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    max_retries: Optional[Retry] = None
+) -> HTTPAdapter:
+    """
+    공용 연결 풀을 (다시) 만듭니다. 이후 create_session()으로 만든 세션부터 적용됩니다.
+    동시 요청 수가 pool_maxsize를 넘으면 넘는 만큼은 연결을 새로 열고 반납 시 닫습니다.
+    """
+    global _adapter
+    adapter = _SharedAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries or default_retry()
+    )
+    with _adapter_lock:
+        previous, _adapter = _adapter, adapter
+    if previous is not None:
+        previous.close_pools()
+    return adapter
+
+
+def shared_adapter() -> HTTPAdapter:
+    """공용 연결 풀 어댑터 (없으면 기본 설정으로 생성)"""
+    global _adapter
+    with _adapter_lock:
+        if _adapter is None:
+            _adapter = _SharedAdapter(
+                pool_connections=DEFAULT_POOL_CONNECTIONS,
+                pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                max_retries=default_retry()
+            )
+        return _adapter
+
+
+def create_session(instrument: bool = True) -> requests.Session:
+    """
+    공용 연결 풀을 쓰는 새 세션. 쿠키 저장소는 세션마다 독립입니다.
+
+    Args:
+        instrument: 요청 계측(metrics) 훅을 달지 여부
+    """
+    session = requests.Session()
+    adapter = shared_adapter()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if instrument:
+        instrument_session(session)
+    return session
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """requests.post와 같지만 공용 연결 풀을 사용합니다 (호출마다 독립된 쿠키 저장소)."""
+    return create_session().post(url, **kwargs)
@@ -2,49 +2,142 @@
 """
 위택스용 인증서 서명 모듈
 pypinksign을 사용하여 PKCS7 서명 생성
+
+명령어:
+    validate <cert_path> <password>                 인증서 검증
+    sign <cert_path> <password> <message_base64>    메시지 1건 서명
+    sign-batch <cert_path> <password>               stdin의 base64 메시지(줄 단위)를 모두 서명
+    serve [--socket PATH]                           상주 모드: NDJSON 요청을 stdin(또는 Unix 소켓)으로 받아 처리
+
+상주 모드 요청/응답 (한 줄에 JSON 하나, id는 그대로 돌려줌):
+    {"id": 1, "op": "validate", "cert_path": ..., "password": ...}                  -> {"id": 1, "status": "OK"}
+    {"id": 2, "op": "sign", "cert_path": ..., "password": ..., "message": b64}       -> {"id": 2, "signed": b64}
+    {"id": 3, "op": "sign_batch", "cert_path": ..., "password": ..., "messages": [b64, ...]}
+                                                                                      -> {"id": 3, "signed": [b64, ...]}
+    {"id": 4, "op": "close"}                                                          -> {"id": 4, "status": "OK"} 후 종료
+    실패 시 {"id": ..., "error": "..."}
+인증서는 키링에 한 번만 복호화되어 유지되므로 같은 회사의 문서 여러 건을 서명할 때 프로세스 생성/키 복호화 비용이 없습니다.
 """
 import sys
 import json
 import base64
+from pathlib import Path
 from pypinksign import PinkSign
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from contextlib import contextmanager
+from typing import IO, ContextManager, Dict, Iterable, Iterator, List, Optional
 
-def load_certificate(cert_path: str, password: str) -> PinkSign:
-    """인증서 로드"""
-    with open(cert_path, 'rb') as f:
-        p12_data = f.read()
-    
-    sign = PinkSign(
-        p12_data=p12_data,
-        prikey_password=password.encode('utf-8')
-    )
-    return sign
-
-def validate_cert_expiry(sign: PinkSign) -> None:
-    """인증서 만료일 검증"""
+# 스크립트로 실행되므로 modules 경로를 추가하여 공용 키링 import
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from certificate.keyring import certificate_keyring
+
+def load_certificate(cert_path: str, password: str) -> ContextManager[PinkSign]:
+    """인증서 대여 (with 블록 동안 사용, 키링: 같은 프로세스에서는 한 번만 복호화)"""
+    return certificate_keyring().p12(cert_path, password)
+
+def validate_cert_expiry(sign: PinkSign, verbose: bool = True) -> None:
+    """
+    인증서 만료일 검증 (만료되었으면 ValueError)
+    만료일을 읽지 못하면 경고만 출력하고 계속 진행합니다.
+    """
     try:
-        # pypinksign의 인증서 정보 확인
-        if hasattr(sign, 'cert') and sign.cert:
-            cert = sign.cert
-            # 만료일 확인
-            not_after = cert.not_valid_after
-            now = datetime.now()
-            if now > not_after:
-                raise ValueError(f"인증서가 만료되었습니다. 만료일: {not_after}")
-            print(f"인증서 만료일: {not_after}", file=sys.stderr)
+        # pypinksign: (not_before, not_after), UTC
+        not_after = sign.valid_date()[1]
     except Exception as e:
-        # 만료일 검증 실패 시에도 계속 진행 (경고만)
         print(f"인증서 만료일 검증 경고: {e}", file=sys.stderr)
+        return
+    if not_after.tzinfo is None:
+        not_after = not_after.replace(tzinfo=timezone.utc)
+    if datetime.now(timezone.utc) > not_after:
+        raise ValueError(f"인증서가 만료되었습니다. 만료일: {not_after}")
+    if verbose:
+        print(f"인증서 만료일: {not_after}", file=sys.stderr)
 
 def pkcs7_signed_msg(sign: PinkSign, message: bytes) -> bytes:
     """PKCS7 서명 메시지 생성"""
     return sign.pkcs7_signed_msg(message)
 
+def sign_batch(sign: PinkSign, messages: Iterable[bytes]) -> List[bytes]:
+    """여러 메시지의 PKCS7 서명 (입력 순서대로)"""
+    return [pkcs7_signed_msg(sign, message) for message in messages]
+
+# 상주 모드에서 만료일을 출력한 인증서 (검증은 요청마다, 로그는 인증서마다 한 번)
+_reported = set()
+
+@contextmanager
+def _load_validated(cert_path: str, password: str) -> Iterator[PinkSign]:
+    with load_certificate(cert_path, password) as sign:
+        validate_cert_expiry(sign, verbose=cert_path not in _reported)
+        _reported.add(cert_path)
+        yield sign
+
+def handle_request(request: Dict) -> Dict:
+    """상주 모드 요청 1건 처리"""
+    response = {"id": request.get("id")}
+    op = request.get("op")
+    try:
+        if op == "close":
+            response["status"] = "OK"
+        elif op in ("validate", "sign", "sign_batch"):
+            with _load_validated(request["cert_path"], request["password"]) as sign:
+                if op == "validate":
+                    response["status"] = "OK"
+                elif op == "sign":
+                    signed = pkcs7_signed_msg(sign, base64.b64decode(request["message"]))
+                    response["signed"] = base64.b64encode(signed).decode('utf-8')
+                else:
+                    signed = sign_batch(sign, (base64.b64decode(m) for m in request["messages"]))
+                    response["signed"] = [base64.b64encode(s).decode('utf-8') for s in signed]
+        else:
+            response["error"] = f"알 수 없는 요청: {op}"
+    except KeyError as e:
+        response["error"] = f"필수 항목 누락: {e.args[0]}"
+    except Exception as e:
+        response["error"] = str(e)
+    return response
+
+def serve_stream(infile: IO[str], outfile: IO[str]) -> None:
+    """NDJSON 요청을 한 줄씩 읽어 응답을 한 줄씩 씁니다. close 요청이나 입력 끝에서 종료"""
+    for line in infile:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            request, response = {}, {"id": None, "error": f"요청 파싱 실패: {e}"}
+        else:
+            response = handle_request(request) if isinstance(request, dict) else {"id": None, "error": "요청은 JSON 객체여야 합니다"}
+        outfile.write(json.dumps(response) + "\n")
+        outfile.flush()
+        if isinstance(request, dict) and request.get("op") == "close":
+            break
+
+def serve_unix_socket(socket_path: str) -> None:
+    """Unix 소켓 상주 모드: 연결마다 NDJSON 스트림을 처리 (인증서 키링은 연결 간 공유)"""
+    import os
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            import io
+            serve_stream(io.TextIOWrapper(self.rfile, encoding='utf-8'),
+                         io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True))
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as server:
+        os.chmod(socket_path, 0o600)
+        print(json.dumps({"status": "listening", "socket": socket_path}), file=sys.stderr, flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(socket_path)
+
 def main():
     """CLI 진입점"""
     if len(sys.argv) < 2:
-        print(json.dumps({"error": "명령어가 필요합니다: validate|sign"}), file=sys.stderr)
+        print(json.dumps({"error": "명령어가 필요합니다: validate|sign|sign-batch|serve"}), file=sys.stderr)
         sys.exit(1)
     
     command = sys.argv[1]
@@ -58,8 +151,8 @@ def main():
         password = sys.argv[3]
         
         try:
-            sign = load_certificate(cert_path, password)
-            validate_cert_expiry(sign)
+            with load_certificate(cert_path, password) as sign:
+                validate_cert_expiry(sign)
             print(json.dumps({"status": "OK"}))
         except Exception as e:
             print(json.dumps({"error": str(e)}), file=sys.stderr)
@@ -75,14 +168,14 @@ def main():
         message_base64 = sys.argv[4]
         
         try:
-            sign = load_certificate(cert_path, password)
-            validate_cert_expiry(sign)
-            
-            # Base64 디코딩
-            message = base64.b64decode(message_base64)
-            
-            # PKCS7 서명 생성
-            signed_data = pkcs7_signed_msg(sign, message)
+            with load_certificate(cert_path, password) as sign:
+                validate_cert_expiry(sign)
+                
+                # Base64 디코딩
+                message = base64.b64decode(message_base64)
+                
+                # PKCS7 서명 생성
+                signed_data = pkcs7_signed_msg(sign, message)
             
             # Base64 인코딩하여 출력
             signed_base64 = base64.b64encode(signed_data).decode('utf-8')
@@ -91,6 +184,31 @@ def main():
             print(json.dumps({"error": str(e)}), file=sys.stderr)
             sys.exit(1)
     
+    elif command == "sign-batch":
+        if len(sys.argv) < 4:
+            print(json.dumps({"error": "사용법: python certificate-signer.py sign-batch <cert_path> <password> < messages.txt"}), file=sys.stderr)
+            sys.exit(1)
+        
+        cert_path = sys.argv[2]
+        password = sys.argv[3]
+        
+        try:
+            # stdin: 한 줄에 base64 메시지 하나
+            messages = [base64.b64decode(line.strip()) for line in sys.stdin if line.strip()]
+            with load_certificate(cert_path, password) as sign:
+                validate_cert_expiry(sign)
+                signed = sign_batch(sign, messages)
+            print(json.dumps({"signed": [base64.b64encode(s).decode('utf-8') for s in signed]}))
+        except Exception as e:
+            print(json.dumps({"error": str(e)}), file=sys.stderr)
+            sys.exit(1)
+    
+    elif command == "serve":
+        if len(sys.argv) >= 4 and sys.argv[2] == "--socket":
+            serve_unix_socket(sys.argv[3])
+        else:
+            serve_stream(sys.stdin, sys.stdout)
+    
     else:
         print(json.dumps({"error": f"알 수 없는 명령어: {command}"}), file=sys.stderr)
         sys.exit(1)
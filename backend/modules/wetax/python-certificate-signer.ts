@@ -30,6 +30,7 @@ export interface CertificateSigner {
 export interface CertificateSignerInstance {
   validateCertExpiry(): void;
   pkcs7SignedMsg(message: Buffer): Buffer;
+  pkcs7SignedMsgBatch?(messages: Buffer[]): Buffer[];
 }
 
 export class PythonCertificateSigner implements CertificateSigner {
@@ -160,6 +161,55 @@ class PythonCertificateSignerInstance implements CertificateSignerInstance {
     }
   }
   
+  /**
+   * 여러 메시지를 Python 프로세스 한 번으로 서명 (인증서 복호화 1회)
+   * 메시지는 stdin으로 전달하므로 명령줄 길이 제한이 없습니다.
+   */
+  pkcs7SignedMsgBatch(messages: Buffer[]): Buffer[] {
+    if (!this.tempCertPath) {
+      throw new Error('인증서 파일이 준비되지 않았습니다');
+    }
+    if (messages.length === 0) {
+      return [];
+    }
+    
+    try {
+      const result = execSync(
+        `python3 "${this.scriptPath}" sign-batch "${this.tempCertPath}" "${this.password}"`,
+        { 
+          encoding: 'utf-8',
+          input: messages.map((message) => message.toString('base64')).join('\n') + '\n',
+          stdio: ['pipe', 'pipe', 'pipe'],
+          maxBuffer: 100 * 1024 * 1024 // 100MB
+        }
+      );
+      
+      const response = JSON.parse(result.trim());
+      if (response.error) {
+        throw new Error(response.error);
+      }
+      
+      if (!Array.isArray(response.signed) || response.signed.length !== messages.length) {
+        throw new Error('PKCS7 서명 생성 실패: 응답의 서명 개수가 요청과 다릅니다');
+      }
+      
+      return response.signed.map((signed: string) => Buffer.from(signed, 'base64'));
+    } catch (error: any) {
+      // stderr에서 에러 메시지 추출 시도
+      if (error.stderr) {
+        try {
+          const stderrJson = JSON.parse(error.stderr);
+          if (stderrJson.error) {
+            throw new Error(stderrJson.error);
+          }
+        } catch {
+          // JSON 파싱 실패 시 원본 에러 사용
+        }
+      }
+      throw new Error(`PKCS7 일괄 서명 실패: ${error.message || error}`);
+    }
+  }
+  
   private saveTempCert(): string {
     const tempDir = path.join(process.cwd(), 'temp');
     if (!fs.existsSync(tempDir)) {
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+인증서 일괄 조회 스크립트
+저장된 인증서 전체의 유효기간/메타데이터를 한 번에 조회하여 JSON 하나로 출력합니다.
+
+사용법:
+    python scan-certificates.py --root <인증서 디렉토리>
+    python scan-certificates.py <cert_path> [<cert_path> ...]
+"""
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 경로에 추가
+project_root = Path(__file__).parent.parent.parent
+modules_path = project_root / 'backend' / 'modules'
+sys.path.insert(0, str(modules_path))
+
+from certificate.scanner import main
+
+if __name__ == '__main__':
+    main()